@@ -0,0 +1,93 @@
+"""
+Compares JSON codecs (see `JSON_CODEC` setting) on teleapi workloads:
+decoding of `getUpdates` batches, encoding of `sendMessage` bodies and FormData fields, request keys.
+
+Usage: python -m benchmarks.json_codec [--updates 100] [--repeat 7] [--output results.json]
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict
+
+from teleapi.core.utils.json_codec import JSON_CODECS, BaseJsonCodec
+from teleapi.testing.payloads import make_get_updates_response, make_send_message_request, make_updates
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int) -> float:
+    """
+    Returns best time of `number` calls of `func` in seconds
+    """
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+
+        for _ in range(number):
+            func()
+
+        best = min(best, time.perf_counter() - started_at)
+
+    return best
+
+
+def bench_codec(codec: BaseJsonCodec, updates_count: int, repeat: int) -> Dict[str, float]:
+    rng = random.Random(0)
+    batch = json.dumps(make_get_updates_response(make_updates(updates_count))).encode()
+    requests = [make_send_message_request(rng) for _ in range(updates_count)]
+    markup = requests[0]["reply_markup"]
+    number = max(1, 2000 // updates_count)
+
+    decode_batch = measure(lambda: codec.loads(batch), number, repeat) / number
+    encode_bodies = measure(lambda: [codec.dumps(request) for request in requests], number, repeat) / number
+    encode_fields = measure(lambda: [codec.dumps_str(markup) for _ in range(updates_count)], number, repeat) / number
+    request_keys = measure(lambda: [codec.dumps(request, sort_keys=True) for request in requests], number, repeat) / number
+
+    per_update = (decode_batch + encode_bodies) / updates_count
+
+    return {
+        "decode_batch_us": decode_batch * 1e6,
+        "encode_bodies_us": encode_bodies * 1e6,
+        "encode_form_fields_us": encode_fields * 1e6,
+        "request_keys_us": request_keys * 1e6,
+        "per_update_us": per_update * 1e6
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=100, help="Updates in getUpdates batch (and replies encoded)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="Path of JSON file results are saved to")
+    args = parser.parse_args()
+
+    results = {}
+
+    for name, codec_class in JSON_CODECS.items():
+        if not codec_class.is_available():
+            print(f"{name:>8}: not installed")
+            continue
+
+        results[name] = bench_codec(codec_class(), args.updates, args.repeat)
+
+    baseline = results["json"]["per_update_us"]
+
+    print(f"{'codec':>8} {'batch decode':>14} {'bodies encode':>14} {'form fields':>12} {'req keys':>10} {'per update':>11} {'saved':>8}")
+
+    for name, result in results.items():
+        result["saved_per_update_us"] = baseline - result["per_update_us"]
+
+        print(
+            f"{name:>8} {result['decode_batch_us']:>12.1f}us {result['encode_bodies_us']:>12.1f}us "
+            f"{result['encode_form_fields_us']:>10.1f}us {result['request_keys_us']:>8.1f}us "
+            f"{result['per_update_us']:>9.2f}us {result['saved_per_update_us']:>6.2f}us"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"updates": args.updates, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+End-to-end benchmark of update processing:
+raw getUpdates JSON -> UpdateSerializer -> Bot.dispatch -> Executor.call_event -> commands and listeners -> outbound requests.
+Outbound requests are built as usual and sent to `MemoryTransport`, so network is not measured.
+
+For every combination of executors count, listeners count and update shape reports throughput (updates/s),
+latency percentiles (from receiving of the getUpdates batch to completion of the last handler of the update),
+memory used while processing a batch, memory retained after processing and peak memory (tracemalloc).
+
+Usage: python -m benchmarks.pipeline [--updates 500] [--batch 100] [--executors 1 4] [--listeners 1 8]
+                                     [--shapes mixed text command] [--output results.json]
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Set
+
+from teleapi import project_settings
+from teleapi.core.bots.bot import Bot
+from teleapi.core.bots.middlewares import BaseMiddleware
+from teleapi.core.executors.executor import Executor
+from teleapi.core.executors.commands import command
+from teleapi.core.executors.events import event
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.transports.memory import MemoryTransport
+from teleapi.core.http.updaters.events import AllowedUpdates_all, UpdateEvent
+from teleapi.core.http.updaters.updater import BaseUpdater
+from teleapi.core.utils.json_codec import get_json_codec
+from teleapi.testing.payloads import make_get_updates_response, make_send_message_response, make_updates, make_user
+from teleapi.types.update.obj import Update
+from teleapi.types.update.serializer import UpdateSerializer
+
+COMMANDS = ("start", "help", "settings", "report")
+
+
+class CompletionTracker:
+    """
+    Collects time of receiving and completion of every update
+    """
+
+    def __init__(self) -> None:
+        self.received_at: Dict[int, float] = {}
+        self.completed_at: Dict[int, float] = {}
+        self.message_updates: Dict[int, int] = {}
+        self.handled = 0
+
+    def receive(self, update: Update, received_at: float) -> None:
+        self.received_at[update.id] = received_at
+
+        if update.message is not None:
+            self.message_updates[id(update.message)] = update.id
+
+    def complete(self, update_id: int) -> None:
+        self.completed_at[update_id] = time.perf_counter()
+
+    def handle(self, update_id: int) -> None:
+        self.handled += 1
+        self.complete(update_id)
+
+    def clear(self) -> None:
+        self.received_at.clear()
+        self.completed_at.clear()
+        self.message_updates.clear()
+
+    def latencies(self) -> List[float]:
+        return sorted(self.completed_at[update_id] - received_at for update_id, received_at in self.received_at.items())
+
+
+class BenchmarkUpdater(BaseUpdater):
+    async def get_updates(self) -> list:
+        return []
+
+
+def make_transport() -> MemoryTransport:
+    transport = MemoryTransport()
+    bot_user = make_user(5000000000, is_bot=True)
+
+    transport.route(APIMethod.GET_ME)(lambda params: bot_user)
+    transport.route(APIMethod.SEND_MESSAGE)(lambda params: make_send_message_response(params)["result"])
+    transport.route(APIMethod.ANSWER_CALLBACK_QUERY)(lambda params: True)
+
+    return transport
+
+
+def make_executor_class(index: int, listeners: int, tracker: CompletionTracker) -> type:
+    """
+    Makes executor with `listeners` listeners of every handled event and commands. Only the first executor replies,
+    listeners of other executors do filtering work that is typical for bots
+    """
+
+    attributes = {}
+
+    for number in range(listeners):
+        replies = index == 0 and number == 0
+
+        async def on_message(listener, update, message, replies=replies, **_):
+            if replies and not (message.text or "").startswith("/"):
+                await message.reply(f"Got {len(message.text or message.caption or '')} characters")
+
+            tracker.handle(update.id)
+
+        async def on_callback_query(listener, update, callback_query, replies=replies, **_):
+            if replies and callback_query.data.startswith("option:"):
+                await callback_query.answer(f"Selected {callback_query.data[7:]}")
+
+            tracker.handle(update.id)
+
+        async def on_chat_member(listener, update, member_update, **_):
+            tracker.handle(update.id)
+
+        attributes[f"on_message_{number}"] = event(event_type=UpdateEvent.ON_MESSAGE)(on_message)
+        attributes[f"on_callback_query_{number}"] = event(event_type=UpdateEvent.ON_CALLBACK_QUERY)(on_callback_query)
+        attributes[f"on_chat_member_{number}"] = event(event_type=UpdateEvent.ON_CHAT_MEMBER_UPDATED)(on_chat_member)
+
+    if index == 0:
+        for name in COMMANDS:
+            async def execute(cmd, message, name=name, **_):
+                await message.reply(f"Command {name}")
+                tracker.handle(tracker.message_updates[id(message)])
+
+            attributes[f"command_{name}"] = command(name=name)(execute)
+
+    return type(f"BenchmarkExecutor{index}", (Executor,), attributes)
+
+
+def make_bot(executors: int, listeners: int, tracker: CompletionTracker) -> Bot:
+    class CompletionMiddleware(BaseMiddleware):
+        async def pre_process(self, update):
+            return update
+
+        async def post_process(self, update):
+            tracker.complete(update.id)
+
+    bot_class = type("BenchmarkBot", (Bot,), {
+        "__bot_executors__": [make_executor_class(index, listeners, tracker) for index in range(executors)],
+        "__bot_middlewares__": [CompletionMiddleware]
+    })
+
+    return bot_class(BenchmarkUpdater, allowed_updates=AllowedUpdates_all)
+
+
+async def drain(baseline: Set[asyncio.Task]) -> None:
+    """
+    Waits until all tasks started after `baseline` snapshot are done
+    """
+
+    current = asyncio.current_task()
+
+    while pending := asyncio.all_tasks() - baseline - {current}:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def process_batches(bot: Bot, batches: List[bytes], tracker: CompletionTracker, memory: Optional[dict] = None) -> None:
+    codec = get_json_codec()
+    baseline = asyncio.all_tasks()
+
+    for batch in batches:
+        if memory is not None:
+            tracemalloc.reset_peak()
+            batch_start = tracemalloc.get_traced_memory()[0]
+
+        received_at = time.perf_counter()
+        updates = UpdateSerializer().serialize(data=codec.loads(batch)["result"], many=True)
+
+        for update in updates:
+            tracker.receive(update, received_at)
+            asyncio.create_task(bot._invoke_update(update))
+
+        await drain(baseline)
+
+        if memory is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            memory["batch_bytes"].append((peak - batch_start) / len(updates))
+            memory["peak"] = max(memory["peak"], peak - memory["start"])
+
+
+def percentile(values: List[float], quantile: float) -> float:
+    return values[min(len(values) - 1, int(quantile * len(values)))]
+
+
+async def bench_config(executors: int, listeners: int, shape: Optional[str], updates_count: int, batch_size: int) -> Dict[str, Any]:
+    codec = get_json_codec()
+    updates = make_updates(updates_count, shape=shape)
+    batches = [
+        codec.dumps(make_get_updates_response(updates[start:start + batch_size]))
+        for start in range(0, len(updates), batch_size)
+    ]
+
+    # Warm up (creates lazily initialized objects such as scheduler and caches)
+    warmup_tracker = CompletionTracker()
+    bot = make_bot(executors, listeners, warmup_tracker)
+    await bot.ainit()
+    await drain(set())
+    await process_batches(bot, batches[:2], warmup_tracker)
+
+    tracker = CompletionTracker()
+    bot = make_bot(executors, listeners, tracker)
+    await bot.ainit()
+    await drain(set())
+
+    gc.collect()
+    started_at = time.perf_counter()
+    await process_batches(bot, batches, tracker)
+    elapsed = time.perf_counter() - started_at
+
+    latencies = tracker.latencies()
+
+    memory_tracker = CompletionTracker()
+    bot = make_bot(executors, listeners, memory_tracker)
+    await bot.ainit()
+    await drain(set())
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    memory = {"start": tracemalloc.get_traced_memory()[0], "peak": 0, "batch_bytes": []}
+    await process_batches(bot, batches, memory_tracker, memory)
+    tracemalloc.stop()
+    memory_tracker.clear()
+    gc.collect()
+    blocks_after = sys.getallocatedblocks()
+
+    return {
+        "executors": executors,
+        "listeners": listeners,
+        "shape": shape or "mixed",
+        "updates": len(updates),
+        "handler_calls_per_update": tracker.handled / len(updates),
+        "updates_per_second": len(updates) / elapsed,
+        "latency_p50_ms": percentile(latencies, 0.5) * 1e3,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1e3,
+        "latency_max_ms": latencies[-1] * 1e3,
+        "memory_per_update_bytes": sum(memory["batch_bytes"]) / len(memory["batch_bytes"]),
+        "retained_blocks_per_update": (blocks_after - blocks_before) / len(updates),
+        "peak_memory_kb": memory["peak"] / 1024
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    project_settings.API_TOKEN = "0:benchmark"
+    project_settings.HTTP_TRANSPORT = make_transport()
+    project_settings.LOOP_MONITOR = None  # Its task would never be drained
+
+    results = []
+
+    print(f"{'exec':>4} {'lstn':>4} {'shape':>14} {'upd/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'B/update':>9} {'retained':>9} {'peak KB':>8}")
+
+    for executors, listeners, shape in itertools.product(args.executors, args.listeners, args.shapes):
+        result = await bench_config(executors, listeners, None if shape == "mixed" else shape, args.updates, args.batch)
+        results.append(result)
+
+        print(
+            f"{executors:>4} {listeners:>4} {result['shape']:>14} {result['updates_per_second']:>9.0f} "
+            f"{result['latency_p50_ms']:>8.2f} {result['latency_p99_ms']:>8.2f} {result['memory_per_update_bytes']:>9.0f} "
+            f"{result['retained_blocks_per_update']:>9.2f} {result['peak_memory_kb']:>8.0f}"
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=500, help="Updates processed in every configuration")
+    parser.add_argument("--batch", type=int, default=100, help="Updates in getUpdates batch")
+    parser.add_argument("--executors", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--listeners", type=int, nargs="+", default=[1, 8], help="Listeners of every event in executor")
+    parser.add_argument("--shapes", nargs="+", default=["mixed", "text", "command", "callback_query"],
+                        help="Update shapes (see teleapi.testing.payloads.UPDATE_SHAPES) or 'mixed'")
+    parser.add_argument("--output", help="Path of JSON file results are saved to")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "python": platform.python_version(),
+                "json_codec": get_json_codec().name,
+                "updates": args.updates,
+                "batch": args.batch,
+                "results": results
+            }, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Micro-benchmarks of serializers on the curated corpus of real-world Bot API JSON (see `teleapi.testing.corpus`).
+For every serializer and corpus entry measures `to_object` (JSON -> object) and `to_representation` (object -> JSON).
+
+Usage: python -m benchmarks.serializers [--filter Message] [--number 200] [--repeat 5] [--output results.json]
+"""
+import argparse
+import json
+import platform
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from teleapi.core.orm.serializers import BaseSerializer
+from teleapi.testing import corpus
+from teleapi.types.callback_query import CallbackQuerySerializer
+from teleapi.types.chat import ChatSerializer
+from teleapi.types.chat_member import ChatMemberObjectSerializer
+from teleapi.types.chat_member_updated import ChatMemberUpdatedSerializer
+from teleapi.types.file import FileSerializer
+from teleapi.types.input_media.input_media_serializer import InputMediaObjectSerializer
+from teleapi.types.message import MessageSerializer
+from teleapi.types.update import UpdateSerializer
+from teleapi.types.user import UserSerializer
+
+
+def get_cases() -> List[Tuple[str, BaseSerializer, Any]]:
+    """
+    Returns benchmark cases: (name, serializer, JSON data)
+    """
+
+    cases = []
+    cases += [(f"Update/{name}", UpdateSerializer(), data) for name, data in corpus.UPDATES.items()]
+    cases += [(f"Message/{name}", MessageSerializer(), data) for name, data in corpus.MESSAGES.items()]
+    cases += [(f"CallbackQuery/{name}", CallbackQuerySerializer(), data) for name, data in corpus.CALLBACK_QUERIES.items()]
+    cases += [(f"ChatMemberUpdated/{name}", ChatMemberUpdatedSerializer(), data) for name, data in corpus.CHAT_MEMBER_UPDATES.items()]
+    cases += [(f"ChatMember/{name}", ChatMemberObjectSerializer(), data) for name, data in corpus.CHAT_MEMBERS.items()]
+    cases += [(f"InputMedia/{name}", InputMediaObjectSerializer(), data) for name, data in corpus.INPUT_MEDIA.items()]
+    cases += [
+        ("User/getMe", UserSerializer(), corpus.RESULTS["getMe"]),
+        ("Chat/getChat", ChatSerializer(), corpus.RESULTS["getChat"]),
+        ("Message/sendMessage", MessageSerializer(), corpus.RESULTS["sendMessage"]),
+        ("File/getFile", FileSerializer(), corpus.RESULTS["getFile"])
+    ]
+
+    return cases
+
+
+def measure(func: Callable[[], Any], number: int, repeat: int) -> float:
+    """
+    Returns best time of one call of `func` in seconds
+    """
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+
+        for _ in range(number):
+            func()
+
+        best = min(best, (time.perf_counter() - started_at) / number)
+
+    return best
+
+
+def bench_case(serializer: BaseSerializer, data: Any, number: int, repeat: int) -> Dict[str, float]:
+    obj = serializer.to_object(data)
+
+    return {
+        "to_object_us": measure(lambda: serializer.to_object(data), number, repeat) * 1e6,
+        "to_representation_us": measure(lambda: serializer.to_representation(obj, keep_none_fields=False), number, repeat) * 1e6,
+        "json_bytes": len(json.dumps(data, ensure_ascii=False).encode())
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="Run only cases which names contain the string")
+    parser.add_argument("--number", type=int, default=200, help="Calls in every measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Path of JSON file results are saved to")
+    args = parser.parse_args()
+
+    results = {}
+
+    print(f"{'case':<42} {'JSON B':>7} {'to_object':>11} {'to_repr':>11}")
+
+    for name, serializer, data in get_cases():
+        if args.filter and args.filter not in name:
+            continue
+
+        result = results[name] = bench_case(serializer, data, args.number, args.repeat)
+        print(f"{name:<42} {result['json_bytes']:>7} {result['to_object_us']:>9.1f}us {result['to_representation_us']:>9.1f}us")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "number": args.number, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
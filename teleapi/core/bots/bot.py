@@ -1,7 +1,9 @@
 import asyncio
+import time
+from contextlib import nullcontext
 from teleapi.core.http.updaters.updater import BaseUpdater
 from teleapi.core.http.updaters.events import UpdateEvent, AllowedUpdates
-from typing import Type, List, Dict
+from typing import Type, List, Dict, Set, Union
 from teleapi.core.bots.middlewares import BaseMiddleware
 from teleapi.core.utils.syntax import default
 from teleapi.generics.http.methods.bot import get_me
@@ -10,6 +12,15 @@ from teleapi.types.update.obj import Update
 from abc import ABC, abstractmethod
 from teleapi.core.executors.executor import BaseExecutor
 from teleapi.core.state.settings import project_settings
+from teleapi.core.http.request.cache import get_response_cache
+from teleapi.core.http.request.timeouts import request_deadline
+from teleapi.core.http.transports.base import get_http_transport
+from teleapi.core.bots.context import update_context
+from teleapi.core.bots.membership import get_membership_index
+from teleapi.core.metrics import MetricsServer, get_loop_monitor, get_metrics
+from teleapi.core.profiling import get_profiling_controller
+from teleapi.core.tracing import get_tracer, trace_span
+from teleapi.core.utils.offload import get_process_offloader
 import re
 from teleapi.core.exceptions.managers import BaseErrorManager, ErrorManager
 import logging
@@ -18,6 +29,13 @@ from teleapi.types.bot import TelegramBotObject
 
 logger = logging.getLogger(__name__)
 
+# Service message fields that mean that chat information or members have changed
+CHAT_CHANGING_MESSAGE_FIELDS = (
+    'new_chat_members', 'left_chat_member', 'new_chat_title', 'new_chat_photo', 'delete_chat_photo',
+    'group_chat_created', 'supergroup_chat_created', 'channel_chat_created', 'migrate_to_chat_id',
+    'migrate_from_chat_id', 'pinned_message', 'message_auto_delete_timer_changed'
+)
+
 
 # @log_async_methods()
 class BaseBot(TelegramBotObject, ABC):
@@ -45,6 +63,7 @@ class BaseBot(TelegramBotObject, ABC):
 
         self._is_initialized = False
         self.me = None
+        self.metrics_server = None
         self.error_manager = default(error_manager, ErrorManager())
         project_settings.BOT = self
 
@@ -100,9 +119,22 @@ class BaseBot(TelegramBotObject, ABC):
         for middleware in self.__middlewares:
             await middleware.ainit()
 
+        if (membership_index := get_membership_index()) is not None:
+            await membership_index.ainit()
+
         for executor in self._executors:
             asyncio.create_task(executor.ainit())
 
+        if (metrics_port := project_settings.get('METRICS_PORT', None)) is not None:
+            self.metrics_server = MetricsServer(host=project_settings.get('METRICS_HOST', '127.0.0.1'), port=metrics_port)
+            await self.metrics_server.start()
+
+        if (loop_monitor := get_loop_monitor()) is not None:
+            loop_monitor.start()
+
+        if (profiling_controller := get_profiling_controller()) is not None:
+            await profiling_controller.ainit()
+
         logger.info(f"Bot was successfully initialized")
         self._is_initialized = True
 
@@ -194,7 +226,7 @@ class BaseBot(TelegramBotObject, ABC):
          - All errors that was not processed in executor error_manager will be processed in bot error_manager
         """
 
-        logger.debug(f"Calling event {event_type} on update {update.id}")
+        logger.debug("Calling event %s on update %s", event_type, update.id)
 
         tasks = [executor.call_event(update, event_type, **kwargs) for executor in self._executors]
 
@@ -212,19 +244,25 @@ class BaseBot(TelegramBotObject, ABC):
             The update received from the updater
         """
 
-        logger.info(f"Processing update {update.id}")
+        logger.debug("Processing update %s", update.id)
 
         for middleware in self.__middlewares:
-            update = await middleware.pre_process(update)
+            with trace_span('middleware.pre_process', middleware=middleware.__class__.__name__):
+                update = await middleware.pre_process(update)
 
-        await self.dispatch(update)
+        with trace_span('dispatch'):
+            await self.dispatch(update)
 
         for middleware in self.__middlewares:
-            await middleware.post_process(update)
+            with trace_span('middleware.post_process', middleware=middleware.__class__.__name__):
+                await middleware.post_process(update)
 
     async def _invoke_update(self, update: Update) -> None:
         """
         Calls `self.process_update` function and catches errors. Errors will be processed in bot error_manager
+        All API requests made while processing the update share the deadline set by `UPDATE_DEADLINE` setting (if defined)
+        If `TRACER` setting is defined, processing of the update is traced (see `Tracer`)
+        The update is available in the processing context with `get_current_update` (e.g. for log correlation)
 
         :param update: `Update`
             The update received from the updater
@@ -233,10 +271,30 @@ class BaseBot(TelegramBotObject, ABC):
         if not self._is_initialized:
             raise RuntimeError("Bot is not initialized yet. Call 'ainit' method before use this")
 
+        metrics = get_metrics()
+        tracer = get_tracer()
+        started_at = time.perf_counter()
+        outcome = 'ok'
+
+        if metrics is not None:
+            metrics.updates_in_progress.inc()
+
         try:
-            await self.process_update(update)
-        except BaseException as error:
-            await self.error_manager.process_error(error, update)
+            with update_context(update), \
+                    tracer.start_trace('update', trace_id=update.id) if tracer is not None else nullcontext() as root_span:
+                try:
+                    with request_deadline(project_settings.get('UPDATE_DEADLINE', None)):
+                        await self.process_update(update)
+                except BaseException as error:
+                    outcome = 'error'
+                    await self.error_manager.process_error(error, update)
+
+                if root_span is not None:
+                    root_span.set_attribute('outcome', outcome)
+        finally:
+            if metrics is not None:
+                metrics.updates_in_progress.dec()
+                metrics.observe_update(outcome, time.perf_counter() - started_at)
 
     async def run(self) -> None:
         """
@@ -249,12 +307,30 @@ class BaseBot(TelegramBotObject, ABC):
         if not self._is_initialized:
             await self.ainit()
 
-        while True:
-            updates = await self._updater.get_updates()
+        try:
+            while True:
+                updates = await self._updater.get_updates()
+
+                if updates:
+                    for update in updates:
+                        asyncio.create_task(self._invoke_update(update))
+        finally:
+            if (loop_monitor := get_loop_monitor()) is not None:
+                await loop_monitor.stop()
+
+            if (profiling_controller := get_profiling_controller()) is not None:
+                await profiling_controller.close()
+
+            if self.metrics_server is not None:
+                await self.metrics_server.stop()
+
+            if (process_offloader := get_process_offloader()) is not None:
+                await process_offloader.close()
+
+            if (tracer := get_tracer()) is not None:
+                tracer.close()
 
-            if updates:
-                for update in updates:
-                    asyncio.create_task(self._invoke_update(update))
+            await get_http_transport().close()
 
 
 class Bot(BaseBot):
@@ -263,6 +339,84 @@ class Bot(BaseBot):
     Implements `dispatch` method
     """
 
+    @staticmethod
+    def get_changed_chat_ids(update: Update) -> Set[Union[int, str]]:
+        """
+        Returns ids (and usernames) of chats which information or members were changed according to the update
+
+        :param update: `Update`:
+            The update received from the updater.
+
+        :return: `Set[Union[int, str]]`
+            Chat ids and usernames
+        """
+
+        chats = []
+
+        for member_update in (update.chat_member, update.bot_chat_member):
+            if member_update:
+                chats.append(member_update.chat)
+
+        for message in (update.message, update.channel_post):
+            if message and any(getattr(message, field) for field in CHAT_CHANGING_MESSAGE_FIELDS):
+                chats.append(message.chat)
+
+        chat_ids = set()
+
+        for chat in chats:
+            chat_ids.add(chat.id)
+
+            if chat.username:
+                chat_ids.add(f"@{chat.username}")
+
+        if update.message and update.message.migrate_to_chat_id:
+            chat_ids.add(update.message.migrate_to_chat_id)
+
+        return chat_ids
+
+    def invalidate_response_cache(self, update: Update) -> None:
+        """
+        Removes cached API responses (see `RESPONSE_CACHE` setting) that became outdated because of the update
+
+        :param update: `Update`:
+            The update received from the updater.
+        """
+
+        cache = get_response_cache()
+
+        if cache is None:
+            return
+
+        for chat_id in self.get_changed_chat_ids(update):
+            cache.invalidate_chat(chat_id)
+
+    def update_membership_index(self, update: Update) -> None:
+        """
+        Updates membership index (see `MEMBERSHIP_INDEX` setting) with member changes from the update
+
+        :param update: `Update`:
+            The update received from the updater.
+        """
+
+        index = get_membership_index()
+
+        if index is None:
+            return
+
+        for member_update in (update.chat_member, update.bot_chat_member):
+            if member_update:
+                index.update_from_member_update(member_update)
+
+        if update.message:
+            for user in update.message.new_chat_members or []:
+                index.set(update.message.chat.id, user.id, 'member')
+
+            if update.message.left_chat_member:
+                index.set(update.message.chat.id, update.message.left_chat_member.id, 'left')
+
+            if update.message.migrate_to_chat_id:
+                index.forget_chat(update.message.chat.id)
+
     async def dispatch(self, update: Update) -> None:
         """
         Handles update and call events (UpdateEvent) that will be handled by all bot executors
@@ -271,6 +425,9 @@ class Bot(BaseBot):
             The update received from the updater.
         """
 
+        self.invalidate_response_cache(update)
+        self.update_membership_index(update)
+
         if update.message:
             if update.message.text and update.message.entities and update.message.entities[0].type_ == 'bot_command' and update.message.entities[0].offset == 0:
                 if update.message.chat.type_ == ChatType.PRIVATE:
@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from teleapi.types.update.obj import Update
+
+_current_update: ContextVar[Optional['Update']] = ContextVar("current_update", default=None)
+
+
+def get_current_update() -> Optional['Update']:
+    """
+    Returns the update that is processed in the current context
+
+    :return: `Optional[Update]`
+        The update or None if called outside of update processing
+    """
+
+    return _current_update.get()
+
+
+@contextmanager
+def update_context(update: 'Update') -> Iterator[None]:
+    """
+    Sets the update processed inside the block (tasks created inside the block inherit it)
+
+    :param update: `Update`
+        The update
+    """
+
+    token = _current_update.set(update)
+
+    try:
+        yield
+    finally:
+        _current_update.reset(token)
+
+
+def get_update_chat_id(update: 'Update') -> Optional[int]:
+    """
+    Returns id of the chat the update belongs to
+
+    :param update: `Update`
+        The update
+
+    :return: `Optional[int]`
+        Chat id or None if the update is not related to a chat (e.g. inline query or poll)
+    """
+
+    message = update.message or update.edited_message or update.channel_post or update.edited_channel_post
+
+    if message is None and update.callback_query is not None:
+        message = update.callback_query.message
+
+    if message is not None:
+        return message.chat.id
+
+    for chat_update in (update.chat_member, update.bot_chat_member, update.chat_join_request):
+        if chat_update is not None:
+            return chat_update.chat.id
+
+    return None
@@ -0,0 +1,321 @@
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Union
+
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.json_codec import get_json_codec
+
+if TYPE_CHECKING:
+    from teleapi.types.chat_member import ChatMember
+    from teleapi.types.chat_member_updated import ChatMemberUpdated
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMembershipIndex:
+    """
+    In-memory index of chat members statuses and rights, that allows to answer membership queries without API calls.
+    Index is populated from `ChatMemberUpdated` updates and from `Chat.get_administrators` / `Chat.get_member` responses
+    (see `MEMBERSHIP_INDEX` setting)
+
+    Status and rights of every member are packed into one int: 3 lower bits store status, other bits store rights.
+
+    Notes:
+     - Index knows only about members it has seen. If member is unknown, query methods return None
+     - Bot receives `chat_member` updates only if `AllowedUpdates.CHAT_MEMBER` is in allowed updates
+    """
+
+    SNAPSHOT_VERSION: int = 1
+
+    STATUSES = ('left', 'member', 'administrator', 'creator', 'restricted', 'kicked')
+    RIGHTS = (
+        'is_anonymous', 'is_member', 'can_manage_chat', 'can_delete_messages', 'can_manage_video_chats',
+        'can_restrict_members', 'can_promote_members', 'can_change_info', 'can_invite_users', 'can_post_messages',
+        'can_edit_messages', 'can_pin_messages', 'can_manage_topics', 'can_send_messages', 'can_send_audios',
+        'can_send_documents', 'can_send_photos', 'can_send_videos', 'can_send_video_notes', 'can_send_voice_notes',
+        'can_send_polls', 'can_send_other_messages', 'can_add_web_page_previews'
+    )
+
+    _STATUS_BITS = 3
+    _STATUS_MASK = (1 << _STATUS_BITS) - 1
+
+    def __init__(self, snapshot_path: str = None, snapshot_interval: float = None) -> None:
+        """
+        Initialize the ChatMembershipIndex instance.
+
+        :param snapshot_path: `str`
+            (Optional) Path of the JSON file the index is saved to and loaded from
+
+        :param snapshot_interval: `float`
+            (Optional) Interval in seconds between automatic snapshots. If None, index is saved only by `save` call
+        """
+
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+
+        self._chats: Dict[int, Dict[int, int]] = {}
+        self._snapshot_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self._chats.values())
+
+    async def ainit(self) -> None:
+        """
+        Loads snapshot (if it exists) and starts periodic snapshots
+        """
+
+        if self.snapshot_path is not None and os.path.exists(self.snapshot_path):
+            await asyncio.to_thread(self.load)
+
+        if self.snapshot_path is not None and self.snapshot_interval is not None and self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    def pack(self, status: str, rights: Iterable[str] = ()) -> int:
+        """
+        Packs member status and rights into int
+
+        :param status: `str`
+            Member status (one of `STATUSES`)
+
+        :param rights: `Iterable[str]`
+            Names of rights member has (subset of `RIGHTS`)
+
+        :return: `int`
+            Packed value
+        """
+
+        value = self.__class__.STATUSES.index(status)
+
+        for right in rights:
+            value |= 1 << (self.__class__.RIGHTS.index(right) + self._STATUS_BITS)
+
+        return value
+
+    def unpack_status(self, value: int) -> str:
+        return self.__class__.STATUSES[value & self._STATUS_MASK]
+
+    def unpack_rights(self, value: int) -> Set[str]:
+        rights = value >> self._STATUS_BITS
+        return {right for i, right in enumerate(self.__class__.RIGHTS) if rights & (1 << i)}
+
+    def set(self, chat_id: int, user_id: int, status: str, rights: Iterable[str] = ()) -> None:
+        """
+        Sets member status and rights
+
+        :param chat_id: `int`
+            Chat id
+
+        :param user_id: `int`
+            User id
+
+        :param status: `str`
+            Member status (one of `STATUSES`)
+
+        :param rights: `Iterable[str]`
+            Names of rights member has
+        """
+
+        self._chats.setdefault(chat_id, {})[user_id] = self.pack(status, rights)
+
+    def remove(self, chat_id: int, user_id: int) -> None:
+        members = self._chats.get(chat_id)
+
+        if members is not None:
+            members.pop(user_id, None)
+
+            if not members:
+                del self._chats[chat_id]
+
+    def forget_chat(self, chat_id: int) -> None:
+        self._chats.pop(chat_id, None)
+
+    def update_from_member(self, chat_id: int, member: 'ChatMember') -> None:
+        """
+        Updates index from ChatMember object (or any of its subclasses)
+
+        :param chat_id: `int`
+            Chat id
+
+        :param member: `ChatMember`
+            Chat member
+        """
+
+        rights = [right for right in self.__class__.RIGHTS if getattr(member, right, None)]
+        self.set(chat_id, member.user.id, member.status, rights)
+
+    def update_from_member_update(self, member_update: 'ChatMemberUpdated') -> None:
+        """
+        Updates index from `chat_member` or `my_chat_member` update
+
+        :param member_update: `ChatMemberUpdated`
+            Chat member update
+        """
+
+        self.update_from_member(member_update.chat.id, member_update.new_chat_member)
+
+    def update_from_administrators(self, chat_id: int, administrators: List['ChatMember']) -> None:
+        """
+        Updates index from `getChatAdministrators` response.
+        Known administrators of the chat, which are not in the list, are removed from the index
+
+        :param chat_id: `int`
+            Chat id
+
+        :param administrators: `List[ChatMember]`
+            Full list of chat administrators
+        """
+
+        admin_ids = {administrator.user.id for administrator in administrators}
+
+        for user_id, value in list(self._chats.get(chat_id, {}).items()):
+            if user_id not in admin_ids and self.unpack_status(value) in ('administrator', 'creator'):
+                self.remove(chat_id, user_id)
+
+        for administrator in administrators:
+            self.update_from_member(chat_id, administrator)
+
+    def get_status(self, chat_id: int, user_id: int) -> Optional[str]:
+        """
+        Returns member status
+
+        :param chat_id: `int`
+            Chat id
+
+        :param user_id: `int`
+            User id
+
+        :return: `Optional[str]`
+            Member status or None if member is unknown
+        """
+
+        value = self._chats.get(chat_id, {}).get(user_id)
+        return self.unpack_status(value) if value is not None else None
+
+    def get_rights(self, chat_id: int, user_id: int) -> Optional[Set[str]]:
+        """
+        Returns member rights
+
+        :param chat_id: `int`
+            Chat id
+
+        :param user_id: `int`
+            User id
+
+        :return: `Optional[Set[str]]`
+            Names of rights member has or None if member is unknown
+        """
+
+        value = self._chats.get(chat_id, {}).get(user_id)
+        return self.unpack_rights(value) if value is not None else None
+
+    def has_right(self, chat_id: int, user_id: int, right: str) -> Optional[bool]:
+        value = self._chats.get(chat_id, {}).get(user_id)
+
+        if value is None:
+            return None
+
+        return bool(value & (1 << (self.__class__.RIGHTS.index(right) + self._STATUS_BITS)))
+
+    def is_admin(self, chat_id: int, user_id: int) -> Optional[bool]:
+        status = self.get_status(chat_id, user_id)
+        return status in ('administrator', 'creator') if status is not None else None
+
+    def is_member(self, chat_id: int, user_id: int) -> Optional[bool]:
+        status = self.get_status(chat_id, user_id)
+
+        if status is None:
+            return None
+        if status == 'restricted':
+            return self.has_right(chat_id, user_id, 'is_member')
+
+        return status in ('member', 'administrator', 'creator')
+
+    def dump(self) -> Dict[str, Union[int, Dict[str, Dict[str, int]]]]:
+        """
+        Returns snapshot of the index
+
+        :return: `dict`
+            JSON-serializable snapshot
+        """
+
+        return {
+            'version': self.__class__.SNAPSHOT_VERSION,
+            'chats': {str(chat_id): {str(user_id): value for user_id, value in members.items()} for chat_id, members in self._chats.items()}
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """
+        Restores index from snapshot
+
+        :param snapshot: `dict`
+            Snapshot made by `dump`
+
+        :raises:
+            :raise ValueError: If snapshot version is not supported
+        """
+
+        if snapshot.get('version') != self.__class__.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported membership index snapshot version: {snapshot.get('version')}")
+
+        self._chats = {
+            int(chat_id): {int(user_id): value for user_id, value in members.items()}
+            for chat_id, members in snapshot['chats'].items()
+        }
+
+    def save(self, snapshot: dict = None) -> None:
+        """
+        Saves snapshot to `snapshot_path`
+
+        :param snapshot: `dict`
+            (Optional) Snapshot to be saved. If None, makes new snapshot
+        """
+
+        if self.snapshot_path is None:
+            raise ValueError("snapshot_path was not specified")
+
+        snapshot = snapshot if snapshot is not None else self.dump()
+        tmp_path = f"{self.snapshot_path}.tmp"
+
+        with open(tmp_path, "wb") as file:
+            file.write(get_json_codec().dumps(snapshot))
+
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load(self) -> None:
+        """
+        Loads index from `snapshot_path`
+        """
+
+        if self.snapshot_path is None:
+            raise ValueError("snapshot_path was not specified")
+
+        with open(self.snapshot_path, "rb") as file:
+            self.restore(get_json_codec().loads(file.read()))
+
+        logger.debug(f"Loaded membership index snapshot ({len(self)} members)")
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+
+            try:
+                await asyncio.to_thread(self.save, self.dump())
+            except Exception as error:
+                logger.error(f"Failed to save membership index snapshot: {error.__class__.__name__}: {error}")
+
+
+def get_membership_index() -> Optional[ChatMembershipIndex]:
+    """
+    Returns membership index configured with `MEMBERSHIP_INDEX` setting
+
+    :return: `Optional[ChatMembershipIndex]`
+        Membership index or None if it is disabled
+    """
+
+    index = project_settings.get('MEMBERSHIP_INDEX', None)
+
+    if index is not None and not isinstance(index, ChatMembershipIndex):
+        raise TypeError("MEMBERSHIP_INDEX setting must be instance of ChatMembershipIndex")
+
+    return index
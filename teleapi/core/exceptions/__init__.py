@@ -1 +1 @@
-from .teleapi import TeleapiError
+from .teleapi import TeleapiError, HandlerTimeoutError
@@ -1,2 +1,4 @@
 from .manager import BaseErrorManager, ErrorManager
 from .handler import BaseErrorHandler, ErrorHandler
+from .aggregation import ErrorAggregator, ErrorStats, get_error_aggregator, get_error_fingerprint
+from .notifier import ErrorDigestNotifier, get_error_notifier
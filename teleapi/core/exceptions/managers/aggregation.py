@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import logging
+import time
+from traceback import StackSummary, walk_tb
+from typing import Callable, Dict, List, Optional
+
+from teleapi.core.state.settings import project_settings
+
+logger = logging.getLogger(__name__)
+
+_default_error_aggregator: Optional['ErrorAggregator'] = None
+
+
+def get_error_fingerprint(error: BaseException) -> str:
+    """
+    Returns fingerprint of the error: hash of the exception type and places (file, function, line) of its traceback.
+    Errors raised by the same bug have the same fingerprint regardless of their messages
+
+    :param error: `BaseException`
+        The error
+
+    :return: `str`
+        Fingerprint (12 hex digits)
+    """
+
+    error_type = type(error)
+    stack = StackSummary.extract(walk_tb(error.__traceback__), lookup_lines=False)
+    places = ';'.join(f"{frame.filename}:{frame.name}:{frame.lineno}" for frame in stack)
+
+    return hashlib.sha1(f"{error_type.__module__}.{error_type.__qualname__}|{places}".encode()).hexdigest()[:12]
+
+
+class ErrorStats:
+    """
+    Occurrences of errors with the same fingerprint
+    """
+
+    __slots__ = ('fingerprint', 'error_type', 'message', 'place', 'count', 'window_count', 'first_seen', 'last_seen')
+
+    def __init__(self, fingerprint: str, error: BaseException) -> None:
+        self.fingerprint = fingerprint
+        self.error_type = type(error).__name__
+        self.message = str(error)
+        self.place = get_error_place(error)
+        self.count = 0
+        self.window_count = 0  # Occurrences since the last summary
+        self.first_seen = self.last_seen = time.time()
+
+    def __str__(self) -> str:
+        return f"{self.window_count}x {self.error_type}: {self.message} [{self.fingerprint}] at {self.place}"
+
+
+def get_error_place(error: BaseException) -> str:
+    """
+    Returns the place (innermost frame of traceback) the error was raised in
+    """
+
+    stack = StackSummary.extract(walk_tb(error.__traceback__), lookup_lines=False)
+
+    if not stack:
+        return "unknown place"
+
+    frame = stack[-1]
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+class ErrorAggregator:
+    """
+    Counts errors by fingerprint. Occurrences are summarized every `summary_interval` seconds:
+    summary callbacks get stats of errors that occurred since the previous summary.
+    Summary timer is scheduled only while errors occur
+    """
+
+    def __init__(self, summary_interval: float = 60, max_fingerprints: int = 1000) -> None:
+        """
+        Initialize the ErrorAggregator instance.
+
+        :param summary_interval: `float`
+            (Optional) Interval of summaries in seconds
+        :param max_fingerprints: `int`
+            (Optional) Max amount of tracked fingerprints (the least recently seen are removed when exceeded)
+        """
+
+        self.summary_interval = summary_interval
+        self.max_fingerprints = max_fingerprints
+
+        self._stats: Dict[str, ErrorStats] = {}
+        self._callbacks: List[Callable[[List[ErrorStats]], None]] = []
+        self._summary_handle: Optional[asyncio.TimerHandle] = None
+
+    def add_summary_callback(self, callback: Callable[[List[ErrorStats]], None]) -> None:
+        self._callbacks.append(callback)
+
+    def record(self, error: BaseException) -> ErrorStats:
+        """
+        Records occurrence of the error
+
+        :param error: `BaseException`
+            The error
+
+        :return: `ErrorStats`
+            Stats of the error fingerprint (`count` is 1 if the error occurred for the first time)
+        """
+
+        fingerprint = get_error_fingerprint(error)
+        stats = self._stats.pop(fingerprint, None)
+
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                del self._stats[next(iter(self._stats))]
+
+            stats = ErrorStats(fingerprint, error)
+
+        # Dict keeps fingerprints in order of last occurrence
+        self._stats[fingerprint] = stats
+
+        stats.count += 1
+        stats.window_count += 1
+        stats.last_seen = time.time()
+
+        self._schedule_summary()
+        return stats
+
+    def log_summary(self, window: List[ErrorStats]) -> None:
+        """
+        Logs errors of the summary that occurred more than once (the first occurrence is logged with traceback)
+        """
+
+        repeated = [stats for stats in window if stats.count > 1]
+
+        if repeated:
+            logger.error(f"Unknown errors in the last {self.summary_interval}s:\n" + "\n".join(str(stats) for stats in repeated))
+
+    def get_stats(self) -> List[ErrorStats]:
+        return list(self._stats.values())
+
+    def summarize(self) -> List[ErrorStats]:
+        """
+        Passes stats of errors that occurred since the previous summary to callbacks and resets window counters
+
+        :return: `List[ErrorStats]`
+            Summarized stats (most frequent first)
+        """
+
+        self._summary_handle = None
+
+        window = sorted((stats for stats in self._stats.values() if stats.window_count), key=lambda x: -x.window_count)
+
+        if window:
+            for callback in self._callbacks:
+                callback(window)
+
+        for stats in window:
+            stats.window_count = 0
+
+        return window
+
+    def _schedule_summary(self) -> None:
+        if self._summary_handle is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._summary_handle = loop.call_later(self.summary_interval, self.summarize)
+
+
+def get_error_aggregator() -> ErrorAggregator:
+    """
+    Returns aggregator shared by error managers (with `ERROR_SUMMARY_INTERVAL` setting interval, 60 seconds by default),
+    so errors of all executors of the bot are counted and summarized together
+
+    :return: `ErrorAggregator`
+        The aggregator
+    """
+
+    global _default_error_aggregator
+
+    if _default_error_aggregator is None:
+        _default_error_aggregator = ErrorAggregator(project_settings.get('ERROR_SUMMARY_INTERVAL', 60))
+        _default_error_aggregator.add_summary_callback(_default_error_aggregator.log_summary)
+
+    return _default_error_aggregator
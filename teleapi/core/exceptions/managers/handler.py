@@ -1,7 +1,7 @@
-import inspect
 from abc import ABC, abstractmethod
 from typing import Type, TYPE_CHECKING
 from teleapi.types.update import Update
+from teleapi.core.utils.offload import to_async_handler
 from teleapi.core.utils.syntax import default
 
 if TYPE_CHECKING:
@@ -30,9 +30,8 @@ class ErrorHandler(BaseErrorHandler, ABC):
 
 def handler(*, exception_cls: Type[BaseException], **meta_kwargs):
     def decorator(func):
-        if not inspect.iscoroutinefunction(func):
-            raise TypeError("You can use this decorator only with coroutine functions")
-
+        # Sync functions run in the handler thread pool
+        func = to_async_handler(func)
         meta = type("Meta", (object,), {"exception_cls": exception_cls, **meta_kwargs})
         handler_cls = type(func.__name__, (ErrorHandler,), {
             "handle": func,
@@ -1,14 +1,20 @@
-import inspect
 from abc import abstractmethod
 from functools import wraps
-from typing import List, Type
+from typing import Dict, List, Optional, Type
 from .handler import BaseErrorHandler, handler
 from ...utils.collections import find_in_list
 from teleapi.types.update import Update
 import logging
 import sys
 from ...utils.errors import get_traceback_text
+from ...utils.offload import to_async_handler
+from ...utils.syntax import default
+from teleapi.core.state.settings import project_settings
+from .aggregation import ErrorAggregator, ErrorStats, get_error_aggregator
+from .notifier import ErrorDigestNotifier, get_error_notifier
 from teleapi.core.utils.collectors import CollectorMeta, collect_subclasses
+from teleapi.core.metrics.instruments import get_metrics
+from teleapi.core.tracing import trace_span
 
 
 logger = logging.getLogger(__name__)
@@ -35,21 +41,59 @@ class BaseErrorManager(metaclass=ErrorManagerMeta):
         self._handlers = [
             handler_cls(self) for handler_cls in (self.__class__.__dynamic_handlers__ + self.__class__.__manager_handlers__)
         ]
+        # Error type -> handler (or None), see `get_handler`
+        self._handlers_cache: Dict[Type[BaseException], Optional[BaseErrorHandler]] = {}
 
     async def register_handler(self, handler_instance: BaseErrorHandler) -> None:
         if not isinstance(handler_instance, BaseErrorHandler):
             raise TypeError("handler_instance must be instance of BaseErrorHandler")
 
         self._handlers.append(handler_instance)
+        self._handlers_cache.clear()
 
     def unregister_handler(self, handler_instance: BaseErrorHandler) -> None:
         self._handlers.remove(handler_instance)
+        self._handlers_cache.clear()
+
+    def get_handler(self, error_type: Type[BaseException]) -> Optional[BaseErrorHandler]:
+        """
+        Returns handler of the most specific exception class of error type (according to its MRO).
+        If several handlers handle the same class, the first registered is returned.
+        Results are cached by error type until handlers are changed
+
+        :param error_type: `Type[BaseException]`
+            Type of the error
+
+        :return: `Optional[BaseErrorHandler]`
+            Handler or None if there is no handler of the error type
+        """
+
+        try:
+            return self._handlers_cache[error_type]
+        except KeyError:
+            pass
+
+        handlers_by_cls = {}
+
+        for handler_instance in self._handlers:
+            exception_cls = handler_instance.exception_cls
+
+            for cls in (exception_cls if isinstance(exception_cls, tuple) else (exception_cls,)):
+                handlers_by_cls.setdefault(cls, handler_instance)
+
+        error_handler = next((handlers_by_cls[cls] for cls in error_type.__mro__ if cls in handlers_by_cls), None)
+
+        if error_handler is None:
+            # Handlers of virtual base classes (registered with ABCMeta.register) are not found by MRO
+            error_handler = find_in_list(self._handlers, lambda x: issubclass(error_type, x.exception_cls))
+
+        self._handlers_cache[error_type] = error_handler
+        return error_handler
 
     @staticmethod
     def manager_handler(*, exception_cls: Type[BaseException], **meta_kwargs):
         def decorator(func):
-            if not inspect.iscoroutinefunction(func):
-                raise TypeError("You can use this decorator only with coroutine functions")
+            func = to_async_handler(func)
 
             @wraps(func)
             async def wrapper(h, *args, **kwargs):
@@ -60,14 +104,22 @@ class BaseErrorManager(metaclass=ErrorManagerMeta):
         return decorator
 
     async def process_error(self, error: BaseException, update: Update) -> None:
-        error_handler = find_in_list(self._handlers, lambda x: issubclass(type(error), x.exception_cls))
+        with trace_span('error_manager', manager=self.__class__.__name__, error=error.__class__.__name__):
+            return await self._process_error(error, update)
+
+    async def _process_error(self, error: BaseException, update: Update) -> None:
+        error_handler = self.get_handler(type(error))
 
         if error_handler is not None:
             if await error_handler.handle(error, update):
+                if (metrics := get_metrics()) is not None:
+                    metrics.count_error(self, error, 'handled')
                 return
         if self.higher_error_manager:
             return await self.higher_error_manager.process_error(error, update)
         else:
+            if (metrics := get_metrics()) is not None:
+                metrics.count_error(self, error, 'unhandled')
             return await self.handle_unknown_error(error, update)
 
     @abstractmethod
@@ -76,6 +128,61 @@ class BaseErrorManager(metaclass=ErrorManagerMeta):
 
 
 class ErrorManager(BaseErrorManager):
+    """
+    Error manager that reports unknown errors. Errors are aggregated by fingerprint (exception type and traceback):
+    the first occurrence is reported with full traceback, repeated occurrences are summarized
+    every `ERROR_SUMMARY_INTERVAL` setting seconds (60).
+    If `ERROR_DIGEST_CHAT_ID` setting is defined, digests of errors are sent to the chat
+    at most once per `ERROR_DIGEST_INTERVAL` setting seconds (300)
+
+    Notes:
+     - By default all managers (of the bot and of executors) share one aggregator and notifier,
+       so the bot sends one digest of all its errors
+    """
+
+    def __init__(self,
+                 higher_error_manager: 'BaseErrorManager' = None,
+                 aggregator: ErrorAggregator = None,
+                 notifier: ErrorDigestNotifier = None) -> None:
+        """
+        Initialize the ErrorManager instance.
+
+        :param higher_error_manager: `BaseErrorManager`
+            (Optional) Error manager unhandled errors are passed to
+        :param aggregator: `ErrorAggregator`
+            (Optional) Own aggregator of unknown errors. Defaults to the shared aggregator (see `get_error_aggregator`)
+        :param notifier: `ErrorDigestNotifier`
+            (Optional) Own notifier of admin chat. Defaults to the shared notifier (see `get_error_notifier`)
+        """
+
+        super().__init__(higher_error_manager)
+
+        if aggregator is None and notifier is None:
+            # Shared aggregator reports summaries to the shared notifier itself
+            self.aggregator = get_error_aggregator()
+            self.notifier = get_error_notifier()
+        else:
+            self.aggregator = default(aggregator, ErrorAggregator(project_settings.get('ERROR_SUMMARY_INTERVAL', 60)))
+            self.notifier = notifier
+            self.aggregator.add_summary_callback(self.report_summary)
+
     async def handle_unknown_error(self, error: BaseException, update: Update) -> None:
-        logger.error(f'Got unknown error while processing update[{update.id}]: {get_traceback_text(error)}')
-        sys.stderr.write(get_traceback_text(error))
+        stats = self.aggregator.record(error)
+
+        if stats.count == 1:
+            traceback_text = get_traceback_text(error)
+            logger.error(f'Got unknown error while processing update[{update.id}] [{stats.fingerprint}]: {traceback_text}')
+            sys.stderr.write(traceback_text)
+
+    def report_summary(self, window: List[ErrorStats]) -> None:
+        """
+        Reports errors that occurred since the previous summary
+
+        :param window: `List[ErrorStats]`
+            Stats of the errors (most frequent first)
+        """
+
+        self.aggregator.log_summary(window)
+
+        if self.notifier is not None:
+            self.notifier.notify(window)
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Union
+
+from teleapi.core.state.settings import project_settings
+from .aggregation import ErrorStats, get_error_aggregator
+
+logger = logging.getLogger(__name__)
+
+_default_error_notifier: Optional['ErrorDigestNotifier'] = None
+
+MAX_MESSAGE_LENGTH = 4096
+
+
+class ErrorDigestNotifier:
+    """
+    Sends digests of errors to an admin chat at most once per `interval` seconds
+    """
+
+    def __init__(self, chat_id: Union[int, str], interval: float = 300, max_errors: int = 10) -> None:
+        """
+        Initialize the ErrorDigestNotifier instance.
+
+        :param chat_id: `Union[int, str]`
+            Id (or username) of the admin chat
+        :param interval: `float`
+            (Optional) Min interval between digests in seconds
+        :param max_errors: `int`
+            (Optional) Max amount of errors in a digest (the most frequent are sent)
+        """
+
+        self.chat_id = chat_id
+        self.interval = interval
+        self.max_errors = max_errors
+
+        self._pending: Dict[str, List] = {}  # fingerprint -> [stats, count]
+        self._last_sent_at = -float('inf')
+        self._send_handle: Optional[asyncio.TimerHandle] = None
+
+    def notify(self, window: List[ErrorStats]) -> None:
+        """
+        Adds summarized errors to the next digest
+
+        :param window: `List[ErrorStats]`
+            Errors that occurred since the previous summary
+        """
+
+        for stats in window:
+            pending = self._pending.setdefault(stats.fingerprint, [stats, 0])
+            pending[1] += stats.window_count
+
+        if self._send_handle is not None:
+            return
+
+        delay = max(0.0, self._last_sent_at + self.interval - time.monotonic())
+        self._send_handle = asyncio.get_running_loop().call_later(delay, self._start_sending)
+
+    def format_digest(self) -> str:
+        pending = sorted(self._pending.values(), key=lambda x: -x[1])
+        lines = [f"Errors digest: {sum(count for _, count in pending)} errors of {len(pending)} kinds"]
+
+        for stats, count in pending[:self.max_errors]:
+            lines.append(f"\n{count}x {stats.error_type}: {stats.message[:200]}\n{stats.place} [{stats.fingerprint}]")
+
+        if len(pending) > self.max_errors:
+            lines.append(f"\n...and {len(pending) - self.max_errors} more kinds")
+
+        return '\n'.join(lines)[:MAX_MESSAGE_LENGTH]
+
+    def _start_sending(self) -> None:
+        asyncio.create_task(self.send())
+
+    async def send(self) -> None:
+        """
+        Sends digest of pending errors. Errors of sending are logged (and not passed to error managers)
+        """
+
+        from teleapi.core.http.request.scheduler import RequestPriority, request_priority
+        from teleapi.generics.http.methods.messages import send_message
+
+        self._send_handle = None
+
+        if not self._pending:
+            return
+
+        text = self.format_digest()
+        self._pending.clear()
+        self._last_sent_at = time.monotonic()
+
+        try:
+            with request_priority(RequestPriority.BULK):
+                await send_message(text, chat_id=self.chat_id)
+        except Exception as error:
+            logger.warning(f"Failed to send errors digest to {self.chat_id}: {error.__class__.__name__}: {error}")
+
+
+def get_error_notifier() -> Optional[ErrorDigestNotifier]:
+    """
+    Returns notifier shared by error managers: it sends digests to `ERROR_DIGEST_CHAT_ID` setting chat
+    at most once per `ERROR_DIGEST_INTERVAL` setting seconds (300) and gets summaries of the shared aggregator
+
+    :return: `Optional[ErrorDigestNotifier]`
+        The notifier or None if `ERROR_DIGEST_CHAT_ID` setting is not defined
+    """
+
+    global _default_error_notifier
+
+    if _default_error_notifier is None:
+        if (chat_id := project_settings.get('ERROR_DIGEST_CHAT_ID', None)) is None:
+            return None
+
+        _default_error_notifier = ErrorDigestNotifier(chat_id, interval=project_settings.get('ERROR_DIGEST_INTERVAL', 300))
+        get_error_aggregator().add_summary_callback(_default_error_notifier.notify)
+
+    return _default_error_notifier
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Optional
 
 
 class TeleapiError(Exception):
@@ -13,3 +13,13 @@ class TeleapiError(Exception):
 
 class CancelOperationError(TeleapiError):
     default_message = "Operation cancelled"
+
+
+class HandlerTimeoutError(TeleapiError):
+    default_message = "Handler timed out"
+
+    def __init__(self, handler: Any = None, timeout: float = None) -> None:
+        self.handler = handler
+        self.timeout = timeout
+
+        super().__init__(f"{handler} timed out after {timeout}s" if handler is not None else None)
@@ -1,6 +1,12 @@
 import inspect
 from abc import ABC, abstractmethod
+from operator import attrgetter
 from typing import TYPE_CHECKING
+
+from teleapi.core.executors.timeouts import get_handler_timeout, run_with_timeout
+from teleapi.core.metrics.instruments import observe_handler
+from teleapi.core.tracing import trace_span
+from teleapi.core.utils.offload import ProcessFunction, run_in_process, to_async_handler
 from teleapi.core.utils.syntax import default
 from teleapi.types.message import Message
 from teleapi.core.utils.collections import clear_none_values
@@ -20,6 +26,14 @@ class BaseCommand(ABC):
         if self.name is None:
             raise AttributeError("You must define command name as static property in Meta or in __init__ parameters")
 
+        # `execute` is a picklable sync function running in the handler process pool
+        self.run_in_process = getattr(self.__class__.Meta, "run_in_process", False)
+
+        if self.run_in_process and (inspect.ismethod(self.execute) or inspect.iscoroutinefunction(self.execute)):
+            raise TypeError("execute of command running in process must be a sync static method or a module level function")
+
+        self.timeout = get_handler_timeout(self.__class__, executor)
+
     @abstractmethod
     async def execute(self, message: Message, **kwargs) -> None:
         ...
@@ -33,14 +47,28 @@ class BaseCommand(ABC):
     async def after(self, message: Message, **kwargs) -> None:
         ...
 
+    async def on_result(self, message: Message, result, **kwargs) -> None:
+        """
+        Called in the event loop with result of `execute` running in process (e.g. to send it)
+        """
+
     async def process_error(self, error: BaseException, message, **kwargs) -> None:
         raise error
 
     async def invoke(self, message: Message, **kwargs) -> None:
+        with observe_handler(self.executor, self.name, 'command'), \
+                trace_span('command', executor=self.executor.__class__.__name__, command=self.name):
+            await run_with_timeout(self._invoke(message, **kwargs), self.timeout, self.executor, self.name, 'command')
+
+    async def _invoke(self, message: Message, **kwargs) -> None:
         await self.before(message, **kwargs)
 
         try:
-            await self.execute(message, parameters=message.text.split(" ")[1:], **kwargs)
+            if self.run_in_process:
+                result = await run_in_process(self.execute, message, parameters=message.text.split(" ")[1:], **kwargs)
+                await self.on_result(message, result, **kwargs)
+            else:
+                await self.execute(message, parameters=message.text.split(" ")[1:], **kwargs)
         except BaseException as error:
             await self.process_error(error, message, **kwargs)
         else:
@@ -51,19 +79,25 @@ class Command(BaseCommand, ABC):
     pass
 
 
-def command(*, name: str = None, attr_name: str = None, before=None, after=None, **meta_kwargs):
+def command(*, name: str = None, attr_name: str = None, before=None, after=None,
+            run_in_process: bool = False, on_result=None, **meta_kwargs):
     def decorator(func):
-        if not inspect.iscoroutinefunction(func):
-            raise TypeError('You can use this decorator only with coroutine functions')
+        if run_in_process:
+            # func(message, parameters, **kwargs) runs in the handler process pool, its result is passed to on_result
+            execute = ProcessFunction(func)
+        else:
+            # Sync functions run in the handler thread pool
+            execute = to_async_handler(func, attrgetter('executor'))
 
-        meta = type("Meta", (object,), {'name': default(name, func.__name__), **meta_kwargs})
+        meta = type("Meta", (object,), {'name': default(name, func.__name__), 'run_in_process': run_in_process, **meta_kwargs})
 
         command_cls = type(default(attr_name, func.__name__), (Command,), {
-            "execute": func,
+            "execute": execute,
             "Meta": meta,
             **clear_none_values({
                 "before": before,
-                "after": after
+                "after": after,
+                "on_result": on_result
             })
         })
 
@@ -1,10 +1,15 @@
 import inspect
 import logging
 from abc import ABC, abstractmethod
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from teleapi.core.exceptions.teleapi import CancelOperationError
 from teleapi.core.http.updaters.events import UpdateEvent
+from teleapi.core.executors.timeouts import get_handler_timeout, run_with_timeout
+from teleapi.core.metrics.instruments import observe_handler
+from teleapi.core.tracing import trace_span
+from teleapi.core.utils.offload import ProcessFunction, run_in_process, to_async_handler
 from teleapi.core.utils.syntax import default
 from teleapi.types.update import Update
 from teleapi.core.utils.collections import clear_none_values
@@ -28,6 +33,14 @@ class BaseEventListener(ABC):
             raise AttributeError(
                 "You must define event listener event_type as static property in Meta or in __init__ parameters")
 
+        # `event_callback` is a picklable sync function running in the handler process pool
+        self.run_in_process = getattr(self.__class__.Meta, "run_in_process", False)
+
+        if self.run_in_process and (inspect.ismethod(self.event_callback) or inspect.iscoroutinefunction(self.event_callback)):
+            raise TypeError("event_callback of listener running in process must be a sync static method or a module level function")
+
+        self.timeout = get_handler_timeout(self.__class__, executor)
+
     def __str__(self) -> str:
         return f"<{self.__class__.__name__} [{self.event_type};{self.executor}]>"
 
@@ -41,14 +54,30 @@ class BaseEventListener(ABC):
     async def after(self, update: Update, **kwargs) -> None:
         ...
 
+    async def on_result(self, update: Update, result, **kwargs) -> None:
+        """
+        Called in the event loop with result of `event_callback` running in process (e.g. to send it)
+        """
+
     async def invoke(self, update: Update, **kwargs) -> None:
+        name = self.__class__.__name__
+
+        with observe_handler(self.executor, name, 'listener'), \
+                trace_span('listener', executor=self.executor.__class__.__name__, listener=name):
+            await run_with_timeout(self._invoke(update, **kwargs), self.timeout, self.executor, name, 'listener')
+
+    async def _invoke(self, update: Update, **kwargs) -> None:
         try:
             await self.before(update, **kwargs)
         except CancelOperationError:
-            logger.debug(f'Cancelling event call in {self}')
+            logger.debug('Cancelling event call in %s', self)
             return
 
-        await self.event_callback(update, **kwargs)
+        if self.run_in_process:
+            result = await run_in_process(self.event_callback, update, **kwargs)
+            await self.on_result(update, result, **kwargs)
+        else:
+            await self.event_callback(update, **kwargs)
 
         await self.after(update, **kwargs)
 
@@ -60,19 +89,25 @@ class EventListener(BaseEventListener, ABC):
     pass
 
 
-def event(*, attr_name: str = None, event_type: UpdateEvent, before=None, after=None, **meta_kwargs):
+def event(*, attr_name: str = None, event_type: UpdateEvent, before=None, after=None,
+          run_in_process: bool = False, on_result=None, **meta_kwargs):
     def decorator(func):
-        if not inspect.iscoroutinefunction(func):
-            raise TypeError('You can use this decorator only with coroutine functions')
+        if run_in_process:
+            # func(update, **kwargs) runs in the handler process pool, its result is passed to on_result
+            event_callback = ProcessFunction(func)
+        else:
+            # Sync functions run in the handler thread pool
+            event_callback = to_async_handler(func, attrgetter('executor'))
 
-        meta = type("Meta", (object,), {'event_type': event_type, **meta_kwargs})
+        meta = type("Meta", (object,), {'event_type': event_type, 'run_in_process': run_in_process, **meta_kwargs})
 
         event_listener_cls = type(default(attr_name, func.__name__), (EventListener,), {
-            "event_callback": func,
+            "event_callback": event_callback,
             "Meta": meta,
             **clear_none_values({
                 'before': before,
-                'after': after
+                'after': after,
+                'on_result': on_result
             })
         })
 
@@ -1,5 +1,4 @@
 import asyncio
-import inspect
 import re
 from asyncio import Event
 from functools import wraps
@@ -19,7 +18,10 @@ from teleapi.core.exceptions.managers import BaseErrorManager, ErrorManager
 import logging
 from teleapi.types.callback_query import CallbackQuery
 from teleapi.core.ui.inline_view.view import BaseInlineView
+from ..utils.offload import get_process_offloader, to_async_handler
 from ..utils.syntax import default
+from ..utils.types import UNDEFINED
+from teleapi.core.state.settings import project_settings
 
 if TYPE_CHECKING:
     from teleapi.core.bots.bot import BaseBot
@@ -43,9 +45,20 @@ class BaseExecutor(metaclass=ExecutorMeta):
 
     __executor_event_listeners__: List[Type[BaseEventListener]] = []
 
+    # Max amount of sync handlers of the executor running in the handler thread pool at the same time
+    __executor_thread_limit__: Optional[int] = None
+
+    # Default timeout (in seconds) of event listeners and commands of the executor (None disables `HANDLER_TIMEOUT`)
+    __executor_handler_timeout__: Union[Optional[float], Type[UNDEFINED]] = UNDEFINED
+
     def __init__(self, bot: 'BaseBot', error_manager: Type[BaseErrorManager] = None) -> None:
         self.bot = bot
         self.error_manager = default(error_manager, ErrorManager(higher_error_manager=self.bot.error_manager))
+        self.thread_limit = default(self.__class__.__executor_thread_limit__, project_settings.get('EXECUTOR_THREAD_LIMIT', None))
+        self.handler_timeout = self.__class__.__executor_handler_timeout__
+
+        if self.handler_timeout is UNDEFINED:
+            self.handler_timeout = project_settings.get('HANDLER_TIMEOUT', None)
 
         self._event_listeners = [
             event_listener_cls(self) for event_listener_cls in (self.__class__.__dynamic_event_listeners__ + self.__class__.__executor_event_listeners__)
@@ -54,8 +67,7 @@ class BaseExecutor(metaclass=ExecutorMeta):
     @staticmethod
     def executor_event(*, attr_name: str = None, event_type: UpdateEvent, before=None, after=None, **meta_kwargs):
         def decorator(func):
-            if not inspect.iscoroutinefunction(func):
-                raise TypeError('You can use this decorator only with coroutine functions')
+            func = to_async_handler(func, lambda executor: executor)
 
             @wraps(func)
             async def wrapper(listener: EventListener, update: Update, **kwargs):
@@ -68,8 +80,7 @@ class BaseExecutor(metaclass=ExecutorMeta):
     @staticmethod
     def executor_command(*, name: str = None, attr_name: str = None, before=None, after=None, **meta_kwargs):
         def decorator(func):
-            if not inspect.iscoroutinefunction(func):
-                raise TypeError('You can use this decorator only with coroutine functions')
+            func = to_async_handler(func, lambda executor: executor)
 
             @wraps(func)
             async def wrapper(cmd: 'BaseCommand', message: Message, *args, **kwargs) -> None:
@@ -111,6 +122,14 @@ class BaseExecutor(metaclass=ExecutorMeta):
         for event_listener in self._event_listeners:
             asyncio.create_task(event_listener.ainit())
 
+        self._start_process_pool(self._event_listeners)
+
+    @staticmethod
+    def _start_process_pool(handlers: List[Union[BaseEventListener, BaseCommand]]) -> None:
+        # Worker processes are started in advance, so the first handlers running in process don't wait for them
+        if any(getattr(handler, 'run_in_process', False) for handler in handlers) and (offloader := get_process_offloader()) is not None:
+            asyncio.create_task(offloader.start())
+
     async def register_event_listener(self, event_listener: BaseEventListener) -> None:
         if not isinstance(event_listener, BaseEventListener):
             raise TypeError("event_listener must be instance of BaseEventListener")
@@ -140,7 +159,7 @@ class BaseExecutor(metaclass=ExecutorMeta):
                 removed.append(event_listener)
 
         if len(removed) != 0:
-            logger.debug(f"Cleared {len(removed)} inactive event_listeners in {self}")
+            logger.debug("Cleared %s inactive event_listeners in %s", len(removed), self)
 
     async def call_event(self, update: Update, event_type: UpdateEvent, **kwargs) -> None:
         self._clear_event_listeners()
@@ -177,6 +196,8 @@ class Executor(BaseExecutor):
         for command in self._commands:
             asyncio.create_task(command.ainit())
 
+        self._start_process_pool(self._commands)
+
     async def register_command(self, command: BaseCommand) -> None:
         if not isinstance(command, BaseCommand):
             raise TypeError("command must be instance of BaseExecutor")
@@ -187,7 +208,8 @@ class Executor(BaseExecutor):
     def unregister_command(self, command: BaseCommand) -> None:
         self._commands.remove(command)
 
-    @BaseExecutor.executor_event(event_type=UpdateEvent.ON_COMMAND)
+    # Commands have their own timeouts
+    @BaseExecutor.executor_event(event_type=UpdateEvent.ON_COMMAND, timeout=None)
     async def core_command_event(self, message: Message, command_name: str, update: Update, **_) -> None:
         command: BaseCommand = find_in_list(self._commands, lambda x: x.name == command_name)
 
@@ -213,7 +235,7 @@ class Executor(BaseExecutor):
         view = find_in_list(BaseInlineView.__created_views__, lambda x: x.id == view_id)
 
         if view is None:
-            logger.debug(f"Skipping view_check_callback_query_event (UpdateEvent.ON_CALLBACK_QUERY) because view with id '{view_id}' was not found")
+            logger.debug("Skipping view_check_callback_query_event (UpdateEvent.ON_CALLBACK_QUERY) because view with id '%s' was not found", view_id)
             return
 
         try:
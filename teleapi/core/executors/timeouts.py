@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Optional, Type
+
+from teleapi.core.exceptions.teleapi import HandlerTimeoutError
+from teleapi.core.metrics.instruments import get_metrics
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.types import UNDEFINED
+
+logger = logging.getLogger(__name__)
+
+
+def get_handler_timeout(handler_cls: Type, executor: Any) -> Optional[float]:
+    """
+    Returns timeout of event listener or command: `timeout` in its Meta, `handler_timeout` of its executor
+    or `HANDLER_TIMEOUT` setting
+
+    :param handler_cls: `Type`
+        Class of event listener or command
+    :param executor: `Any`
+        Executor the handler belongs to
+
+    :return: `Optional[float]`
+        Timeout in seconds or None if handler is not limited (`timeout = None` in Meta disables executor timeout)
+    """
+
+    timeout = getattr(handler_cls.Meta, 'timeout', UNDEFINED)
+
+    if timeout is not UNDEFINED:
+        return timeout
+
+    return getattr(executor, 'handler_timeout', project_settings.get('HANDLER_TIMEOUT', None))
+
+
+async def run_with_timeout(coro: Awaitable, timeout: Optional[float], executor: Any, handler: str, kind: str) -> Any:
+    """
+    Awaits coroutine of a handler. If it's not finished in `timeout` seconds, it's cancelled and HandlerTimeoutError is raised
+
+    :param coro: `Awaitable`
+        Coroutine of the handler
+    :param timeout: `Optional[float]`
+        Timeout in seconds (None to await without timeout)
+    :param executor: `Any`
+        Executor the handler belongs to
+    :param handler: `str`
+        Name of event listener class or command
+    :param kind: `str`
+        Kind of the handler ('listener' or 'command')
+
+    :return: `Any`
+        Result of the coroutine
+
+    :raises:
+        :raise HandlerTimeoutError: If timeout is exceeded
+    """
+
+    if timeout is None:
+        return await coro
+
+    task = asyncio.ensure_future(coro)
+
+    try:
+        done, _ = await asyncio.wait((task,), timeout=timeout)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    if task in done:
+        return task.result()
+
+    task.cancel()
+
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception as error:
+        logger.debug("%s %s raised %r while being cancelled", kind.capitalize(), handler, error)
+
+    if (metrics := get_metrics()) is not None:
+        metrics.handler_timeouts.labels(executor.__class__.__name__, handler, kind).inc()
+
+    logger.warning("%s %s of %s timed out after %ss", kind.capitalize(), handler, executor.__class__.__name__, timeout)
+    raise HandlerTimeoutError(f"{kind} {handler}", timeout)
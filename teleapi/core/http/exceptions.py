@@ -101,6 +101,19 @@ class TooManyRequests(ApiRequestError):
     status_code = 429
 
 
+class CircuitOpenError(HttpError):
+    default_message = "Telegram Bot API is unavailable, request was not sent (circuit breaker is open)"
+
+    def __init__(self, message: str = None, retry_after: float = None) -> None:
+        super().__init__(message)
+
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(HttpError):
+    default_message = "Deadline of the request has been exceeded"
+
+
 class UnknownHttpError(ApiRequestError):
     default_message = "Unknown http error"
     description = "Unknown http error occurred"
@@ -1,2 +1,6 @@
 from .api_request import AsyncApiRequest, AsyncMethodApiRequest, AsyncFileApiRequest, method_request, file_request
 from .api_method import APIMethod
+from .scheduler import RequestPriority, RequestScheduler, request_priority
+from .ordering import ChatRequestQueues
+from .resilience import AIMDLimit, CircuitBreaker, CircuitState
+from .timeouts import get_remaining_time, request_deadline
@@ -53,8 +53,8 @@ class APIMethod(Enum):
     DELETE_MY_COMMANDS = "deleteMyCommands"
     GET_MY_COMMANDS = "getMyCommands"
     GET_MY_DESCRIPTION = "getMyDescription"
-    GET_MY_SHORT_DESCRIPTION = "setMyShortDescription"
-    SET_MY_SHORT_DESCRIPTION = "getMyShortDescription"
+    GET_MY_SHORT_DESCRIPTION = "getMyShortDescription"
+    SET_MY_SHORT_DESCRIPTION = "setMyShortDescription"
     SET_MY_NAME = "setMyName"
     SET_MY_DESCRIPTION = "setMyDescription"
     SET_MY_DEFAULT_ADMINISTRATOR_RIGHTS = "setMyDefaultAdministratorRights"
@@ -97,3 +97,14 @@ class APIMethod(Enum):
     SET_STICKER_MASK_POSITION = "setStickerMaskPosition"
     SET_STICKER_SET_TITLE = "setStickerSetTitle"
     SET_STICKER_SET_THUMBNAIL = "setStickerSetThumbnail"
+
+    @property
+    def is_getter(self) -> bool:
+        """
+        Checks if method is an idempotent getter (`getUpdates` is not considered one, because it confirms updates)
+
+        :return: `bool`
+            True if method only reads data
+        """
+
+        return self.name.startswith("GET_") and self is not APIMethod.GET_UPDATES
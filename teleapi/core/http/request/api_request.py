@@ -1,14 +1,25 @@
-import json
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple, Any
+from contextlib import nullcontext
+from typing import Tuple, Any, Dict
 
 import aiohttp
 
-from teleapi.core.http.exceptions import UnknownHttpError, error_status_mapping
+from teleapi.core.http.exceptions import DeadlineExceededError, UnknownHttpError, error_status_mapping
 from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.request.cache import get_response_cache, get_response_chat_ids, get_request_chat_ids, CHAT_CHANGING_METHODS
+from teleapi.core.http.request.ordering import ORDERED_METHODS, chat_request_queues, get_request_chat_id
+from teleapi.core.http.request.resilience import get_circuit_breaker
+from teleapi.core.http.request.scheduler import RequestPriority, UNSCHEDULED_METHODS, get_request_priority, get_request_scheduler
+from teleapi.core.http.request.timeouts import FILE_TIMEOUT, get_method_timeout, get_request_timeout
+from teleapi.core.http.request.singleflight import request_coalescer, is_coalescable, make_request_key
+from teleapi.core.http.transports.base import get_http_transport
+from teleapi.core.metrics.instruments import get_metrics
 from teleapi.core.orm.typing import JsonValue
 from teleapi.core.state.settings import project_settings
-from teleapi.core.utils.async_tools import async_http_request
+from teleapi.core.tracing import trace_span
+from teleapi.core.utils.json_codec import get_json_codec
 from teleapi.core.utils.syntax import default
 
 
@@ -19,6 +30,8 @@ class AsyncApiRequest(ABC):
     An abstract base class for making asynchronous requests to the Telegram HTTP API.
     """
 
+    DEFAULT_SERVER_URL: str = "https://api.telegram.org"
+
     def __init__(self, http_method: str, token: str = None) -> None:
         """
         Initialize the AsyncApiRequest instance.
@@ -45,13 +58,25 @@ class AsyncApiRequest(ABC):
     def BASE_URL(self) -> str:
         """
         Abstract property to be implemented by subclasses.
-        Returns the base URL of the Telegram API.
+        Returns the base URL template of the Telegram API. The first placeholder is always the server URL.
 
         :return: `str`
             The base URL.
         """
         ...
 
+    @property
+    def server_url(self) -> str:
+        """
+        Returns the URL of the Bot API server requests are sent to.
+        Can be configured with the `API_SERVER_URL` setting (e.g. to use a self-hosted telegram-bot-api server).
+
+        :return: `str`
+            The server URL without trailing slash.
+        """
+
+        return str(project_settings.get('API_SERVER_URL', self.__class__.DEFAULT_SERVER_URL)).rstrip('/')
+
     @abstractmethod
     def get_url(self) -> str:
         """
@@ -86,7 +111,7 @@ class AsyncMethodApiRequest(AsyncApiRequest):
     A subclass of AsyncApiRequest for making asynchronous API requests to the Telegram HTTP API using specific methods.
     """
 
-    BASE_URL: str = "https://api.telegram.org/bot{}/{}"
+    BASE_URL: str = "{}/bot{}/{}"
 
     def __init__(self, method: APIMethod, *args, **kwargs) -> None:
         """
@@ -111,7 +136,32 @@ class AsyncMethodApiRequest(AsyncApiRequest):
             The complete URL.
         """
 
-        return self.BASE_URL.format(self.token, self.method.value)
+        return self.BASE_URL.format(self.server_url, self.token, self.method.value)
+
+    @staticmethod
+    def prepare_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serializes request body (dict is dumped to JSON with codec from `JSON_CODEC` setting, `FormData` is converted to payload).
+        Prepared kwargs are not serialized again by `send`
+
+        :param kwargs: `dict`
+            Keyword arguments of the request
+
+        :return: `dict`
+            Keyword arguments with serialized body
+        """
+
+        data = kwargs.get('data')
+
+        if isinstance(data, dict):
+            kwargs = dict(kwargs)
+            kwargs['headers'] = {**kwargs.get("headers", {}), 'Content-Type': 'application/json'}
+            kwargs['data'] = get_json_codec().dumps(data)
+        elif isinstance(data, aiohttp.FormData):
+            kwargs = dict(kwargs)
+            kwargs['data'] = data()
+
+        return kwargs
 
     async def send(self, **kwargs) -> Tuple[aiohttp.ClientResponse, JsonValue]:
         """
@@ -128,16 +178,10 @@ class AsyncMethodApiRequest(AsyncApiRequest):
             :raise aiohttp.ClientError: If there's an issue with the HTTP request itself.
         """
 
-        data = kwargs.get('data')
+        kwargs = self.prepare_kwargs(kwargs)
 
-        if isinstance(data, dict):
-            headers = kwargs.get("headers", {})
-            headers['Content-Type'] = 'application/json'
-            kwargs['headers'] = headers
-            kwargs['data'] = json.dumps(data)
-
-        response, bytes_ = await async_http_request(self.http_method, self.url, **kwargs)
-        response_data = json.loads(bytes_)
+        response, bytes_ = await get_http_transport().request(self.http_method, self.url, **kwargs)
+        response_data = get_json_codec().loads(bytes_)
 
         if not (200 <= response.status <= 299):
             error_type = error_status_mapping.get(response.status, UnknownHttpError)
@@ -158,7 +202,7 @@ class AsyncFileApiRequest(AsyncApiRequest):
     Represents an asynchronous HTTP request for Telegram API file operations.
     """
 
-    BASE_URL: str = "https://api.telegram.org/file/bot{}/{}"
+    BASE_URL: str = "{}/file/bot{}/{}"
 
     def __init__(self, file_path: str, *args, **kwargs) -> None:
         """
@@ -183,7 +227,7 @@ class AsyncFileApiRequest(AsyncApiRequest):
             The complete URL.
         """
 
-        return self.BASE_URL.format(self.token, self.file_path)
+        return self.BASE_URL.format(self.server_url, self.token, self.file_path)
 
     async def send(self, **kwargs) -> Tuple[aiohttp.ClientResponse, bytes]:
         """
@@ -200,10 +244,10 @@ class AsyncFileApiRequest(AsyncApiRequest):
             :raise aiohttp.ClientError: If there's an issue with the HTTP request itself.
         """
 
-        response, bytes_ = await async_http_request(self.http_method, self.url, **kwargs)
+        response, bytes_ = await get_http_transport().request(self.http_method, self.url, **kwargs)
 
         if not (200 <= response.status <= 299):
-            response_data = json.loads(bytes_)
+            response_data = get_json_codec().loads(bytes_)
             error_type = error_status_mapping.get(response.status, UnknownHttpError)
 
             raise error_type(
@@ -215,12 +259,122 @@ class AsyncFileApiRequest(AsyncApiRequest):
         return response, bytes_
 
 
+async def send_with_timeout(request: AsyncApiRequest,
+                            timeout: float = None,
+                            **kwargs) -> Tuple[aiohttp.ClientResponse, Any]:
+    """
+    Sends the request with its timeout, limited by deadline of the current context (see `request_deadline`)
+
+    :param request: `AsyncApiRequest`
+        The request to be sent
+
+    :param timeout: `float`
+        (Optional) Total timeout of the request in seconds. Defaults to timeout of the API method (see `get_method_timeout`)
+
+    :param kwargs: `dict`
+        (Optional) Additional keyword arguments to pass to the API request.
+
+    :return: `Tuple[aiohttp.ClientResponse, Any]`
+        Result of the request
+
+    :raises:
+        :raise DeadlineExceededError: If deadline has passed before or during the request
+    """
+
+    if isinstance(request, AsyncMethodApiRequest):
+        default_timeout = get_method_timeout(request.method, kwargs)
+    else:
+        default_timeout = project_settings.get('FILE_REQUEST_TIMEOUT', FILE_TIMEOUT)
+
+    requested_timeout = default(timeout, default_timeout)
+    total_timeout = get_request_timeout(requested_timeout)
+
+    metrics = get_metrics()
+    started_at = time.perf_counter()
+    outcome = 'ok'
+
+    try:
+        with trace_span('http', timeout=total_timeout):
+            return await request.send(timeout=aiohttp.ClientTimeout(total=total_timeout), **kwargs)
+    except asyncio.TimeoutError as error:
+        if total_timeout < requested_timeout:
+            outcome = DeadlineExceededError.__name__
+            raise DeadlineExceededError() from error
+
+        outcome = 'timeout'
+        raise
+    except BaseException as error:
+        outcome = error.__class__.__name__
+        raise
+    finally:
+        if metrics is not None:
+            metrics.observe_api_request(
+                request.method.value if isinstance(request, AsyncMethodApiRequest) else 'file',
+                outcome,
+                time.perf_counter() - started_at
+            )
+
+
+async def send_scheduled(request: AsyncMethodApiRequest,
+                         priority: RequestPriority = None,
+                         timeout: float = None,
+                         **kwargs) -> Tuple[aiohttp.ClientResponse, JsonValue]:
+    """
+    Sends the request when request scheduler (see `REQUEST_SCHEDULER` setting) grants a slot for it.
+    Request is not sent if Bot API server is unavailable (see `CIRCUIT_BREAKER` setting)
+
+    :param request: `AsyncMethodApiRequest`
+        The request to be sent
+
+    :param priority: `RequestPriority`
+        (Optional) Request priority. Defaults to priority of the current context (see `request_priority`)
+
+    :param timeout: `float`
+        (Optional) Total timeout of the request in seconds. Defaults to timeout of the API method (see `get_method_timeout`)
+
+    :param kwargs: `dict`
+        (Optional) Additional keyword arguments to pass to the API request.
+
+    :return: `Tuple[aiohttp.ClientResponse, JsonValue]`
+        A tuple containing the HTTP response and the parsed JSON response body.
+
+    :raises:
+        :raise CircuitOpenError: If circuit breaker is open
+        :raise DeadlineExceededError: If deadline has passed before or during the request
+    """
+
+    if request.method in UNSCHEDULED_METHODS:
+        return await send_with_timeout(request, timeout, **kwargs)
+
+    get_request_timeout(0)  # Don't queue requests that are already late
+
+    scheduler = get_request_scheduler()
+    breaker = get_circuit_breaker()
+
+    # Timeout chosen by the caller (e.g. short timeout of a slow upload) doesn't mean that server is unavailable
+    count_timeouts = timeout is None
+
+    with breaker.call(count_timeouts) if breaker is not None else nullcontext():
+        if scheduler is None:
+            return await send_with_timeout(request, timeout, **kwargs)
+
+        async with scheduler.slot(default(priority, get_request_priority()), count_timeouts):
+            return await send_with_timeout(request, timeout, **kwargs)
+
+
 async def method_request(http_method: str,
                          method: APIMethod,
                          token: str = None,
+                         priority: RequestPriority = None,
+                         timeout: float = None,
                          **kwargs) -> Tuple[aiohttp.ClientResponse, JsonValue]:
     """
     Send an asynchronous HTTP request for a specific API method. (reduction in interaction with AsyncMethodApiRequest)
+    Concurrent identical requests of getter methods share one request (can be disabled with `COALESCE_REQUESTS` setting)
+    Responses of some getter methods are cached if `RESPONSE_CACHE` setting is defined
+    Requests share rate and concurrency limits according to their priority (see `REQUEST_SCHEDULER` setting)
+    Messages to the same chat are sent in submission order (can be disabled with `ORDER_CHAT_REQUESTS` setting)
+    Requests respect deadline of the current context (see `request_deadline`)
 
     :param http_method: `str`
         The HTTP method to use for the request (e.g., "GET", "POST", "PUT", etc.).
@@ -231,6 +385,12 @@ async def method_request(http_method: str,
     :param token: `str`
         (Optional) The token to be used for authorization. Defaults to `None`.
 
+    :param priority: `RequestPriority`
+        (Optional) Request priority. Defaults to priority of the current context (see `request_priority`)
+
+    :param timeout: `float`
+        (Optional) Total timeout of the request in seconds. Defaults to timeout of the API method (see `get_method_timeout`)
+
     :param kwargs: `dict`
         (Optional) Additional keyword arguments to pass to the API request.
 
@@ -240,19 +400,96 @@ async def method_request(http_method: str,
     :raises:
         :raise ApiRequestError: ApiRequestError or any of its subclasses if the request sent to the Telegram Bot API fails.
         :raise aiohttp.ClientError: If there's an issue with the HTTP request itself.
+        :raise CircuitOpenError: If circuit breaker is open
+        :raise DeadlineExceededError: If deadline has passed before or during the request
     """
 
+    with trace_span('api_request', method=method.value):
+        return await _method_request(http_method, method, token, priority, timeout, **kwargs)
+
+
+async def _method_request(http_method: str,
+                          method: APIMethod,
+                          token: str = None,
+                          priority: RequestPriority = None,
+                          timeout: float = None,
+                          **kwargs) -> Tuple[aiohttp.ClientResponse, JsonValue]:
     request = AsyncMethodApiRequest(
         method=method,
         http_method=http_method,
         token=token
     )
-    return await request.send(**kwargs)
+
+    if not is_coalescable(http_method, method):
+        cache = get_response_cache() if method in CHAT_CHANGING_METHODS else None
+        chat_ids = get_request_chat_ids(kwargs) if cache is not None else ()
+
+        for chat_id in chat_ids:
+            cache.invalidate_chat(chat_id)
+
+        try:
+            return await _send_in_chat_order(request, priority, timeout, **kwargs)
+        finally:
+            # Responses of getters that were in flight while the chat was changed are outdated
+            for chat_id in chat_ids:
+                cache.invalidate_chat(chat_id)
+
+    key = make_request_key(request.token, http_method, method, kwargs)
+
+    if key is None:
+        return await send_scheduled(request, priority, timeout, **kwargs)
+
+    cache = get_response_cache()
+
+    if cache is not None and not cache.is_cacheable(method):
+        cache = None
+
+    if cache is not None and (cached := cache.get(key)) is not None:
+        return cached
+
+    generation = cache.get_generation() if cache is not None else None
+
+    async def send_request() -> Tuple[aiohttp.ClientResponse, JsonValue]:
+        result = await send_scheduled(request, priority, timeout, **kwargs)
+
+        if cache is not None:
+            cache.set(key, method, result, chat_ids=get_response_chat_ids(method, kwargs, result[1]), generation=generation)
+
+        return result
+
+    if project_settings.get('COALESCE_REQUESTS', True):
+        if cache is not None:
+            # Request doesn't join the call that was started before its chat was changed
+            key = (key, cache.get_chat_generation(get_request_chat_ids(kwargs)))
+
+        return await request_coalescer.do(key, send_request)
+
+    return await send_request()
+
+
+async def _send_in_chat_order(request: AsyncMethodApiRequest,
+                              priority: RequestPriority = None,
+                              timeout: float = None,
+                              **kwargs) -> Tuple[aiohttp.ClientResponse, JsonValue]:
+    if request.method in ORDERED_METHODS and project_settings.get('ORDER_CHAT_REQUESTS', True) \
+            and (chat_id := get_request_chat_id(kwargs)) is not None:
+        turn = chat_request_queues.enter((request.token, str(chat_id)))
+
+        try:
+            # Body is serialized while previous request to the chat is in flight
+            kwargs = request.prepare_kwargs(kwargs)
+            await turn.wait()
+            return await send_scheduled(request, priority, timeout, **kwargs)
+        finally:
+            turn.release()
+
+    return await send_scheduled(request, priority, timeout, **kwargs)
 
 
 async def file_request(http_method: str,
                        file_path: str,
                        token: str = None,
+                       timeout: float = None,
                        **kwargs) -> Tuple[aiohttp.ClientResponse, bytes]:
     """
     Sends an HTTP request using the Telegram Bot API to interact with files. (reduction in interaction with AsyncFileApiRequest)
@@ -266,6 +503,9 @@ async def file_request(http_method: str,
     :param token: `str`
         (Optional) The authentication token for accessing the Telegram Bot API. If not provided, the function will work without authorization.
 
+    :param timeout: `float`
+        (Optional) Total timeout of the request in seconds. Defaults to `FILE_REQUEST_TIMEOUT` setting (300)
+
     :param kwargs: `dict`
         (Optional) Additional keyword arguments that can be passed to the request.
 
@@ -282,4 +522,4 @@ async def file_request(http_method: str,
         http_method=http_method,
         token=token
     )
-    return await request.send(**kwargs)
+    return await send_with_timeout(request, timeout, **kwargs)
@@ -0,0 +1,331 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple, Union
+
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.request.ordering import get_request_chat_id
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.syntax import default
+
+
+# Methods that change chat information or members. Cached responses of the chat are invalidated when they are called
+CHAT_CHANGING_METHODS = frozenset({
+    APIMethod.KICK_CHAT_MEMBER, APIMethod.BAN_CHAT_MEMBER, APIMethod.UNBAN_CHAT_MEMBER, APIMethod.RESTRICT_CHAT_MEMBER,
+    APIMethod.PROMOTE_CHAT_MEMBER, APIMethod.SET_CHAT_ADMIN_CUSTOM_TITLE, APIMethod.SET_CHAT_PERMISSIONS,
+    APIMethod.EXPORT_CHAT_INVITE_LINK, APIMethod.SET_CHAT_PHOTO, APIMethod.DELETE_CHAT_PHOTO, APIMethod.SET_CHAT_TITLE,
+    APIMethod.SET_CHAT_DESCRIPTION, APIMethod.PIN_CHAT_MESSAGE, APIMethod.UNPIN_CHAT_MESSAGE,
+    APIMethod.UNPIN_ALL_CHAT_MESSAGES, APIMethod.LEAVE_CHAT, APIMethod.SET_CHAT_STICKER_SET,
+    APIMethod.DELETE_CHAT_STICKER_SET, APIMethod.APPROVE_CHAT_JOIN_REQUEST, APIMethod.DECLINE_CHAT_JOIN_REQUEST
+})
+
+
+class BaseResponseCache(ABC):
+    """
+    Abstract base class for caches of Telegram Bot API responses.
+    Caches are used by `method_request` for methods listed in `ttls` (see `RESPONSE_CACHE` setting)
+    """
+
+    DEFAULT_TTLS: Dict[APIMethod, float] = {
+        APIMethod.GET_CHAT: 60,
+        APIMethod.GET_CHAT_ADMINISTRATORS: 300,
+        APIMethod.GET_CHAT_MEMBER: 60,
+        APIMethod.GET_CHAT_MEMBERS_COUNT: 60,
+        APIMethod.GET_STICKER_SET: 3600
+    }
+
+    def __init__(self, ttls: Dict[APIMethod, float] = None) -> None:
+        """
+        Initialize the BaseResponseCache instance.
+
+        :param ttls: `Dict[APIMethod, float]`
+            (Optional) Time to live (in seconds) of cached responses of each method. Only listed methods are cached.
+            Defaults to `DEFAULT_TTLS`
+        """
+
+        self.ttls = dict(default(ttls, self.__class__.DEFAULT_TTLS))
+
+    def is_cacheable(self, method: APIMethod) -> bool:
+        """
+        Checks if responses of the method are cached
+
+        :param method: `APIMethod`
+            The API method
+
+        :return: `bool`
+            True if responses of the method are cached
+        """
+
+        return method in self.ttls
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Any]]:
+        """
+        Returns cached response
+
+        :param key: `Hashable`
+            Request key
+
+        :return: `Optional[Tuple[Any, Any]]`
+            Cached `(response, data)` tuple or None if there is no fresh cached response
+        """
+        ...
+
+    def get_generation(self) -> Optional[int]:
+        """
+        Returns current generation of the cache. It is taken before the request and passed to `set`,
+        so response isn't cached if its chat was invalidated while the request was in flight
+
+        :return: `Optional[int]`
+            Generation or None if cache doesn't track invalidations
+        """
+
+        return None
+
+    def get_chat_generation(self, chat_ids: Iterable[Union[int, str]]) -> Optional[int]:
+        """
+        Returns generation of the last invalidation of the chats
+
+        :param chat_ids: `Iterable[Union[int, str]]`
+            Chat ids or usernames
+
+        :return: `Optional[int]`
+            Generation or None if cache doesn't track invalidations
+        """
+
+        return None
+
+    @abstractmethod
+    def set(self,
+            key: Hashable,
+            method: APIMethod,
+            value: Tuple[Any, Any],
+            chat_ids: Iterable[Union[int, str]] = (),
+            generation: int = None
+            ) -> None:
+        """
+        Caches response
+
+        :param key: `Hashable`
+            Request key
+
+        :param method: `APIMethod`
+            The API method of the request (is used to get TTL)
+
+        :param value: `Tuple[Any, Any]`
+            `(response, data)` tuple to be cached
+
+        :param chat_ids: `Iterable[Union[int, str]]`
+            Ids (or usernames) of chats the response belongs to. Used to invalidate response
+
+        :param generation: `int`
+            (Optional) Generation of the cache (see `get_generation`) taken before the request.
+            Response is not cached if one of its chats was invalidated after it
+        """
+        ...
+
+    @abstractmethod
+    def invalidate_chat(self, chat_id: Union[int, str]) -> None:
+        """
+        Removes all cached responses that belong to the chat
+
+        :param chat_id: `Union[int, str]`
+            Chat id or username
+        """
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Removes all cached responses
+        """
+        ...
+
+
+class MemoryResponseCache(BaseResponseCache):
+    """
+    Bounded in-memory LRU cache of Telegram Bot API responses
+
+    Notes:
+     - Generations of the last `max_size` invalidated chats are kept. Responses requested before
+       older invalidations are not cached
+    """
+
+    def __init__(self, max_size: int = 10000, **kwargs) -> None:
+        """
+        Initialize the MemoryResponseCache instance.
+
+        :param max_size: `int`
+            Maximum amount of cached responses. Least recently used responses are evicted first
+
+        :param kwargs: `dict`
+            (Optional) Other parameters to be passed to the parent class constructor.
+        """
+
+        super().__init__(**kwargs)
+
+        self.max_size = max_size
+
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Tuple[Any, Any], Tuple[str, ...]]]' = OrderedDict()
+        self._chat_keys: Dict[str, Set[Hashable]] = {}
+
+        self._generation = 0
+        self._chat_generations: 'OrderedDict[str, int]' = OrderedDict()  # Generation of the last invalidation
+        self._forgotten_generation = 0  # Latest generation evicted from `_chat_generations`
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Any]]:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value, _ = entry
+
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def get_generation(self) -> Optional[int]:
+        return self._generation
+
+    def get_chat_generation(self, chat_ids: Iterable[Union[int, str]]) -> Optional[int]:
+        return max(
+            (self._chat_generations.get(str(chat_id), self._forgotten_generation) for chat_id in chat_ids),
+            default=self._forgotten_generation
+        )
+
+    def set(self,
+            key: Hashable,
+            method: APIMethod,
+            value: Tuple[Any, Any],
+            chat_ids: Iterable[Union[int, str]] = (),
+            generation: int = None
+            ) -> None:
+        tags = tuple({str(chat_id) for chat_id in chat_ids if chat_id is not None})
+
+        if generation is not None and (
+                generation < self._forgotten_generation
+                or any(self._chat_generations.get(tag, 0) > generation for tag in tags)
+        ):
+            # Chat was changed while the request was in flight, response may be outdated
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttls[method], value, tags)
+
+        for tag in tags:
+            self._chat_keys.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_chat(self, chat_id: Union[int, str]) -> None:
+        tag = str(chat_id)
+
+        for key in self._chat_keys.pop(tag, ()):
+            self._remove(key)
+
+        self._generation += 1
+        self._chat_generations[tag] = self._generation
+        self._chat_generations.move_to_end(tag)
+
+        while len(self._chat_generations) > self.max_size:
+            _, self._forgotten_generation = self._chat_generations.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._chat_keys.clear()
+        self._generation += 1
+        self._chat_generations.clear()
+        self._forgotten_generation = self._generation
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._chat_keys.get(tag)
+
+            if keys is not None:
+                keys.discard(key)
+
+                if not keys:
+                    del self._chat_keys[tag]
+
+
+def get_response_cache() -> Optional[BaseResponseCache]:
+    """
+    Returns response cache configured with `RESPONSE_CACHE` setting
+
+    :return: `Optional[BaseResponseCache]`
+        Response cache or None if responses caching is disabled
+    """
+
+    cache = project_settings.get('RESPONSE_CACHE', None)
+
+    if cache is not None and not isinstance(cache, BaseResponseCache):
+        raise TypeError("RESPONSE_CACHE setting must be instance of BaseResponseCache")
+
+    return cache
+
+
+def get_request_chat_ids(request_kwargs: Dict[str, Any]) -> Set[Union[int, str]]:
+    """
+    Returns ids of chats specified in request arguments (dict or multipart `FormData` body and query parameters)
+
+    :param request_kwargs: `dict`
+        Keyword arguments of the request
+
+    :return: `Set[Union[int, str]]`
+        Chat ids and usernames
+    """
+
+    chat_ids = set()
+
+    if (chat_id := get_request_chat_id(request_kwargs)) is not None:
+        chat_ids.add(chat_id)
+
+    params = request_kwargs.get('params')
+
+    if isinstance(params, dict) and params.get('chat_id') is not None:
+        chat_ids.add(params['chat_id'])
+
+    return chat_ids
+
+
+def get_response_chat_ids(method: APIMethod, request_kwargs: Dict[str, Any], data: Any) -> Set[Union[int, str]]:
+    """
+    Returns ids of chats the response belongs to
+
+    :param method: `APIMethod`
+        The API method of the request
+
+    :param request_kwargs: `dict`
+        Keyword arguments of the request
+
+    :param data: `Any`
+        Response data
+
+    :return: `Set[Union[int, str]]`
+        Chat ids and usernames
+    """
+
+    chat_ids = get_request_chat_ids(request_kwargs)
+
+    if method == APIMethod.GET_CHAT and isinstance(data, dict) and isinstance(data.get('result'), dict):
+        chat_ids.add(data['result'].get('id'))
+
+        if username := data['result'].get('username'):
+            chat_ids.add(f"@{username}")
+
+    return chat_ids
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, Dict, Hashable, Optional
+
+from aiohttp import FormData
+
+from teleapi.core.http.request.api_method import APIMethod
+
+# Methods whose requests to the same chat are sent in submission order
+ORDERED_METHODS = frozenset({
+    APIMethod.SEND_MESSAGE, APIMethod.FORWARD_MESSAGE, APIMethod.COPY_MESSAGE, APIMethod.SEND_PHOTO,
+    APIMethod.SEND_AUDIO, APIMethod.SEND_DOCUMENT, APIMethod.SEND_VIDEO, APIMethod.SEND_ANIMATION,
+    APIMethod.SEND_VOICE, APIMethod.SEND_VIDEO_NOTE, APIMethod.SEND_MEDIA_GROUP, APIMethod.SEND_LOCATION,
+    APIMethod.SEND_STICKER, APIMethod.SEND_VENUE, APIMethod.SEND_CONTACT, APIMethod.SEND_POLL, APIMethod.SEND_DICE,
+    APIMethod.EDIT_MESSAGE_TEXT, APIMethod.EDIT_MESSAGE_CAPTION, APIMethod.EDIT_MESSAGE_MEDIA,
+    APIMethod.EDIT_MESSAGE_REPLY_MARKUP, APIMethod.EDIT_MESSAGE_LIVE_LOCATION, APIMethod.STOP_MESSAGE_LIVE_LOCATION,
+    APIMethod.STOP_POLL, APIMethod.DELETE_MESSAGE
+})
+
+
+class RequestTurn:
+    """
+    Place of the request in the chat queue
+    """
+
+    __slots__ = ('key', '_queues', '_previous', '_own')
+
+    def __init__(self, queues: 'ChatRequestQueues', key: Hashable, previous: Optional[asyncio.Future], own: asyncio.Future) -> None:
+        self.key = key
+
+        self._queues = queues
+        self._previous = previous
+        self._own = own
+
+    async def wait(self) -> None:
+        """
+        Waits until all previous requests to the chat are completed
+        """
+
+        if self._previous is not None:
+            await asyncio.shield(self._previous)
+
+    def release(self) -> None:
+        """
+        Lets the next request to the chat to be sent.
+        If previous requests are not completed yet (e.g. waiting request was cancelled), turn is released after them
+        """
+
+        if self._previous is None or self._previous.done():
+            self._queues._release(self.key, self._own)
+        else:
+            self._previous.add_done_callback(lambda _: self._queues._release(self.key, self._own))
+
+
+class ChatRequestQueues:
+    """
+    Per-chat FIFO queues of outbound requests: requests to the same chat are sent one after another in submission order,
+    requests to different chats are sent concurrently.
+
+    Queue of the chat exists only while it has requests, so idle chats take no memory.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the ChatRequestQueues instance.
+        """
+
+        self._tails: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._tails)
+
+    def enter(self, key: Hashable) -> RequestTurn:
+        """
+        Puts the request to the end of the chat queue
+
+        :param key: `Hashable`
+            Queue key (chat id)
+
+        :return: `RequestTurn`
+            Turn of the request. `RequestTurn.release` must be called after request is completed
+        """
+
+        own = asyncio.get_running_loop().create_future()
+        previous = self._tails.get(key)
+        self._tails[key] = own
+
+        return RequestTurn(self, key, previous, own)
+
+    def _release(self, key: Hashable, own: asyncio.Future) -> None:
+        if not own.done():
+            own.set_result(None)
+
+        if self._tails.get(key) is own:
+            del self._tails[key]
+
+
+def get_request_chat_id(request_kwargs: Dict[str, Any]) -> Optional[Any]:
+    """
+    Returns id of the chat the request is sent to
+
+    :param request_kwargs: `dict`
+        Keyword arguments of the request
+
+    :return: `Optional[Any]`
+        Chat id or username (None if request has no chat id)
+    """
+
+    data = request_kwargs.get('data')
+
+    if isinstance(data, dict):
+        return data.get('chat_id')
+
+    if isinstance(data, FormData):
+        # noinspection PyProtectedMember
+        for type_options, _, value in data._fields:
+            if type_options.get('name') == 'chat_id':
+                return value
+
+    return None
+
+
+chat_request_queues = ChatRequestQueues()
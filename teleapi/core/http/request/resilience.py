@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional
+
+import aiohttp
+
+from teleapi.core.http.exceptions import (
+    CircuitOpenError, DeadlineExceededError, GatewayTimeout, InternalServerError, ServiceUnavailable, TooManyRequests
+)
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.syntax import default
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the Bot API server is unavailable or degraded
+FAILURE_EXCEPTIONS = (
+    InternalServerError, ServiceUnavailable, GatewayTimeout, aiohttp.ClientConnectionError, asyncio.TimeoutError
+)
+
+# Errors that mean the client should send fewer requests
+OVERLOAD_EXCEPTIONS = (TooManyRequests, *FAILURE_EXCEPTIONS)
+
+_DEFAULT = object()
+_default_circuit_breaker: Optional['CircuitBreaker'] = None
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"  # Requests are sent
+    OPEN = "open"  # Requests are rejected without being sent
+    HALF_OPEN = "half_open"  # Limited amount of trial requests is sent to check if server is recovered
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to the Bot API server while it is unavailable.
+
+    After `failure_threshold` consecutive failures (see `FAILURE_EXCEPTIONS`) circuit opens and all requests fail
+    immediately with `CircuitOpenError`. After `recovery_timeout` seconds circuit becomes half-open and lets
+    `half_open_calls` trial requests through: if they succeed circuit closes, else opens again.
+
+    Notes:
+     - Any response of the server (including 4xx errors) is considered a success
+     - Requests abandoned because of deadline (see `request_deadline`) or of timeout chosen by the caller
+       (see `call`) are not counted
+    """
+
+    def __init__(self, failure_threshold: int = None, recovery_timeout: float = None, half_open_calls: int = None) -> None:
+        """
+        Initialize the CircuitBreaker instance.
+
+        :param failure_threshold: `int`
+            (Optional) Amount of consecutive failures that opens the circuit.
+            Defaults to `CIRCUIT_BREAKER_FAILURE_THRESHOLD` setting (5)
+
+        :param recovery_timeout: `float`
+            (Optional) Time in seconds circuit stays open. Defaults to `CIRCUIT_BREAKER_RECOVERY_TIMEOUT` setting (30)
+
+        :param half_open_calls: `int`
+            (Optional) Amount of trial requests in half-open state. Defaults to `CIRCUIT_BREAKER_HALF_OPEN_CALLS` setting (1)
+        """
+
+        self.failure_threshold = default(failure_threshold, project_settings.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', 5))
+        self.recovery_timeout = default(recovery_timeout, project_settings.get('CIRCUIT_BREAKER_RECOVERY_TIMEOUT', 30))
+        self.half_open_calls = default(half_open_calls, project_settings.get('CIRCUIT_BREAKER_HALF_OPEN_CALLS', 1))
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_calls = 0
+            logger.info("Circuit breaker is half-open, sending trial requests")
+
+        return self._state
+
+    def before_request(self) -> None:
+        """
+        Checks if request can be sent. Every successful call must be followed by `record_success`,
+        `record_failure` or `record_cancel` call
+
+        :raises:
+            :raise CircuitOpenError: If circuit is open
+        """
+
+        state = self.state
+
+        if state is CircuitState.CLOSED:
+            return
+
+        if state is CircuitState.HALF_OPEN and self._trial_calls < self.half_open_calls:
+            self._trial_calls += 1
+            return
+
+        self.rejected_count += 1
+        raise CircuitOpenError(retry_after=max(0.0, self._opened_at + self.recovery_timeout - time.monotonic()))
+
+    def record_success(self) -> None:
+        self._failures = 0
+
+        if self._state is CircuitState.HALF_OPEN:
+            self._state = CircuitState.CLOSED
+            logger.info("Circuit breaker is closed, Bot API server is available")
+
+    def record_failure(self) -> None:
+        self._failures += 1
+
+        if self._state is CircuitState.HALF_OPEN or (self._state is CircuitState.CLOSED and self._failures >= self.failure_threshold):
+            self._open()
+
+    def record_cancel(self) -> None:
+        if self._state is CircuitState.HALF_OPEN and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    @contextmanager
+    def call(self, count_timeouts: bool = True) -> Iterator[None]:
+        """
+        Context manager that checks circuit state before the request and records its outcome
+
+        :param count_timeouts: `bool`
+            (Optional) Whether timeout of the request is counted as failure. Should be False if timeout
+            was chosen by the caller (it doesn't tell that server is unavailable). Defaults to True
+
+        :raises:
+            :raise CircuitOpenError: If circuit is open
+        """
+
+        self.before_request()
+
+        try:
+            yield
+        except FAILURE_EXCEPTIONS as error:
+            if isinstance(error, asyncio.TimeoutError) and not count_timeouts:
+                self.record_cancel()
+            else:
+                self.record_failure()
+            raise
+        except DeadlineExceededError:
+            self.record_cancel()
+            raise
+        except Exception:
+            self.record_success()
+            raise
+        except BaseException:
+            self.record_cancel()
+            raise
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns circuit breaker metrics
+
+        :return: `dict`
+            Metrics
+        """
+
+        return {
+            'state': self.state.value,
+            'consecutive_failures': self._failures,
+            'opened': self.opened_count,
+            'rejected': self.rejected_count
+        }
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self.opened_count += 1
+
+        logger.warning(
+            f"Circuit breaker is open after {self._failures} consecutive failures, "
+            f"requests are rejected for {self.recovery_timeout} seconds"
+        )
+
+
+class AIMDLimit:
+    """
+    Adaptive concurrency limit (additive increase, multiplicative decrease).
+
+    Limit grows by 1 after every `limit` successful requests and is multiplied by `decrease_factor`
+    after overload (see `OVERLOAD_EXCEPTIONS`). Limit is decreased at most once per `cooldown` seconds,
+    so a burst of failures of concurrent requests is counted once.
+    """
+
+    def __init__(self,
+                 max_limit: int,
+                 min_limit: int = None,
+                 decrease_factor: float = None,
+                 cooldown: float = 1.0
+                 ) -> None:
+        """
+        Initialize the AIMDLimit instance.
+
+        :param max_limit: `int`
+            Maximum (and initial) limit
+
+        :param min_limit: `int`
+            (Optional) Minimum limit. Defaults to `ADAPTIVE_CONCURRENCY_MIN` setting (4)
+
+        :param decrease_factor: `float`
+            (Optional) Limit multiplier on overload. Defaults to `ADAPTIVE_CONCURRENCY_DECREASE` setting (0.5)
+
+        :param cooldown: `float`
+            (Optional) Minimum interval in seconds between decreases
+        """
+
+        self.max_limit = max_limit
+        self.min_limit = min(max_limit, max(1, default(min_limit, project_settings.get('ADAPTIVE_CONCURRENCY_MIN', 4))))
+        self.decrease_factor = default(decrease_factor, project_settings.get('ADAPTIVE_CONCURRENCY_DECREASE', 0.5))
+        self.cooldown = cooldown
+
+        self._limit = float(max_limit)
+        self._decreased_at = 0.0
+
+        self.decrease_count = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self) -> None:
+        self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+
+        if now - self._decreased_at < self.cooldown:
+            return
+
+        self._decreased_at = now
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self.decrease_count += 1
+
+        logger.debug("Requests concurrency limit decreased to %s", self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns limiter metrics
+
+        :return: `dict`
+            Metrics
+        """
+
+        return {
+            'limit': self.limit,
+            'max_limit': self.max_limit,
+            'decreased': self.decrease_count
+        }
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """
+    Returns circuit breaker configured with `CIRCUIT_BREAKER` setting (default circuit breaker if setting is not defined)
+
+    :return: `Optional[CircuitBreaker]`
+        Circuit breaker or None if it is disabled
+    """
+
+    global _default_circuit_breaker
+
+    breaker = project_settings.get('CIRCUIT_BREAKER', _DEFAULT)
+
+    if breaker is _DEFAULT:
+        if _default_circuit_breaker is None:
+            _default_circuit_breaker = CircuitBreaker()
+
+        return _default_circuit_breaker
+
+    if breaker is not None and not isinstance(breaker, CircuitBreaker):
+        raise TypeError("CIRCUIT_BREAKER setting must be instance of CircuitBreaker")
+
+    return breaker
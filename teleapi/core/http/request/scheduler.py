@@ -0,0 +1,281 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional
+
+from teleapi.core.http.exceptions import DeadlineExceededError
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.request.resilience import AIMDLimit, OVERLOAD_EXCEPTIONS
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.rate_limit import RateLimiter
+from teleapi.core.utils.syntax import default
+
+
+class RequestPriority(Enum):
+    INTERACTIVE = "interactive"  # User-facing requests (replies, callback query answers)
+    NORMAL = "normal"
+    BULK = "bulk"  # Background jobs (broadcasts, mass moderation)
+
+
+# Long polling requests hold connection for a long time and must not take scheduler slots
+UNSCHEDULED_METHODS = frozenset({APIMethod.GET_UPDATES})
+
+_DEFAULT = object()
+_default_scheduler: Optional['RequestScheduler'] = None
+
+_current_priority: ContextVar[RequestPriority] = ContextVar("request_priority", default=RequestPriority.NORMAL)
+
+
+def get_request_priority() -> RequestPriority:
+    """
+    Returns priority of requests made in the current context
+
+    :return: `RequestPriority`
+        Request priority (`RequestPriority.NORMAL` by default)
+    """
+
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """
+    Sets priority of all requests made inside the block (if priority is not passed to `method_request` explicitly)
+
+    :param priority: `RequestPriority`
+        Request priority
+    """
+
+    token = _current_priority.set(priority)
+
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RequestScheduler:
+    """
+    Shares outbound requests rate and concurrency limits between request priority classes.
+
+    Waiting requests are granted with weighted fair queueing (stride scheduling): while several classes have waiting
+    requests, each class gets share of the capacity proportional to its weight. Class that has no waiting requests
+    doesn't accumulate credit, so background jobs use all capacity left by interactive requests.
+
+    If adaptive concurrency is enabled, allowed amount of requests in flight is controlled by `AIMDLimit`:
+    it shrinks after 429 and server errors and grows back after successful requests.
+    """
+
+    DEFAULT_WEIGHTS: Dict[RequestPriority, float] = {
+        RequestPriority.INTERACTIVE: 16,
+        RequestPriority.NORMAL: 4,
+        RequestPriority.BULK: 1
+    }
+
+    def __init__(self,
+                 rate: float = None,
+                 concurrency: int = None,
+                 weights: Dict[RequestPriority, float] = None,
+                 adaptive: bool = None
+                 ) -> None:
+        """
+        Initialize the RequestScheduler instance.
+
+        :param rate: `float`
+            (Optional) Maximum amount of requests per second. Defaults to `REQUEST_RATE` setting (not limited)
+
+        :param concurrency: `int`
+            (Optional) Maximum amount of requests in flight. Defaults to `REQUEST_CONCURRENCY` setting (64)
+
+        :param weights: `Dict[RequestPriority, float]`
+            (Optional) Weights of priority classes. Defaults to `DEFAULT_WEIGHTS`
+
+        :param adaptive: `bool`
+            (Optional) Whether to adapt concurrency limit to the server load. Defaults to `ADAPTIVE_CONCURRENCY` setting (True)
+        """
+
+        self.rate = default(rate, project_settings.get('REQUEST_RATE', None))
+        self.concurrency = max(1, default(concurrency, project_settings.get('REQUEST_CONCURRENCY', 64)))
+        self.weights = {**self.__class__.DEFAULT_WEIGHTS, **default(weights, {})}
+
+        self.adaptive_limit = AIMDLimit(self.concurrency) if default(
+            adaptive, project_settings.get('ADAPTIVE_CONCURRENCY', True)
+        ) else None
+
+        self._limiter = RateLimiter(self.rate, burst=self.concurrency) if self.rate is not None else None
+        self._queues: Dict[RequestPriority, Deque[asyncio.Future]] = {priority: deque() for priority in RequestPriority}
+        self._passes: Dict[RequestPriority, float] = {priority: 0.0 for priority in RequestPriority}
+        self._virtual_time = 0.0
+        self._in_flight = 0
+
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._slot_waiter: Optional[asyncio.Future] = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def limit(self) -> int:
+        return min(self.concurrency, self.adaptive_limit.limit) if self.adaptive_limit is not None else self.concurrency
+
+    def queued(self, priority: RequestPriority = None) -> int:
+        """
+        Returns amount of waiting requests
+
+        :param priority: `RequestPriority`
+            (Optional) Priority class. If None, returns amount of waiting requests of all classes
+
+        :return: `int`
+            Amount of waiting requests
+        """
+
+        if priority is not None:
+            return len(self._queues[priority])
+
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.NORMAL) -> None:
+        """
+        Waits until request of specified priority can be sent.
+        Every successful `acquire` call must be followed by `release` call
+
+        :param priority: `RequestPriority`
+            Request priority
+        """
+
+        if self._in_flight < self.limit and not self.queued() and (self._limiter is None or self._limiter.try_acquire()):
+            self._in_flight += 1
+            return
+
+        queue = self._queues[priority]
+
+        if not queue:
+            # Class that was idle must not get credit for the time it had no requests
+            self._passes[priority] = max(self._passes[priority], self._virtual_time)
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """
+        Releases slot taken by `acquire`
+        """
+
+        self._in_flight -= 1
+
+        if self._slot_waiter is not None and not self._slot_waiter.done():
+            self._slot_waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority = RequestPriority.NORMAL, count_timeouts: bool = True) -> AsyncIterator[None]:
+        """
+        Context manager that holds scheduler slot while request is in flight and reports its outcome to adaptive limit
+
+        :param priority: `RequestPriority`
+            Request priority
+
+        :param count_timeouts: `bool`
+            (Optional) Whether timeout of the request is counted as overload. Should be False if timeout
+            was chosen by the caller. Defaults to True
+        """
+
+        await self.acquire(priority)
+
+        try:
+            yield
+        except OVERLOAD_EXCEPTIONS as error:
+            if self.adaptive_limit is not None and (count_timeouts or not isinstance(error, asyncio.TimeoutError)):
+                self.adaptive_limit.on_overload()
+            raise
+        except DeadlineExceededError:
+            raise
+        except Exception:
+            if self.adaptive_limit is not None:
+                self.adaptive_limit.on_success()
+            raise
+        else:
+            if self.adaptive_limit is not None:
+                self.adaptive_limit.on_success()
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns scheduler metrics
+
+        :return: `dict`
+            Metrics
+        """
+
+        return {
+            'in_flight': self._in_flight,
+            'limit': self.limit,
+            **{f'queued_{priority.value}': len(queue) for priority, queue in self._queues.items()}
+        }
+
+    def _next_priority(self) -> Optional[RequestPriority]:
+        selected = None
+
+        for priority, queue in self._queues.items():
+            while queue and queue[0].done():  # Drop cancelled waiters
+                queue.popleft()
+
+            if queue and (selected is None or self._passes[priority] < self._passes[selected]):
+                selected = priority
+
+        return selected
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while (priority := self._next_priority()) is not None:
+            if self._in_flight >= self.limit:
+                self._slot_waiter = loop.create_future()
+                await self._slot_waiter
+                continue
+
+            if self._limiter is not None and not self._limiter.try_acquire():
+                await asyncio.sleep(self._limiter.delay())
+                continue
+
+            self._virtual_time = self._passes[priority]
+            self._passes[priority] += 1 / self.weights[priority]
+            self._in_flight += 1
+            self._queues[priority].popleft().set_result(None)
+
+
+def get_request_scheduler() -> Optional[RequestScheduler]:
+    """
+    Returns scheduler configured with `REQUEST_SCHEDULER` setting (default scheduler if setting is not defined)
+
+    :return: `Optional[RequestScheduler]`
+        Request scheduler or None if requests scheduling is disabled
+    """
+
+    global _default_scheduler
+
+    scheduler = project_settings.get('REQUEST_SCHEDULER', _DEFAULT)
+
+    if scheduler is _DEFAULT:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+
+        return _default_scheduler
+
+    if scheduler is not None and not isinstance(scheduler, RequestScheduler):
+        raise TypeError("REQUEST_SCHEDULER setting must be instance of RequestScheduler")
+
+    return scheduler
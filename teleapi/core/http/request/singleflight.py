@@ -0,0 +1,105 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.utils.json_codec import get_json_codec
+
+_T = TypeVar("_T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call with some key is in flight,
+    all other calls with the same key wait for it and get its result instead of making their own call.
+
+    Notes:
+     - Shared call is not cancelled if one of the waiting callers is cancelled
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the SingleFlight instance.
+        """
+
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> _T:
+        """
+        Calls `func` or joins already running call with the same key
+
+        :param key: `Hashable`
+            Call identifier. Calls with equal keys are considered identical
+
+        :param func: `Callable[[], Awaitable[_T]]`
+            Function that makes the call
+
+        :return: `_T`
+            Result of the (shared) call
+        """
+
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        if not task.cancelled():
+            task.exception()  # Mark exception as retrieved if all callers were cancelled
+
+
+def is_coalescable(http_method: str, method: APIMethod) -> bool:
+    """
+    Checks if calls of the API method can be coalesced (method is an idempotent getter)
+
+    :param http_method: `str`
+        The HTTP method of the request
+
+    :param method: `APIMethod`
+        The API method
+
+    :return: `bool`
+        True if identical in-flight calls of the method can share one request
+    """
+
+    return http_method.upper() == "GET" and method.is_getter
+
+
+def make_request_key(token: str, http_method: str, method: APIMethod, request_kwargs: Dict[str, Any]) -> Optional[Hashable]:
+    """
+    Makes the key identifying API request
+
+    :param token: `str`
+        The bot token
+
+    :param http_method: `str`
+        The HTTP method of the request
+
+    :param method: `APIMethod`
+        The API method
+
+    :param request_kwargs: `dict`
+        Keyword arguments of the request
+
+    :return: `Optional[Hashable]`
+        Request key or None if request arguments can't be compared (e.g. request contains `FormData`)
+    """
+
+    try:
+        arguments = get_json_codec().dumps(request_kwargs, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+    return token, http_method.upper(), method, arguments
+
+
+request_coalescer = SingleFlight()
@@ -0,0 +1,142 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from teleapi.core.http.exceptions import DeadlineExceededError
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.state.settings import project_settings
+
+DEFAULT_TIMEOUT: float = 30
+
+# Time in seconds added to `timeout` parameter of `getUpdates` request
+LONG_POLLING_TIMEOUT_MARGIN: float = 10
+
+# Default total timeouts (in seconds) of API methods, other methods use `DEFAULT_TIMEOUT`
+METHOD_TIMEOUTS: Dict[APIMethod, float] = {
+    APIMethod.ANSWER_CALLBACK_QUERY: 10,
+    APIMethod.SEND_CHAT_ACTION: 10,
+    APIMethod.SEND_PHOTO: 120,
+    APIMethod.SEND_AUDIO: 300,
+    APIMethod.SEND_DOCUMENT: 300,
+    APIMethod.SEND_VIDEO: 300,
+    APIMethod.SEND_ANIMATION: 300,
+    APIMethod.SEND_VOICE: 120,
+    APIMethod.SEND_VIDEO_NOTE: 120,
+    APIMethod.SEND_MEDIA_GROUP: 300,
+    APIMethod.SEND_STICKER: 60,
+    APIMethod.EDIT_MESSAGE_MEDIA: 300,
+    APIMethod.SET_CHAT_PHOTO: 60,
+    APIMethod.UPLOAD_STICKER_FILE: 120,
+    APIMethod.CREATE_STICKER_SET: 120,
+    APIMethod.ADD_STICKER_TO_SET: 120,
+    APIMethod.SET_STICKER_SET_THUMBNAIL: 60
+}
+
+# Default total timeout (in seconds) of file downloads
+FILE_TIMEOUT: float = 300
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def get_method_timeout(method: APIMethod, request_kwargs: Dict[str, Any] = None) -> float:
+    """
+    Returns default timeout of the API method.
+    Defaults can be overridden with `REQUEST_TIMEOUTS` (`Dict[APIMethod, float]`) and `REQUEST_TIMEOUT` settings
+
+    :param method: `APIMethod`
+        The API method
+
+    :param request_kwargs: `dict`
+        (Optional) Keyword arguments of the request (used to get long polling timeout of `getUpdates` request)
+
+    :return: `float`
+        Timeout in seconds
+    """
+
+    timeouts = project_settings.get('REQUEST_TIMEOUTS', {})
+
+    if method in timeouts:
+        return timeouts[method]
+
+    if method is APIMethod.GET_UPDATES:
+        params = (request_kwargs or {}).get('params') or {}
+        return params.get('timeout', 0) + LONG_POLLING_TIMEOUT_MARGIN
+
+    return METHOD_TIMEOUTS.get(method, project_settings.get('REQUEST_TIMEOUT', DEFAULT_TIMEOUT))
+
+
+def get_deadline() -> Optional[float]:
+    """
+    Returns deadline of the current context
+
+    :return: `Optional[float]`
+        Deadline (`time.monotonic()` value) or None if there is no deadline
+    """
+
+    return _deadline.get()
+
+
+def get_remaining_time() -> Optional[float]:
+    """
+    Returns time left until deadline of the current context
+
+    :return: `Optional[float]`
+        Time in seconds (can be negative) or None if there is no deadline
+    """
+
+    deadline = _deadline.get()
+    return deadline - time.monotonic() if deadline is not None else None
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Sets time budget for all requests made inside the block. Requests made after deadline fail with `DeadlineExceededError`,
+    requests in flight are timed out at deadline. Nested deadlines can only shorten outer ones
+
+    :param seconds: `Optional[float]`
+        Time budget in seconds. If None, block has no own deadline
+    """
+
+    if seconds is None:
+        yield
+        return
+
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(min(deadline, outer) if outer is not None else deadline)
+
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_request_timeout(default_timeout: float, timeout: float = None) -> float:
+    """
+    Returns timeout of the request, limited by deadline of the current context
+
+    :param default_timeout: `float`
+        Default timeout of the request
+
+    :param timeout: `float`
+        (Optional) Timeout specified for the call
+
+    :return: `float`
+        Timeout in seconds
+
+    :raises:
+        :raise DeadlineExceededError: If deadline of the current context has passed
+    """
+
+    timeout = timeout if timeout is not None else default_timeout
+    remaining = get_remaining_time()
+
+    if remaining is None:
+        return timeout
+
+    if remaining <= 0:
+        raise DeadlineExceededError()
+
+    return min(timeout, remaining)
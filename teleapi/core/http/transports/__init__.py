@@ -0,0 +1,3 @@
+from .base import BaseTransport, TransportResponse, get_http_transport
+from .aiohttp_transport import AiohttpTransport
+from .memory import MemoryTransport, MemoryCall, FakeApiError
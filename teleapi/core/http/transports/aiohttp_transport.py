@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from teleapi.core.utils.syntax import default
+from .base import BaseTransport
+
+
+class AiohttpTransport(BaseTransport):
+    """
+    Transport that sends requests with `aiohttp`.
+    Session (and its connection pool) is shared between requests made in the same event loop
+    """
+
+    def __init__(self, session_kwargs: Dict[str, Any] = None, reuse_session: bool = True) -> None:
+        """
+        Initialize the AiohttpTransport instance.
+
+        :param session_kwargs: `dict`
+            (Optional) Keyword arguments passed to `aiohttp.ClientSession` constructor
+
+        :param reuse_session: `bool`
+            (Optional) Whether to share session between requests. If False, new session is made for every request
+        """
+
+        self.session_kwargs = default(session_kwargs, {})
+        self.reuse_session = reuse_session
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns session of the current event loop (makes new one if needed)
+
+        :return: `aiohttp.ClientSession`
+            Client session
+        """
+
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(**self.session_kwargs)
+            self._session_loop = loop
+
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> Tuple[aiohttp.ClientResponse, bytes]:
+        if not self.reuse_session:
+            async with aiohttp.ClientSession(**self.session_kwargs) as session:
+                async with session.request(method, url, **kwargs) as response:
+                    return response, await response.read()
+
+        session = await self.get_session()
+
+        async with session.request(method, url, **kwargs) as response:
+            return response, await response.read()
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed and self._session_loop is asyncio.get_running_loop():
+            await self._session.close()
+
+        self._session = None
+        self._session_loop = None
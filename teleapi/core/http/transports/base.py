@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from typing import Any, Mapping, Optional, Tuple
+
+from teleapi.core.state.settings import project_settings
+
+
+class TransportResponse:
+    """
+    Minimal HTTP response returned by transports that don't use aiohttp.
+    Has the same attributes as `aiohttp.ClientResponse` that teleapi uses
+    """
+
+    __slots__ = ('method', 'url', 'status', 'headers')
+
+    def __init__(self, method: str, url: str, status: int, headers: Mapping[str, str] = None) -> None:
+        """
+        Initialize the TransportResponse instance.
+
+        :param method: `str`
+            The HTTP method of the request
+
+        :param url: `str`
+            The URL of the request
+
+        :param status: `int`
+            HTTP status code
+
+        :param headers: `Mapping[str, str]`
+            (Optional) Response headers
+        """
+
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = headers if headers is not None else {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} [{self.status}] {self.method} {self.url}>"
+
+
+class BaseTransport(ABC):
+    """
+    Abstract base class for HTTP transports used by `AsyncMethodApiRequest` and `AsyncFileApiRequest`
+    (see `HTTP_TRANSPORT` setting)
+    """
+
+    @abstractmethod
+    async def request(self, method: str, url: str, **kwargs) -> Tuple[Any, bytes]:
+        """
+        Sends HTTP request
+
+        :param method: `str`
+            The HTTP method
+
+        :param url: `str`
+            The URL
+
+        :param kwargs: `dict`
+            Request parameters (`data`, `params`, `headers`, `timeout`) in `aiohttp.ClientSession.request` format
+
+        :return: `Tuple[Any, bytes]`
+            Response (object with `status` and `headers` attributes) and response body
+
+        :raises:
+            :raise aiohttp.ClientError: If there's an issue with the HTTP request itself.
+        """
+        ...
+
+    async def close(self) -> None:
+        """
+        Releases transport resources (connections)
+        """
+        ...
+
+
+_DEFAULT = object()
+_default_transport: Optional[BaseTransport] = None
+
+
+def get_http_transport() -> BaseTransport:
+    """
+    Returns transport configured with `HTTP_TRANSPORT` setting (`AiohttpTransport` if setting is not defined)
+
+    :return: `BaseTransport`
+        HTTP transport
+    """
+
+    global _default_transport
+
+    transport = project_settings.get('HTTP_TRANSPORT', _DEFAULT)
+
+    if transport is _DEFAULT:
+        if _default_transport is None:
+            from .aiohttp_transport import AiohttpTransport
+            _default_transport = AiohttpTransport()
+
+        return _default_transport
+
+    if not isinstance(transport, BaseTransport):
+        raise TypeError("HTTP_TRANSPORT setting must be instance of BaseTransport")
+
+    return transport
@@ -0,0 +1,243 @@
+import asyncio
+import email.policy
+import inspect
+from email.parser import BytesParser
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import aiohttp
+
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.utils.json_codec import get_json_codec
+from .base import BaseTransport, TransportResponse
+
+MethodHandler = Callable[[Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+
+def decode_form_field(value: str) -> Any:
+    """
+    Decodes form field value as JSON (most of fields are JSON-encoded by teleapi), returns value as is if it is not JSON
+
+    :param value: `str`
+        Field value
+
+    :return: `Any`
+        Decoded value
+    """
+
+    try:
+        return get_json_codec().loads(value)
+    except ValueError:
+        return value
+
+
+class FakeApiError(Exception):
+    """
+    Raised by `MemoryTransport` handlers to make the Bot API error response
+    """
+
+    def __init__(self, error_code: int, description: str, parameters: Dict[str, Any] = None) -> None:
+        super().__init__(description)
+
+        self.error_code = error_code
+        self.description = description
+        self.parameters = parameters
+
+
+class MemoryCall:
+    """
+    API call recorded by `MemoryTransport`
+    """
+
+    __slots__ = ('method', 'params', 'token')
+
+    def __init__(self, method: APIMethod, params: Dict[str, Any], token: str) -> None:
+        self.method = method
+        self.params = params
+        self.token = token
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.method.value} {self.params}>"
+
+
+class _BufferWriter:
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    async def write(self, data: bytes) -> None:
+        self.buffer.extend(data)
+
+
+class MemoryTransport(BaseTransport):
+    """
+    In-process transport that routes API methods to Python callables instead of sending HTTP requests.
+    Allows to run a bot without network (tests, benchmarks, profiling).
+
+    Handler gets request parameters dict and returns `result` of the response (must be JSON-serializable).
+    To return error response, handler raises `FakeApiError`. Methods without handler get `404 Not Found` response.
+
+    Notes:
+     - Form fields are decoded as JSON if possible (as most of them are JSON-encoded by teleapi),
+       so numeric text fields become numbers. Uploaded files are passed as bytes
+    """
+
+    def __init__(self,
+                 handlers: Dict[APIMethod, MethodHandler] = None,
+                 files: Dict[str, bytes] = None,
+                 record: bool = False,
+                 latency: float = 0
+                 ) -> None:
+        """
+        Initialize the MemoryTransport instance.
+
+        :param handlers: `Dict[APIMethod, MethodHandler]`
+            (Optional) Handlers of API methods
+
+        :param files: `Dict[str, bytes]`
+            (Optional) Contents of files available for download (file path -> content)
+
+        :param record: `bool`
+            (Optional) Whether to record calls to `calls` list
+
+        :param latency: `float`
+            (Optional) Simulated latency of every request in seconds
+        """
+
+        self.handlers: Dict[APIMethod, MethodHandler] = dict(handlers or {})
+        self.files: Dict[str, bytes] = dict(files or {})
+        self.record = record
+        self.latency = latency
+
+        self.calls: List[MemoryCall] = []
+
+    def route(self, method: APIMethod) -> Callable[[MethodHandler], MethodHandler]:
+        """
+        Decorator that registers handler of API method
+
+        :param method: `APIMethod`
+            The API method
+        """
+
+        def decorator(handler: MethodHandler) -> MethodHandler:
+            self.handlers[method] = handler
+            return handler
+
+        return decorator
+
+    def get_calls(self, method: APIMethod = None) -> List[MemoryCall]:
+        """
+        Returns recorded calls
+
+        :param method: `APIMethod`
+            (Optional) If specified, returns only calls of this method
+
+        :return: `List[MemoryCall]`
+            Recorded calls
+        """
+
+        return [call for call in self.calls if method is None or call.method is method]
+
+    async def request(self, method: str, url: str, **kwargs) -> Tuple[TransportResponse, bytes]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = unquote(urlsplit(url).path)
+        parts = path.lstrip('/').split('/', 2)
+
+        if len(parts) == 3 and parts[0] == 'file' and parts[1].startswith('bot'):
+            return self._file_response(method, url, parts[2])
+
+        if len(parts) != 2 or not parts[0].startswith('bot'):
+            return self._error_response(method, url, FakeApiError(404, "Not Found"))
+
+        try:
+            api_method = APIMethod(parts[1])
+        except ValueError:
+            return self._error_response(method, url, FakeApiError(404, "Not Found"))
+
+        handler = self.handlers.get(api_method)
+
+        if handler is None:
+            return self._error_response(method, url, FakeApiError(404, "Not Found"))
+
+        params = await self.read_params(kwargs)
+
+        if self.record:
+            self.calls.append(MemoryCall(api_method, params, parts[0][3:]))
+
+        try:
+            result = handler(params)
+
+            if inspect.isawaitable(result):
+                result = await result
+        except FakeApiError as error:
+            return self._error_response(method, url, error)
+
+        return TransportResponse(method, url, 200), get_json_codec().dumps({"ok": True, "result": result})
+
+    async def read_params(self, request_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decodes parameters of the request from query parameters and body (JSON, urlencoded or multipart form)
+
+        :param request_kwargs: `dict`
+            Request parameters in `aiohttp.ClientSession.request` format
+
+        :return: `Dict[str, Any]`
+            Request parameters
+        """
+
+        params = dict(request_kwargs.get('params') or {})
+        data = request_kwargs.get('data')
+
+        if isinstance(data, aiohttp.FormData):
+            data = data()
+
+        if data is None:
+            return params
+
+        if isinstance(data, dict):
+            params.update(data)
+        elif isinstance(data, (bytes, bytearray, str)):
+            params.update(get_json_codec().loads(data))
+        elif isinstance(data, aiohttp.Payload):
+            writer = _BufferWriter()
+            await data.write(writer)
+            params.update(self._parse_form(data.content_type or '', bytes(writer.buffer)))
+
+        return params
+
+    def _parse_form(self, content_type: str, body: bytes) -> Dict[str, Any]:
+        if content_type.startswith('application/x-www-form-urlencoded'):
+            return {name: decode_form_field(value) for name, value in parse_qsl(body.decode(), keep_blank_values=True)}
+
+        if content_type.startswith('multipart/'):
+            message = BytesParser(policy=email.policy.HTTP).parsebytes(
+                b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+            )
+            fields = {}
+
+            for part in message.iter_parts():
+                name = part.get_param('name', header='content-disposition')
+                value = part.get_payload(decode=True)
+                fields[name] = value if part.get_filename() else decode_form_field(value.decode())
+
+            return fields
+
+        return {}
+
+    def _file_response(self, method: str, url: str, file_path: str) -> Tuple[TransportResponse, bytes]:
+        content: Optional[bytes] = self.files.get(file_path)
+
+        if content is None:
+            return self._error_response(method, url, FakeApiError(404, "Not Found: file not found"))
+
+        return TransportResponse(method, url, 200), content
+
+    @staticmethod
+    def _error_response(method: str, url: str, error: FakeApiError) -> Tuple[TransportResponse, bytes]:
+        data = {"ok": False, "error_code": error.error_code, "description": error.description}
+
+        if error.parameters is not None:
+            data["parameters"] = error.parameters
+
+        return TransportResponse(method, url, error.error_code), get_json_codec().dumps(data)
@@ -1,2 +1,5 @@
 from .loggers import *
 from .readers import *
+from .handlers import *
+from .filters import *
+from .formats import *
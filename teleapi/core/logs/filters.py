@@ -0,0 +1,141 @@
+import logging
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+from teleapi.core.bots.context import get_current_update, get_update_chat_id
+
+
+class CorrelationFilter(logging.Filter):
+    """
+    Adds `update_id` and `chat_id` of the update processed in the current context to records.
+    Must be attached to handler that is called in the thread of the event loop (e.g. `BackgroundLogHandler`)
+    """
+
+    def filter(self, record):
+        if not hasattr(record, 'update_id'):
+            update = get_current_update()
+
+            record.update_id = update.id if update is not None else None
+            record.chat_id = get_update_chat_id(update) if update is not None else None
+
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes only part of records of low levels. Rate is set per logger (the closest configured parent logger is used).
+    The decision is saved in the record, so handlers sharing the filter pass (or drop) the same records
+    """
+
+    def __init__(self, rates: Dict[str, float], default_rate: float = 1.0, max_level: int = logging.INFO) -> None:
+        """
+        Initialize the SamplingFilter instance.
+
+        :param rates: `Dict[str, float]`
+            Part of records (from 0 to 1) that are passed by logger name (e.g. {'teleapi.core.http': 0.1})
+        :param default_rate: `float`
+            (Optional) Rate of loggers that are not in `rates`
+        :param max_level: `int`
+            (Optional) Records of higher levels are always passed
+        """
+
+        super().__init__()
+
+        self.rates = rates
+        self.default_rate = default_rate
+        self.max_level = max_level
+
+        self._logger_rates: Dict[str, float] = {}
+        self._decision_attr = f"_sampled_{id(self)}"
+
+    def get_rate(self, name: str) -> float:
+        rate = self._logger_rates.get(name)
+
+        if rate is None:
+            parent = name
+
+            while parent not in self.rates and '.' in parent:
+                parent = parent.rsplit('.', 1)[0]
+
+            rate = self._logger_rates[name] = self.rates.get(parent, self.default_rate)
+
+        return rate
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+
+        decision = getattr(record, self._decision_attr, None)
+
+        if decision is None:
+            rate = self.get_rate(record.name)
+            decision = rate >= 1 or random.random() < rate
+            setattr(record, self._decision_attr, decision)
+
+        return decision
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Passes at most `limit` identical records (same logger, level and message template) per `period` seconds.
+    The first passed record after suppression gets `suppressed` attribute (amount of suppressed records)
+    that is rendered by formatters. The decision is saved in the record, so handlers sharing the filter
+    count every record once and pass (or drop) the same records
+    """
+
+    def __init__(self, limit: int = 10, period: float = 1.0, max_keys: int = 10000) -> None:
+        """
+        Initialize the RateLimitFilter instance.
+
+        :param limit: `int`
+            (Optional) Max amount of identical records in a period
+        :param period: `float`
+            (Optional) Period in seconds
+        :param max_keys: `int`
+            (Optional) Max amount of tracked messages (tracking is reset when exceeded)
+        """
+
+        super().__init__()
+
+        self.limit = limit
+        self.period = period
+        self.max_keys = max_keys
+
+        # (logger name, level, message template) -> [period start, passed records, suppressed records]
+        self._windows: Dict[Tuple[str, int, str], list] = {}
+        self._decision_attr = f"_rate_limited_{id(self)}"
+
+    def filter(self, record):
+        decision = getattr(record, self._decision_attr, None)
+
+        if decision is None:
+            decision = self._check(record)
+            setattr(record, self._decision_attr, decision)
+
+        return decision
+
+    def _check(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        window: Optional[list] = self._windows.get(key)
+
+        if window is None:
+            if len(self._windows) >= self.max_keys:
+                self._windows.clear()
+
+            window = self._windows[key] = [now, 0, 0]
+        elif now - window[0] >= self.period:
+            window[0], window[1] = now, 0
+
+        if window[1] >= self.limit:
+            window[2] += 1
+            return False
+
+        window[1] += 1
+
+        if window[2]:
+            record.suppressed = window[2]
+            window[2] = 0
+
+        return True
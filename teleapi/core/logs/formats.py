@@ -1,13 +1,24 @@
 import logging
+from datetime import datetime, timezone
+
+from teleapi.core.utils.json_codec import get_json_codec
+
+# Attributes of every LogRecord; other attributes are passed with `extra` and are added to JSON logs
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', logging.INFO, '', 0, '', None, None))) | {'message', 'asctime'}
 
 
 class LogFormatter(logging.Formatter):
     format_ = """[%(asctime)s]\npath = %(pathname)s\nlevel = %(levelname)s\nlogger = %(name)s\nplace = %(filename)s; in '%(funcName)s'; line %(lineno)d\nmessage = %(message)s\n"""
 
-    def format(self, record):
-        log_fmt = self.format_
-        formatter = logging.Formatter(fmt=log_fmt, datefmt='%Y-%m-%d %H:%M:%S')
-        return formatter.format(record)
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **{'fmt': self.format_, 'datefmt': '%Y-%m-%d %H:%M:%S', **kwargs})
+
+    def formatMessage(self, record):
+        # `message` is set from `msg` on every format, so the note is not accumulated by several handlers
+        if getattr(record, 'suppressed', None):
+            record.message = f"{record.message} ({record.suppressed} similar messages suppressed)"
+
+        return super().formatMessage(record)
 
 
 class LogFormatterColor(LogFormatter):
@@ -26,11 +37,14 @@ class LogFormatterColor(LogFormatter):
             logging.ERROR: self.red + self.format_ + self.reset,
             logging.CRITICAL: self.bold_red + self.format_ + self.reset
         }
+        # Formatters are created once, not for every record
+        self._formatters = {
+            level: LogFormatter(fmt=log_fmt, datefmt=self.datefmt) for level, log_fmt in self.FORMATS.items()
+        }
 
     def format(self, record):
-        log_fmt = self.FORMATS[record.levelno]
-        formatter = logging.Formatter(fmt=log_fmt, datefmt='%Y-%m-%d %H:%M:%S')
-        return formatter.format(record)
+        formatter = self._formatters.get(record.levelno)
+        return formatter.format(record) if formatter is not None else super().format(record)
 
 
 class ConsoleLogFormatter(LogFormatterColor):
@@ -39,3 +53,36 @@ class ConsoleLogFormatter(LogFormatterColor):
 
 class FileLogFormatter(LogFormatter):
     format_ = "%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s; in '%(funcName)s':%(lineno)d)"
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Formats records as one-line JSON objects: time (ISO 8601, UTC), level, logger, message, place,
+    correlation ids (`update_id` and `chat_id`, see `CorrelationFilter`), amount of suppressed similar records
+    (`suppressed`, see `RateLimitFilter`), exception and `extra` attributes
+    """
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'func': record.funcName,
+            'line': record.lineno
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_') and value is not None:
+                data[key] = value if isinstance(value, (str, int, float, bool)) else str(value)
+
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exception'] = record.exc_text
+
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+
+        return get_json_codec().dumps_str(data)
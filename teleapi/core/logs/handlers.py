@@ -0,0 +1,61 @@
+import atexit
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable
+
+
+class BackgroundLogHandler(QueueHandler):
+    """
+    Handler that puts records to a queue and passes them to `handlers` in a background thread,
+    so formatting and I/O (file and console writes) does not block the event loop.
+    Only the message of the record is rendered in the calling thread (arguments of the record may be changed later).
+
+    Notes:
+     - The background thread is started on creation and stopped (after all queued records are handled) at exit
+    """
+
+    def __init__(self, handlers: Iterable[logging.Handler], respect_handler_level: bool = True) -> None:
+        """
+        Initialize the BackgroundLogHandler instance.
+
+        :param handlers: `Iterable[logging.Handler]`
+            Handlers records are passed to
+        :param respect_handler_level: `bool`
+            (Optional) Pass records only to handlers which level is not higher than level of the record
+        """
+
+        super().__init__(queue.SimpleQueue())
+
+        self.handlers = list(handlers)
+        self.listener = QueueListener(self.queue, *self.handlers, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        self._is_running = True
+
+        atexit.register(self.stop)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike QueueHandler.prepare, doesn't format the record: records are not pickled, so formatting
+        # (including traceback of exc_info) is done by handlers in the background thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        return record
+
+    def stop(self) -> None:
+        """
+        Handles queued records and stops the background thread
+        """
+
+        if self._is_running:
+            self._is_running = False
+            self.listener.stop()
+
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        self.stop()
+        super().close()
@@ -3,42 +3,113 @@ import logging
 import os
 import sys
 from functools import wraps
-from typing import Any
+from typing import Any, List
 
-from .formats import FileLogFormatter, ConsoleLogFormatter
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.syntax import default
+from .filters import CorrelationFilter, RateLimitFilter, SamplingFilter
+from .formats import FileLogFormatter, ConsoleLogFormatter, JsonLogFormatter
+from .handlers import BackgroundLogHandler
 from datetime import datetime
 
 file_log_formatter = FileLogFormatter()
 console_log_formatter = ConsoleLogFormatter()
+json_log_formatter = JsonLogFormatter()
+
+
+def setup_logger(name: str,
+                 logs_dir: str = None,
+                 console_log_level: int = None,
+                 background: bool = None,
+                 json_format: bool = None) -> logging.Logger:
+    """
+    Sets up logger with files (info.log and debug.log in `logs_dir`) and console handlers.
+    Level of the logger is the lowest level of the handlers (DEBUG if there are no handlers)
+
+    :param name: `str`
+        Name of the logger
+    :param logs_dir: `str`
+        (Optional) Directory of log files. If None, logs are not written to files
+    :param console_log_level: `int`
+        (Optional) Level of console logs. If None, logs are not written to console
+    :param background: `bool`
+        (Optional) Format and write logs in a background thread (see `BackgroundLogHandler`), so the event loop is not
+        blocked by disk and console writes. Defaults to `BACKGROUND_LOGGING` setting (True)
+    :param json_format: `bool`
+        (Optional) Write logs as one-line JSON objects (see `JsonLogFormatter`). Defaults to `JSON_LOGS` setting (False)
+
+    :return: `logging.Logger`
+        The logger
+
+    Notes:
+     - Records get `update_id` and `chat_id` of the update processed in the current context (see `CorrelationFilter`)
+     - Records of INFO and lower levels are sampled if `LOG_SAMPLING` setting (rates by logger name) is defined
+     - At most `LOG_RATE_LIMIT` setting identical records per second are written if the setting is defined
+    """
 
-
-def setup_logger(name: str, logs_dir: str = None, console_log_level: int = None) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
 
+    handlers = []
+    json_format = default(json_format, project_settings.get('JSON_LOGS', False))
+
     if logs_dir is not None:
         os.makedirs(logs_dir,  exist_ok=True)
 
         info_file_handler = logging.FileHandler(filename=os.path.join(logs_dir, 'info.log'), encoding='utf-8')
-        info_file_handler.setFormatter(file_log_formatter)
+        info_file_handler.setFormatter(json_log_formatter if json_format else file_log_formatter)
         info_file_handler.setLevel(logging.INFO)
 
         debug_file_handler = logging.FileHandler(filename=os.path.join(logs_dir, 'debug.log'), encoding='utf-8')
-        debug_file_handler.setFormatter(file_log_formatter)
+        debug_file_handler.setFormatter(json_log_formatter if json_format else file_log_formatter)
         debug_file_handler.setLevel(logging.DEBUG)
 
-        logger.addHandler(info_file_handler)
-        logger.addHandler(debug_file_handler)
+        handlers += [info_file_handler, debug_file_handler]
 
     if console_log_level is not None:
         console_handler = logging.StreamHandler(stream=sys.stdout)
-        console_handler.setFormatter(console_log_formatter)
+        console_handler.setFormatter(json_log_formatter if json_format else console_log_formatter)
         console_handler.setLevel(console_log_level)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    if handlers:
+        # Records are not created (and messages are not formatted) for levels that none of the handlers accepts
+        logger.setLevel(min(handler.level for handler in handlers))
+
+    if handlers and default(background, project_settings.get('BACKGROUND_LOGGING', True)):
+        handlers = [BackgroundLogHandler(handlers)]
+
+    # Filters are shared by handlers (records of child loggers are not filtered by filters of the logger),
+    # and are called in the thread of the event loop, before records are queued
+    log_filters = get_log_filters()
+
+    for handler in handlers:
+        for log_filter in log_filters:
+            handler.addFilter(log_filter)
+
+        logger.addHandler(handler)
 
     return logger
 
 
+def get_log_filters() -> List[logging.Filter]:
+    """
+    Returns new filters configured with `LOG_SAMPLING` and `LOG_RATE_LIMIT` settings and correlation filter
+    """
+
+    filters = []
+
+    if (rates := project_settings.get('LOG_SAMPLING', None)) is not None:
+        filters.append(SamplingFilter(rates))
+
+    if (limit := project_settings.get('LOG_RATE_LIMIT', None)) is not None:
+        filters.append(RateLimitFilter(limit))
+
+    filters.append(CorrelationFilter())
+
+    return filters
+
+
 def log_async_methods(logger_name: str = None, log_result: bool = False, log_level: int = logging.DEBUG):
     def decorator(cls):
         def get_wrapper(func):
@@ -71,10 +142,16 @@ def log_async_methods(logger_name: str = None, log_result: bool = False, log_lev
     return decorator
 
 
-def setup_teleapi_logger(logs_dir: str = None, create_files: bool = False, console_log_level: int = logging.INFO):
+def setup_teleapi_logger(logs_dir: str = None,
+                         create_files: bool = False,
+                         console_log_level: int = logging.INFO,
+                         background: bool = None,
+                         json_format: bool = None):
     logs_dir = os.path.join('logs', 'teleapi', datetime.now().strftime('%Y-%m-%d %H-%M-%S')) if logs_dir is None else logs_dir
     return setup_logger(
         name="teleapi",
         logs_dir=logs_dir if create_files else None,
-        console_log_level=console_log_level
+        console_log_level=console_log_level,
+        background=background,
+        json_format=json_format
     )
@@ -0,0 +1,4 @@
+from .registry import MetricsRegistry, Metric, Counter, Gauge, Histogram, DEFAULT_BUCKETS, get_metrics_registry
+from .instruments import TeleapiMetrics, get_metrics, observe_handler
+from .server import MetricsServer
+from .loop_monitor import LoopMonitor, get_loop_monitor
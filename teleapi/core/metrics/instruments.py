@@ -0,0 +1,184 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from weakref import WeakKeyDictionary
+
+from .registry import MetricsRegistry, get_metrics_registry
+
+# Buckets of getUpdates batch sizes (the API returns at most 100 updates)
+BATCH_SIZE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Buckets of event loop lag in seconds
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CIRCUIT_STATES = ('closed', 'open', 'half_open')
+
+
+class TeleapiMetrics:
+    """
+    Metrics of the framework internals: API requests, long polling, update processing, handlers, errors and event loop.
+    Scheduler, circuit breaker and handler pools state is read when metrics are collected
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """
+        Initialize the TeleapiMetrics instance.
+
+        :param registry: `MetricsRegistry`
+            Registry metrics are registered in
+        """
+
+        self.registry = registry
+
+        self.api_requests = registry.counter(
+            'teleapi_api_requests_total', 'Bot API requests by method and outcome', ('method', 'outcome')
+        )
+        self.api_request_duration = registry.histogram(
+            'teleapi_api_request_duration_seconds', 'Duration of Bot API requests (without waiting in scheduler)', ('method',)
+        )
+        self.poll_duration = registry.histogram(
+            'teleapi_get_updates_duration_seconds', 'Duration of getUpdates requests (including long polling wait)'
+        )
+        self.poll_batch_size = registry.histogram(
+            'teleapi_get_updates_batch_size', 'Amount of updates returned by getUpdates', buckets=BATCH_SIZE_BUCKETS
+        )
+        self.updates = registry.counter(
+            'teleapi_updates_total', 'Processed updates by outcome', ('outcome',)
+        )
+        self.update_duration = registry.histogram(
+            'teleapi_update_processing_seconds', 'Duration of update processing (middlewares and dispatch)'
+        )
+        self.updates_in_progress = registry.gauge(
+            'teleapi_updates_in_progress', 'Updates that are being processed'
+        )
+        self.handler_duration = registry.histogram(
+            'teleapi_handler_duration_seconds', 'Duration of event listeners and commands', ('executor', 'handler', 'kind')
+        )
+        self.handler_timeouts = registry.counter(
+            'teleapi_handler_timeouts_total', 'Event listeners and commands cancelled on timeout', ('executor', 'handler', 'kind')
+        )
+        self.errors = registry.counter(
+            'teleapi_errors_total', 'Errors processed by error managers', ('manager', 'error', 'outcome')
+        )
+        self.loop_lag = registry.histogram(
+            'teleapi_event_loop_lag_seconds', 'Delay of scheduled callbacks of the event loop', buckets=LOOP_LAG_BUCKETS
+        )
+        self.loop_stalls = registry.counter(
+            'teleapi_event_loop_stalls_total', 'Times event loop lag exceeded the threshold'
+        )
+        self.asyncio_tasks = registry.gauge('teleapi_asyncio_tasks', 'Live asyncio tasks')
+        self.offload_wait = registry.histogram(
+            'teleapi_offload_wait_seconds', 'Time offloaded sync handlers waited for a worker', ('pool',)
+        )
+        self.offload_queued = registry.gauge('teleapi_offload_queued', 'Offloaded handlers waiting for a worker', ('pool',))
+        self.offload_running = registry.gauge('teleapi_offload_running', 'Offloaded handlers that are running', ('pool',))
+
+        self.scheduler_in_flight = registry.gauge('teleapi_scheduler_in_flight', 'API requests in flight')
+        self.scheduler_limit = registry.gauge('teleapi_scheduler_limit', 'Current concurrency limit of API requests')
+        self.scheduler_queued = registry.gauge('teleapi_scheduler_queued', 'API requests waiting in scheduler', ('priority',))
+        self.circuit_state = registry.gauge('teleapi_circuit_breaker_state', 'Circuit breaker state (1 for current state)', ('state',))
+        self.circuit_opened = registry.counter('teleapi_circuit_breaker_opened_total', 'Times circuit breaker was opened')
+        self.circuit_rejected = registry.counter('teleapi_circuit_breaker_rejected_total', 'Requests rejected by open circuit breaker')
+
+        registry.add_collect_hook(self.collect_components)
+
+    def observe_api_request(self, method: str, outcome: str, duration: float) -> None:
+        self.api_requests.labels(method, outcome).inc()
+        self.api_request_duration.labels(method).observe(duration)
+
+    def observe_poll(self, duration: float, batch_size: int) -> None:
+        self.poll_duration.observe(duration)
+        self.poll_batch_size.observe(batch_size)
+
+    def observe_update(self, outcome: str, duration: float) -> None:
+        self.updates.labels(outcome).inc()
+        self.update_duration.observe(duration)
+
+    def observe_loop(self, lag: float, tasks: int) -> None:
+        self.loop_lag.observe(lag)
+        self.asyncio_tasks.set(tasks)
+
+    def count_error(self, manager: Any, error: BaseException, outcome: str) -> None:
+        self.errors.labels(manager.__class__.__name__, error.__class__.__name__, outcome).inc()
+
+    def collect_components(self) -> None:
+        from teleapi.core.http.request.resilience import get_circuit_breaker
+        from teleapi.core.http.request.scheduler import get_request_scheduler
+        from teleapi.core.utils.offload import get_process_offloader, get_thread_offloader
+
+        if (scheduler := get_request_scheduler()) is not None:
+            self.scheduler_in_flight.set(scheduler.in_flight)
+            self.scheduler_limit.set(scheduler.limit)
+
+            for priority in scheduler.weights:
+                self.scheduler_queued.labels(priority.value).set(scheduler.queued(priority))
+
+        if (breaker := get_circuit_breaker()) is not None:
+            stats = breaker.stats()
+
+            for state in CIRCUIT_STATES:
+                self.circuit_state.labels(state).set(1 if stats['state'] == state else 0)
+
+            self.circuit_opened.labels().value = stats['opened']
+            self.circuit_rejected.labels().value = stats['rejected']
+
+        if (offloader := get_thread_offloader()) is not None:
+            self.offload_queued.labels('thread').set(offloader.queued)
+            self.offload_running.labels('thread').set(offloader.running)
+
+        if (offloader := get_process_offloader()) is not None:
+            self.offload_queued.labels('process').set(offloader.queued)
+            self.offload_running.labels('process').set(offloader.running)
+
+
+_registry_metrics: 'WeakKeyDictionary[MetricsRegistry, TeleapiMetrics]' = WeakKeyDictionary()
+
+
+def get_metrics() -> Optional[TeleapiMetrics]:
+    """
+    Returns framework metrics of the registry configured with `METRICS_REGISTRY` setting
+
+    :return: `Optional[TeleapiMetrics]`
+        Metrics or None if metrics are disabled
+    """
+
+    registry = get_metrics_registry()
+
+    if registry is None:
+        return None
+
+    metrics = _registry_metrics.get(registry)
+
+    if metrics is None:
+        metrics = _registry_metrics[registry] = TeleapiMetrics(registry)
+
+    return metrics
+
+
+@contextmanager
+def observe_handler(executor: Any, handler: str, kind: str) -> Iterator[None]:
+    """
+    Context manager that observes duration of event listener or command
+
+    :param executor: `Any`
+        Executor the handler belongs to
+    :param handler: `str`
+        Name of event listener class or command
+    :param kind: `str`
+        Kind of the handler ('listener' or 'command')
+    """
+
+    metrics = get_metrics()
+
+    if metrics is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        metrics.handler_duration.labels(
+            executor.__class__.__name__, handler, kind
+        ).observe(time.perf_counter() - started_at)
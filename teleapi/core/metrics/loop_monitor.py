@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.syntax import default
+from .instruments import get_metrics
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT = object()
+_default_loop_monitor: Optional['LoopMonitor'] = None
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag (delay of scheduled callbacks) and counts live asyncio tasks.
+
+    A task sleeps for `interval` and measures how late it's woken up. A watchdog thread checks heartbeat of the task:
+    if the loop does not respond longer than `lag_threshold`, the stack of the loop thread is sampled while it's blocked,
+    so the blocking code (e.g. synchronous file writes in handlers) can be found in logs.
+    """
+
+    def __init__(self,
+                 interval: float = None,
+                 lag_threshold: float = None,
+                 sample_stacks: bool = None,
+                 stack_limit: int = 30) -> None:
+        """
+        Initialize the LoopMonitor instance.
+
+        :param interval: `float`
+            (Optional) Interval of measurements in seconds. Defaults to `LOOP_MONITOR_INTERVAL` setting (0.5)
+        :param lag_threshold: `float`
+            (Optional) Lag in seconds that is reported as warning. Defaults to `LOOP_LAG_THRESHOLD` setting (0.1)
+        :param sample_stacks: `bool`
+            (Optional) Sample stack of blocked loop thread in a watchdog thread. Defaults to `LOOP_SAMPLE_STACKS` setting (True)
+        :param stack_limit: `int`
+            (Optional) Max amount of sampled stack frames
+        """
+
+        self.interval = default(interval, project_settings.get('LOOP_MONITOR_INTERVAL', 0.5))
+        self.lag_threshold = default(lag_threshold, project_settings.get('LOOP_LAG_THRESHOLD', 0.1))
+        self.sample_stacks = default(sample_stacks, project_settings.get('LOOP_SAMPLE_STACKS', True))
+        self.stack_limit = stack_limit
+
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.tasks = 0
+        self.stall_count = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._stall_stack: Optional[List[str]] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Starts the monitor in the running event loop
+
+        :raises:
+            :raise RuntimeError: If there is no running event loop
+        """
+
+        if self.is_running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+        if self.sample_stacks:
+            self._watchdog = threading.Thread(target=self._watch, name='teleapi-loop-watchdog', daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stops the monitor
+        """
+
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+            self._task = None
+
+        self._watchdog = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns monitor metrics
+
+        :return: `dict`
+            Metrics
+        """
+
+        return {
+            'lag': self.lag,
+            'max_lag': self.max_lag,
+            'tasks': self.tasks,
+            'stalls': self.stall_count
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            expected_at = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+
+            self._heartbeat = time.monotonic()
+            self.lag = max(0.0, loop.time() - expected_at)
+            self.max_lag = max(self.max_lag, self.lag)
+            self.tasks = len(asyncio.all_tasks(loop))
+
+            if (metrics := get_metrics()) is not None:
+                metrics.observe_loop(self.lag, self.tasks)
+
+            if self.lag >= self.lag_threshold:
+                self._report_stall()
+
+    def _report_stall(self) -> None:
+        self.stall_count += 1
+
+        if (metrics := get_metrics()) is not None:
+            metrics.loop_stalls.inc()
+
+        stack, self._stall_stack = self._stall_stack, None
+
+        if stack is not None:
+            logger.warning(
+                f"Event loop was blocked for {self.lag:.3f}s ({self.tasks} tasks). Stack of the blocked loop:\n{''.join(stack)}"
+            )
+        else:
+            logger.warning(f"Event loop lag is {self.lag:.3f}s ({self.tasks} tasks)")
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+
+        while not self._stopped.wait(min(self.interval, self.lag_threshold) / 2):
+            heartbeat = self._heartbeat
+
+            if heartbeat == reported_heartbeat or time.monotonic() - heartbeat < self.interval + self.lag_threshold:
+                continue
+
+            # Loop did not wake the monitor task in time: sample the stack while the loop is blocked
+            frame = sys._current_frames().get(self._loop_thread_id)
+
+            if frame is not None:
+                self._stall_stack = traceback.format_stack(frame, limit=self.stack_limit)
+
+            reported_heartbeat = heartbeat
+
+
+def get_loop_monitor() -> Optional[LoopMonitor]:
+    """
+    Returns loop monitor configured with `LOOP_MONITOR` setting (default monitor if setting is not defined)
+
+    :return: `Optional[LoopMonitor]`
+        Loop monitor or None if it is disabled
+    """
+
+    global _default_loop_monitor
+
+    monitor = project_settings.get('LOOP_MONITOR', _DEFAULT)
+
+    if monitor is _DEFAULT:
+        if _default_loop_monitor is None:
+            _default_loop_monitor = LoopMonitor()
+
+        return _default_loop_monitor
+
+    if monitor is not None and not isinstance(monitor, LoopMonitor):
+        raise TypeError("LOOP_MONITOR setting must be instance of LoopMonitor")
+
+    return monitor
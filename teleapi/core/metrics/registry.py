@@ -0,0 +1,455 @@
+import math
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from teleapi.core.state.settings import project_settings
+
+# Histogram buckets (upper bounds) in seconds, suitable for API requests and update processing
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_NAME_PATTERN = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+
+
+class Metric:
+    """
+    Base class of metrics. Metric with labels holds child metric for every combination of label values
+    """
+
+    type_: str = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        """
+        Initialize the Metric instance.
+
+        :param name: `str`
+            Metric name (Prometheus naming rules)
+
+        :param documentation: `str`
+            Metric description
+
+        :param labelnames: `Sequence[str]`
+            (Optional) Names of labels
+
+        :raises:
+            :raise ValueError: If name or label name is invalid
+        """
+
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid metric name: '{name}'")
+
+        for labelname in labelnames:
+            if not _NAME_PATTERN.match(labelname) or labelname.startswith('__'):
+                raise ValueError(f"Invalid label name: '{labelname}'")
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: Any) -> Any:
+        """
+        Returns child metric for label values (creates it if needed)
+
+        :param values: `Any`
+            Label values in order of `labelnames` (converted to strings)
+
+        :return: `Any`
+            Child metric
+        """
+
+        child = self._children.get(values)
+
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"Metric {self.name} expects {len(self.labelnames)} label values, got {len(values)}")
+
+            child = self._children[values] = self._make_child()
+
+        return child
+
+    def _make_child(self) -> Any:
+        raise NotImplementedError
+
+    def _unlabeled(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"Metric {self.name} has labels, use 'labels' method")
+
+        return self.labels()
+
+    def items(self) -> List[Tuple[Dict[str, str], Any]]:
+        """
+        Returns label sets and child metrics
+
+        :return: `List[Tuple[Dict[str, str], Any]]`
+            Pairs of labels dict and child metric
+        """
+
+        return [
+            (dict(zip(self.labelnames, (str(value) for value in values))), child)
+            for values, child in list(self._children.items())
+        ]
+
+    def clear(self) -> None:
+        """
+        Removes all children (label sets) of the metric
+        """
+
+        self._children.clear()
+
+
+class _CounterValue:
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only be increased")
+
+        self.value += amount
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing value (e.g. amount of requests)
+    """
+
+    type_ = 'counter'
+
+    def _make_child(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabeled().inc(amount)
+
+
+class _GaugeValue:
+    __slots__ = ('value', 'function')
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down (e.g. amount of updates in progress).
+    Value can be computed on collection with `set_function`
+    """
+
+    type_ = 'gauge'
+
+    def _make_child(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        self._unlabeled().set(value)
+
+    def inc(self, amount: float = 1) -> None:
+        self._unlabeled().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self._unlabeled().dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._unlabeled().set_function(function)
+
+
+class _HistogramValue:
+    __slots__ = ('upper_bounds', 'counts', 'sum')
+
+    def __init__(self, upper_bounds: Tuple[float, ...]) -> None:
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # The last one is +Inf bucket
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        result = []
+        total = 0
+
+        for upper_bound, count in zip(self.upper_bounds + (math.inf,), self.counts):
+            total += count
+            result.append((upper_bound, total))
+
+        return result
+
+
+class Histogram(Metric):
+    """
+    Distribution of values (e.g. request durations) in fixed buckets.
+    Observation costs one binary search over bucket bounds
+    """
+
+    type_ = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize the Histogram instance.
+
+        :param buckets: `Sequence[float]`
+            (Optional) Upper bounds of buckets (+Inf bucket is added automatically)
+        """
+
+        super().__init__(name, documentation, labelnames)
+
+        upper_bounds = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+
+        if not upper_bounds:
+            raise ValueError("Histogram must have at least one bucket")
+
+        self.upper_bounds = upper_bounds
+
+    def _make_child(self) -> _HistogramValue:
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._unlabeled().observe(value)
+
+    def time(self):
+        return self._unlabeled().time()
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics. Metrics are exposed with `snapshot` (Python API) and `to_prometheus` (Prometheus text format)
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._collect_hooks: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Registers metric
+
+        :param metric: `Metric`
+            The metric
+
+        :return: `Metric`
+            The registered metric
+
+        :raises:
+            :raise ValueError: If metric with the same name is already registered
+        """
+
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def _get_or_create(self, metric_cls: type, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        metric = self._metrics.get(name)
+
+        if metric is None:
+            return self.register(metric_cls(name, documentation, labelnames, **kwargs))
+
+        if not isinstance(metric, metric_cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric '{name}' is already registered with another type or labels")
+
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Returns registered counter (registers it if needed)
+        """
+
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """
+        Returns registered gauge (registers it if needed)
+        """
+
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Returns registered histogram (registers it if needed)
+        """
+
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collect_hook(self, hook: Callable[[], None]) -> None:
+        """
+        Adds function that is called before metrics are collected (e.g. to update gauges from other objects state)
+
+        :param hook: `Callable[[], None]`
+            The function
+        """
+
+        self._collect_hooks.append(hook)
+
+    def collect(self) -> List[Metric]:
+        """
+        Calls collect hooks and returns registered metrics
+
+        :return: `List[Metric]`
+            Metrics
+        """
+
+        for hook in self._collect_hooks:
+            hook()
+
+        return list(self._metrics.values())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns current values of all metrics
+
+        :return: `Dict[str, Dict[str, Any]]`
+            Metric name -> `{"type", "help", "samples"}`. Sample is `{"labels", "value"}` for counters and gauges
+            and `{"labels", "count", "sum", "buckets"}` for histograms (`buckets` are cumulative counts by upper bound
+            formatted as in Prometheus `le` label, e.g. "0.5" and "+Inf")
+        """
+
+        result = {}
+
+        for metric in self.collect():
+            samples = []
+
+            for labels, child in metric.items():
+                if isinstance(child, _HistogramValue):
+                    samples.append({
+                        'labels': labels,
+                        'count': child.count,
+                        'sum': child.sum,
+                        'buckets': {_format_value(upper_bound): count for upper_bound, count in child.cumulative_counts()}
+                    })
+                elif isinstance(child, _GaugeValue):
+                    samples.append({'labels': labels, 'value': child.get()})
+                else:
+                    samples.append({'labels': labels, 'value': child.value})
+
+            result[metric.name] = {'type': metric.type_, 'help': metric.documentation, 'samples': samples}
+
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Returns metrics in Prometheus text exposition format (version 0.0.4)
+
+        :return: `str`
+            Metrics text
+        """
+
+        lines = []
+
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_}")
+
+            for labels, child in metric.items():
+                if isinstance(child, _HistogramValue):
+                    for upper_bound, count in child.cumulative_counts():
+                        bucket_labels = _format_labels({**labels, 'le': _format_value(upper_bound)})
+                        lines.append(f"{metric.name}_bucket{bucket_labels} {count}")
+
+                    lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+                    lines.append(f"{metric.name}_count{_format_labels(labels)} {child.count}")
+                elif isinstance(child, _GaugeValue):
+                    lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(child.get())}")
+                else:
+                    lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(child.value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    pairs = (f'{name}="{_escape_label_value(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+
+    if value == -math.inf:
+        return "-Inf"
+
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+_DEFAULT = object()
+_default_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics_registry() -> Optional[MetricsRegistry]:
+    """
+    Returns registry configured with `METRICS_REGISTRY` setting (default registry if setting is not defined)
+
+    :return: `Optional[MetricsRegistry]`
+        Metrics registry or None if metrics are disabled
+    """
+
+    global _default_registry
+
+    registry = project_settings.get('METRICS_REGISTRY', _DEFAULT)
+
+    if registry is _DEFAULT:
+        if _default_registry is None:
+            _default_registry = MetricsRegistry()
+
+        return _default_registry
+
+    if registry is not None and not isinstance(registry, MetricsRegistry):
+        raise TypeError("METRICS_REGISTRY setting must be instance of MetricsRegistry")
+
+    return registry
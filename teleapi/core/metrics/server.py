@@ -0,0 +1,104 @@
+import logging
+from typing import Optional
+
+from aiohttp import web
+
+from teleapi.core.utils.json_codec import get_json_codec
+from teleapi.core.utils.syntax import default
+from .registry import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsServer:
+    """
+    HTTP server that exposes metrics in Prometheus text format (`path`) and as JSON snapshot (`path` + '.json')
+    """
+
+    def __init__(self,
+                 registry: MetricsRegistry = None,
+                 host: str = '127.0.0.1',
+                 port: int = 9464,
+                 path: str = '/metrics') -> None:
+        """
+        Initialize the MetricsServer instance.
+
+        :param registry: `MetricsRegistry`
+            (Optional) Registry that is exposed. If None, registry of `METRICS_REGISTRY` setting is used
+        :param host: `str`
+            (Optional) Host the server listens on
+        :param port: `int`
+            (Optional) Port the server listens on. If 0, free port is chosen
+        :param path: `str`
+            (Optional) Path of metrics endpoint
+        """
+
+        self._registry = registry
+        self.host = host
+        self.port = port
+        self.path = path
+
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def registry(self) -> Optional[MetricsRegistry]:
+        return default(self._registry, get_metrics_registry())
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(self.path, self.handle_metrics)
+        app.router.add_get(f"{self.path}.json", self.handle_snapshot)
+
+        return app
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        registry = self.registry
+
+        return web.Response(
+            body=(registry.to_prometheus() if registry is not None else '').encode(),
+            headers={'Content-Type': PROMETHEUS_CONTENT_TYPE}
+        )
+
+    async def handle_snapshot(self, request: web.Request) -> web.Response:
+        registry = self.registry
+
+        return web.Response(
+            body=get_json_codec().dumps(registry.snapshot() if registry is not None else {}),
+            content_type='application/json'
+        )
+
+    async def start(self) -> None:
+        """
+        Starts the server. If `port` is 0, it's set to the chosen port
+        """
+
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Metrics are exposed on {self.url}")
+
+    async def stop(self) -> None:
+        """
+        Stops the server
+        """
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'MetricsServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
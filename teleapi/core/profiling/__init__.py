@@ -0,0 +1,2 @@
+from .controller import ProfilingController, ProfileKind, get_profiling_controller, parse_profile_args
+from .sampler import StackSampler
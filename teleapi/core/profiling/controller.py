@@ -0,0 +1,328 @@
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import tracemalloc
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional, Tuple
+
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.syntax import default
+from .sampler import StackSampler
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT = object()
+_default_profiling_controller: Optional['ProfilingController'] = None
+
+
+class ProfileKind(Enum):
+    CPU = "cpu"  # Deterministic profiling of the event loop thread (cProfile)
+    SAMPLE = "sample"  # Sampling of the event loop thread stack (low overhead)
+    MEMORY = "memory"  # Difference of tracemalloc snapshots taken at the start and at the end of the session
+
+
+class ProfilingController:
+    """
+    Runs profiling sessions of a running bot and writes reports to `reports_dir`.
+    Sessions can be started from code (`profile`), with signals (SIGUSR1 - CPU, SIGUSR2 - memory),
+    with a local control socket (lines like "cpu 30") or with `ProfileCommand` admin command.
+    Only one session can run at a time
+    """
+
+    def __init__(self,
+                 reports_dir: str = None,
+                 duration: float = None,
+                 top: int = 40,
+                 sample_interval: float = 0.005) -> None:
+        """
+        Initialize the ProfilingController instance.
+
+        :param reports_dir: `str`
+            (Optional) Directory reports are written to. Defaults to `PROFILING_DIR` setting ('profiles')
+        :param duration: `float`
+            (Optional) Default duration of session in seconds. Defaults to `PROFILING_DURATION` setting (30)
+        :param top: `int`
+            (Optional) Amount of functions (or allocation sites) in text reports
+        :param sample_interval: `float`
+            (Optional) Interval of stack sampling in seconds
+        """
+
+        self.reports_dir = default(reports_dir, project_settings.get('PROFILING_DIR', 'profiles'))
+        self.duration = default(duration, project_settings.get('PROFILING_DURATION', 30))
+        self.top = top
+        self.sample_interval = sample_interval
+
+        self._session: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._socket_path: Optional[str] = None
+        self._signals = []
+
+    @property
+    def is_profiling(self) -> bool:
+        return self._session is not None and not self._session.done()
+
+    async def ainit(self) -> None:
+        """
+        Installs signal handlers (if `PROFILING_SIGNALS` setting is True) and
+        starts control socket (if `PROFILING_SOCKET` setting is defined)
+        """
+
+        if project_settings.get('PROFILING_SIGNALS', False):
+            self.install_signal_handlers()
+
+        if (path := project_settings.get('PROFILING_SOCKET', None)) is not None:
+            await self.start_control_socket(path)
+
+    async def close(self) -> None:
+        """
+        Removes signal handlers, stops control socket and cancels running session
+        """
+
+        loop = asyncio.get_running_loop()
+
+        for sig in self._signals:
+            loop.remove_signal_handler(sig)
+
+        self._signals.clear()
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+        if self.is_profiling:
+            self._session.cancel()
+
+    async def profile(self, kind: ProfileKind, duration: float = None) -> str:
+        """
+        Profiles the bot for `duration` seconds and writes report
+
+        :param kind: `ProfileKind`
+            Kind of profiling
+        :param duration: `float`
+            (Optional) Duration of the session in seconds. Defaults to `self.duration`
+
+        :return: `str`
+            Path of the text report
+
+        :raises:
+            :raise RuntimeError: If another session is running
+        """
+
+        if self.is_profiling:
+            raise RuntimeError("Another profiling session is running")
+
+        duration = default(duration, self.duration)
+        session = {
+            ProfileKind.CPU: self._profile_cpu,
+            ProfileKind.SAMPLE: self._profile_sample,
+            ProfileKind.MEMORY: self._profile_memory
+        }[kind]
+
+        logger.info(f"Starting {kind.value} profiling session for {duration}s")
+
+        self._session = asyncio.create_task(session(duration, self._get_report_path(kind)))
+        path = await self._session
+
+        logger.info(f"Profiling report is written to {path}")
+        return path
+
+    def start_profile(self, kind: ProfileKind, duration: float = None) -> None:
+        """
+        Starts profiling session in background. Errors are logged
+        """
+
+        async def run() -> None:
+            try:
+                await self.profile(kind, duration)
+            except Exception as error:
+                logger.error(f"Failed to profile: {error.__class__.__name__}: {error}")
+
+        asyncio.create_task(run())
+
+    def install_signal_handlers(self) -> None:
+        """
+        Starts CPU profiling on SIGUSR1 and memory profiling on SIGUSR2 (not available on Windows)
+        """
+
+        if not hasattr(signal, 'SIGUSR1'):
+            logger.warning("Profiling signals are not supported on this platform")
+            return
+
+        loop = asyncio.get_running_loop()
+
+        for sig, kind in ((signal.SIGUSR1, ProfileKind.CPU), (signal.SIGUSR2, ProfileKind.MEMORY)):
+            loop.add_signal_handler(sig, self.start_profile, kind)
+            self._signals.append(sig)
+
+    async def start_control_socket(self, path: str) -> None:
+        """
+        Starts Unix socket server. Every line sent to the socket ("<cpu|sample|memory> [seconds]") starts a session,
+        path of the report is sent back when the session is finished
+
+        :param path: `str`
+            Path of the socket file (only local users with access to the file can start profiling)
+        """
+
+        if os.path.exists(path):
+            os.remove(path)
+
+        self._server = await asyncio.start_unix_server(self._handle_control_client, path=path)
+        os.chmod(path, 0o600)
+        self._socket_path = path
+
+        logger.info(f"Profiling control socket is listening on {path}")
+
+    async def _handle_control_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    kind, duration = parse_profile_args(line.decode().split())
+                    response = await self.profile(kind, duration)
+                except (ValueError, RuntimeError) as error:
+                    response = f"error: {error}"
+
+                writer.write(f"{response}\n".encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _get_report_path(self, kind: ProfileKind) -> str:
+        os.makedirs(self.reports_dir, exist_ok=True)
+        return os.path.join(self.reports_dir, f"{kind.value}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+
+    async def _profile_cpu(self, duration: float, path: str) -> str:
+        # cProfile profiles only the thread it's enabled in, which is the event loop thread
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+
+        stats = pstats.Stats(profiler)
+        await asyncio.to_thread(stats.dump_stats, f"{path}.prof")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+
+        return await self._write_report(f"{path}.txt", stream.getvalue())
+
+    async def _profile_sample(self, duration: float, path: str) -> str:
+        sampler = StackSampler(interval=self.sample_interval)
+        sampler.start()
+
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+
+        await self._write_report(f"{path}.collapsed", '\n'.join(sampler.collapsed()))
+
+        lines = [f"{sampler.samples} samples, interval {self.sample_interval}s", f"{'own':>7} {'total':>7}  function"]
+        lines += [f"{item['own']:>7.1%} {item['total']:>7.1%}  {item['function']}" for item in sampler.top_functions(self.top)]
+
+        return await self._write_report(f"{path}.txt", '\n'.join(lines))
+
+    async def _profile_memory(self, duration: float, path: str) -> str:
+        started = not tracemalloc.is_tracing()
+
+        if started:
+            tracemalloc.start(10)
+
+        try:
+            before = tracemalloc.take_snapshot()
+            await asyncio.sleep(duration)
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>')
+        ]
+        before, after = before.filter_traces(filters), after.filter_traces(filters)
+
+        lines = [f"Top allocation differences in {duration}s (by line):"]
+        lines += [str(stat) for stat in after.compare_to(before, 'lineno')[:self.top]]
+        lines += ['', "Top allocations (by line):"]
+        lines += [str(stat) for stat in after.statistics('lineno')[:self.top]]
+        lines += ['', "Top allocation differences (by traceback):"]
+
+        for stat in after.compare_to(before, 'traceback')[:10]:
+            lines.append(str(stat))
+            lines += [f"    {line}" for line in stat.traceback.format()]
+
+        return await self._write_report(f"{path}.txt", '\n'.join(lines))
+
+    @staticmethod
+    async def _write_report(path: str, text: str) -> str:
+        def write() -> None:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+
+        await asyncio.to_thread(write)
+        return path
+
+
+def parse_profile_args(args: List[str]) -> Tuple[ProfileKind, Optional[float]]:
+    """
+    Parses arguments of profiling request: kind and (optionally) duration in seconds
+
+    :param args: `List[str]`
+        Arguments (e.g. ['cpu', '30'])
+
+    :return: `Tuple[ProfileKind, Optional[float]]`
+        Kind and duration
+
+    :raises:
+        :raise ValueError: If arguments are incorrect
+    """
+
+    if not 1 <= len(args) <= 2:
+        raise ValueError("expected '<cpu|sample|memory> [seconds]'")
+
+    kind = ProfileKind(args[0].lower())
+    duration = float(args[1]) if len(args) == 2 else None
+
+    if duration is not None and not 0 < duration <= 3600:
+        raise ValueError("duration must be in range (0, 3600] seconds")
+
+    return kind, duration
+
+
+def get_profiling_controller() -> Optional[ProfilingController]:
+    """
+    Returns profiling controller configured with `PROFILING_CONTROLLER` setting (default controller if setting is not defined)
+
+    :return: `Optional[ProfilingController]`
+        Profiling controller or None if it is disabled
+    """
+
+    global _default_profiling_controller
+
+    controller = project_settings.get('PROFILING_CONTROLLER', _DEFAULT)
+
+    if controller is _DEFAULT:
+        if _default_profiling_controller is None:
+            _default_profiling_controller = ProfilingController()
+
+        return _default_profiling_controller
+
+    if controller is not None and not isinstance(controller, ProfilingController):
+        raise TypeError("PROFILING_CONTROLLER setting must be instance of ProfilingController")
+
+    return controller
@@ -0,0 +1,103 @@
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StackSampler:
+    """
+    Sampling profiler of one thread (the event loop thread). A background thread records the stack of the profiled
+    thread every `interval` seconds, so overhead does not depend on amount of function calls (unlike `cProfile`).
+    Results are in collapsed stack format ("outer;inner;innermost count" lines) that is read by flame graph tools
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int = None) -> None:
+        """
+        Initialize the StackSampler instance.
+
+        :param interval: `float`
+            (Optional) Sampling interval in seconds
+        :param thread_id: `int`
+            (Optional) Identifier of profiled thread. Defaults to the current thread
+        """
+
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='teleapi-stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+
+            if frame is not None:
+                self.stacks[self._get_stack(frame)] += 1
+                self.samples += 1
+
+    @staticmethod
+    def _get_stack(frame: FrameType) -> Tuple[Tuple[CodeType, int], ...]:
+        stack = []
+
+        while frame is not None:
+            stack.append((frame.f_code, frame.f_lineno))
+            frame = frame.f_back
+
+        return tuple(reversed(stack))
+
+    @staticmethod
+    def _format_code(code: CodeType) -> str:
+        return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+    def collapsed(self) -> List[str]:
+        """
+        Returns samples in collapsed stack format
+        """
+
+        return [
+            ';'.join(f"{code.co_name} ({code.co_filename}:{lineno})" for code, lineno in stack) + f" {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+
+    def top_functions(self, limit: int = 30) -> List[Dict[str, Any]]:
+        """
+        Returns functions that were executed (innermost frame) in the most samples
+
+        :param limit: `int`
+            (Optional) Max amount of functions
+
+        :return: `List[Dict[str, Any]]`
+            Functions with `own` (innermost frame) and `total` (anywhere on the stack) shares of samples
+        """
+
+        if not self.samples:
+            return []
+
+        own, total = Counter(), Counter()
+
+        for stack, count in self.stacks.items():
+            own[stack[-1][0]] += count
+
+            for code in {code for code, _ in stack}:
+                total[code] += count
+
+        return [
+            {'function': self._format_code(code), 'own': count / self.samples, 'total': total[code] / self.samples}
+            for code, count in own.most_common(limit)
+        ]
@@ -0,0 +1,2 @@
+from .tracer import Tracer, Trace, Span, current_span, trace_span, get_tracer
+from .exporters import BaseTraceExporter, MemoryTraceExporter, JsonLinesTraceExporter
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Deque, List, Optional
+
+from teleapi.core.utils.json_codec import get_json_codec
+
+if TYPE_CHECKING:
+    from .tracer import Trace
+
+logger = logging.getLogger(__name__)
+
+
+class BaseTraceExporter(ABC):
+    """
+    Receives finished traces from the tracer
+    """
+
+    @abstractmethod
+    def export(self, trace: 'Trace') -> None:
+        """
+        Exports finished trace. Called in the event loop, so it must not block
+
+        :param trace: `Trace`
+            Finished trace
+        """
+        ...
+
+    def flush(self) -> None:
+        ...
+
+    def close(self) -> None:
+        self.flush()
+
+
+class MemoryTraceExporter(BaseTraceExporter):
+    """
+    Keeps last `maxlen` traces in memory (ring buffer)
+    """
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self._traces: Deque['Trace'] = deque(maxlen=maxlen)
+
+    def export(self, trace: 'Trace') -> None:
+        self._traces.append(trace)
+
+    def traces(self) -> List['Trace']:
+        return list(self._traces)
+
+    def slowest(self, count: int = 10) -> List['Trace']:
+        """
+        Returns slowest kept traces (by duration of root span)
+        """
+
+        return sorted(self._traces, key=lambda trace: trace.duration or 0, reverse=True)[:count]
+
+    def clear(self) -> None:
+        self._traces.clear()
+
+
+class JsonLinesTraceExporter(BaseTraceExporter):
+    """
+    Appends traces to a file, one JSON object per line. Lines are buffered and written by a single background thread
+    (so the event loop is not blocked by disk writes and batches are written in order).
+    Buffer is written when it's full or `flush_interval` seconds after the first buffered trace
+
+    Notes:
+     - Call `close` (`Tracer.close`) on shutdown to write buffered traces, bot does it at the end of `run`
+    """
+
+    def __init__(self, path: str, buffer_size: int = 100, flush_interval: Optional[float] = 5.0) -> None:
+        """
+        Initialize the JsonLinesTraceExporter instance.
+
+        :param path: `str`
+            Path of the file
+        :param buffer_size: `int`
+            (Optional) Amount of traces that are written at once
+        :param flush_interval: `Optional[float]`
+            (Optional) Max time in seconds traces are kept in buffer. If None, buffer is written only when it's full
+        """
+
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+
+        self._buffer: List[bytes] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    def export(self, trace: 'Trace') -> None:
+        self._buffer.append(get_json_codec().dumps(trace.to_dict()) + b'\n')
+
+        if len(self._buffer) >= self.buffer_size:
+            self._write_in_background()
+        elif self._flush_handle is None and self.flush_interval is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+
+            self._flush_handle = loop.call_later(self.flush_interval, self._write_in_background)
+
+    def flush(self) -> None:
+        """
+        Writes buffered traces and waits until all scheduled writes are finished
+        """
+
+        self._cancel_flush_timer()
+        lines, self._buffer = self._buffer, []
+
+        if self._writer is not None:
+            # The writer has one thread, so the batch is written after the scheduled ones
+            self._writer.submit(self._write, lines).result()
+        else:
+            self._write(lines)
+
+    def close(self) -> None:
+        self.flush()
+
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
+    def _write_in_background(self) -> None:
+        self._cancel_flush_timer()
+        lines, self._buffer = self._buffer, []
+
+        if not lines:
+            return
+
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='teleapi-traces')
+
+        self._writer.submit(self._write, lines)
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _write(self, lines: List[bytes]) -> None:
+        if not lines:
+            return
+
+        try:
+            with open(self.path, 'ab') as file:
+                file.writelines(lines)
+        except OSError as error:
+            logger.error(f"Failed to write {len(lines)} traces to {self.path}: {error}")
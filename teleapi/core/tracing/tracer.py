@@ -0,0 +1,241 @@
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from teleapi.core.state.settings import project_settings
+from .exporters import BaseTraceExporter, MemoryTraceExporter
+
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """
+    Timed stage of update processing. Spans of one update form a tree (trace)
+    """
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attributes', 'started_at', 'duration', 'error', '_start')
+
+    def __init__(self, trace: 'Trace', name: str, parent_id: int = None, attributes: Dict[str, Any] = None) -> None:
+        self.trace = trace
+        self.trace.open_spans += 1
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self, error: BaseException = None) -> None:
+        self.duration = time.perf_counter() - self._start
+
+        if error is not None:
+            self.error = error.__class__.__name__
+
+        self.trace.finish_span(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.started_at,
+            'duration_ms': self.duration * 1e3 if self.duration is not None else None,
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+
+class Trace:
+    """
+    Spans of one update (or other root operation).
+    Trace is finished when all its spans are finished, including spans of tasks that outlive the root span.
+    Spans of tasks that start after the trace is finished are added to it, but the trace is not exported again
+    """
+
+    __slots__ = ('tracer', 'trace_id', 'sampled', 'root', 'spans', 'open_spans', 'finished')
+
+    def __init__(self, tracer: 'Tracer', trace_id: Any, sampled: bool) -> None:
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.sampled = sampled  # If False, trace is exported only if it's slow (see `Tracer.slow_threshold`)
+        self.root: Optional[Span] = None
+        self.spans: List[Span] = []  # Finished spans
+        self.open_spans = 0
+        self.finished = False
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.root.duration if self.root is not None else None
+
+    def finish_span(self, span: Span) -> None:
+        self.spans.append(span)
+        self.open_spans -= 1
+
+        if self.open_spans == 0 and not self.finished:
+            self.finished = True
+            self.tracer.finish_trace(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'spans': [span.to_dict() for span in self.spans]
+        }
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """
+    Creates span tree of every sampled update and passes finished traces to the exporter.
+    Current span is stored in context variable, so tasks created while processing an update inherit it
+    """
+
+    def __init__(self,
+                 exporter: BaseTraceExporter = None,
+                 sample_rate: float = 1.0,
+                 slow_threshold: float = None) -> None:
+        """
+        Initialize the Tracer instance.
+
+        :param exporter: `BaseTraceExporter`
+            (Optional) Exporter of finished traces. Defaults to `MemoryTraceExporter`
+        :param sample_rate: `float`
+            (Optional) Part of traces (from 0 to 1) that are exported
+        :param slow_threshold: `float`
+            (Optional) Duration of root span in seconds. Traces that are not sampled are still recorded
+            and exported if they are slower than the threshold. If None, only sampled traces are recorded
+
+        :raises:
+            :raise ValueError: If sample_rate is not in range [0, 1]
+        """
+
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be in range [0, 1]")
+
+        self.exporter = exporter if exporter is not None else MemoryTraceExporter()
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+
+    @contextmanager
+    def start_trace(self, name: str, trace_id: Any = None, **attributes) -> Iterator[Optional[Span]]:
+        """
+        Starts a trace with root span (used for every processed update)
+
+        :param name: `str`
+            Name of root span
+        :param trace_id: `Any`
+            (Optional) Identifier of the trace (e.g. update id). Defaults to root span id
+        :param attributes: `dict`
+            (Optional) Attributes of root span
+
+        :return: `Optional[Span]`
+            Root span or None if trace is not recorded
+        """
+
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+
+        if not sampled and self.slow_threshold is None:
+            token = current_span.set(None)
+
+            try:
+                yield None
+            finally:
+                current_span.reset(token)
+
+            return
+
+        trace = Trace(self, trace_id, sampled)
+        span = trace.root = Span(trace, name, attributes=attributes)
+
+        if trace_id is None:
+            trace.trace_id = span.span_id
+
+        token = current_span.set(span)
+        error = None
+
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            current_span.reset(token)
+            span.finish(error)
+
+    def finish_trace(self, trace: Trace) -> None:
+        """
+        Exports finished trace if it's sampled or slow
+
+        :param trace: `Trace`
+            Trace which spans are all finished
+        """
+
+        if trace.sampled or trace.duration >= self.slow_threshold:
+            self.exporter.export(trace)
+
+    def close(self) -> None:
+        """
+        Writes buffered traces of the exporter and closes it
+        """
+
+        self.exporter.close()
+
+
+@contextmanager
+def trace_span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Creates child span of the current span. Does nothing if there is no recorded trace in the current context
+
+    :param name: `str`
+        Name of the span (stage of processing)
+    :param attributes: `dict`
+        (Optional) Attributes of the span (e.g. listener name or API method)
+
+    :return: `Optional[Span]`
+        Created span or None
+    """
+
+    parent = current_span.get()
+
+    if parent is None:
+        yield None
+        return
+
+    span = Span(parent.trace, name, parent_id=parent.span_id, attributes=attributes)
+    token = current_span.set(span)
+    error = None
+
+    try:
+        yield span
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        current_span.reset(token)
+        span.finish(error)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Returns tracer configured with `TRACER` setting
+
+    :return: `Optional[Tracer]`
+        Tracer or None if tracing is disabled (default)
+    """
+
+    tracer = project_settings.get('TRACER', None)
+
+    if tracer is not None and not isinstance(tracer, Tracer):
+        raise TypeError("TRACER setting must be instance of Tracer")
+
+    return tracer
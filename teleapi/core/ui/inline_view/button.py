@@ -1,7 +1,7 @@
-import inspect
 from typing import TYPE_CHECKING
 from teleapi.types.inline_keyboard_markup.sub_objects import InlineKeyboardButton
 from ...utils.collections import clear_none_values
+from ...utils.offload import to_async_handler
 from ...utils.rand import generate_random_string
 from ...utils.syntax import default
 
@@ -41,9 +41,8 @@ class InlineViewButton(BaseInlineViewButton):
 
 def button(*, text: str, row: int = None, place: int = None, **meta_kwargs):
     def decorator(func):
-        if not inspect.iscoroutinefunction(func):
-            raise TypeError('You can use this decorator only with coroutine functions')
-
+        # Sync functions run in the handler thread pool
+        func = to_async_handler(func)
         meta = type("Meta", (object,), clear_none_values({'text': text, 'row': row, 'place': place, **meta_kwargs}))
 
         button_cls = type(func.__name__, (InlineViewButton,), {
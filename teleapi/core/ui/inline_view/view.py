@@ -1,4 +1,3 @@
-import inspect
 from abc import ABCMeta
 from collections import defaultdict
 from functools import wraps
@@ -10,6 +9,7 @@ from teleapi.core.utils.rand import generate_random_string
 from teleapi.types.callback_query import CallbackQuery
 from teleapi.types.inline_keyboard_markup import InlineKeyboardMarkup
 from .button import BaseInlineViewButton
+from ...utils.offload import to_async_handler
 from ...utils.syntax import default
 from teleapi.core.ui.inline_view.button import button as button_factory
 
@@ -50,8 +50,7 @@ class BaseInlineView(metaclass=InlineViewMeta):
     @staticmethod
     def view_button(*, text: str, row: int = None, place: int = None, **meta_kwargs):
         def decorator(func):
-            if not inspect.iscoroutinefunction(func):
-                raise TypeError('You can use this decorator only with coroutine functions')
+            func = to_async_handler(func)
 
             @wraps(func)
             async def wrapper(btn, callback_query: 'CallbackQuery') -> None:
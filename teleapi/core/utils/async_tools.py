@@ -6,6 +6,7 @@ from typing import Tuple
 import aiohttp
 
 from teleapi.core.utils.syntax import default
+from teleapi.core.utils.offload import run_in_thread
 
 
 def as_task(func):
@@ -23,7 +24,7 @@ def wrap_async(func):
     async def wrapper(*args, **kwargs):
         if is_coroutine_function:
             return await func(*args, **kwargs)
-        return func(args, **kwargs)
+        return await run_in_thread(func, *args, **kwargs)
 
     return wrapper
 
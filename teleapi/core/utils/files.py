@@ -1,5 +1,8 @@
 import os
-from typing import Tuple
+import pathlib
+from typing import Tuple, Optional, Union
+
+from teleapi.core.state.settings import project_settings
 
 
 def get_file(path: str) -> Tuple[str, bytes]:
@@ -12,3 +15,39 @@ def get_file(path: str) -> Tuple[str, bytes]:
         file_data = file.read()
 
     return filename, file_data
+
+
+def is_local_mode() -> bool:
+    """
+    Checks if the bot works with a self-hosted telegram-bot-api server started with `--local` flag
+    (`API_LOCAL_MODE` setting)
+
+    :return: `bool`
+        True if local Bot API server mode is enabled
+    """
+
+    return bool(project_settings.get('API_LOCAL_MODE', False))
+
+
+def get_input_file(path: str) -> Tuple[Optional[str], Union[bytes, str]]:
+    """
+    Prepares local file to be uploaded to the Bot API.
+    In local mode the file is not read: its `file://` URI is returned instead, so the server can read it from disk
+
+    :param path: `str`
+        Path to the file
+
+    :return: `Tuple[Optional[str], Union[bytes, str]]`
+        Filename and file data. In local mode filename is None and file data is the `file://` URI
+
+    :raises:
+        :raise FileNotFoundError: If file was not found
+    """
+
+    if not is_local_mode():
+        return get_file(path)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File '{path}' was not found")
+
+    return None, pathlib.Path(path).resolve().as_uri()
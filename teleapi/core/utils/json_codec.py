@@ -0,0 +1,194 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+from teleapi.core.state.settings import project_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class BaseJsonCodec(ABC):
+    """
+    Abstract base class for JSON codecs. Codec used by teleapi is configured with `JSON_CODEC` setting
+
+    Notes:
+     - `dumps` raises TypeError if object can't be serialized, `loads` raises ValueError if data is not valid JSON
+    """
+
+    name: str = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        """
+        Serializes object to compact UTF-8 encoded JSON
+
+        :param obj: `Any`
+            Object to be serialized
+
+        :param sort_keys: `bool`
+            Whether to sort keys of dicts
+
+        :return: `bytes`
+            JSON
+        """
+        ...
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Deserializes JSON
+
+        :param data: `Union[bytes, str]`
+            JSON
+
+        :return: `Any`
+            Deserialized object
+        """
+        ...
+
+    def dumps_str(self, obj: Any, sort_keys: bool = False) -> str:
+        return self.dumps(obj, sort_keys=sort_keys).decode()
+
+
+class StdlibJsonCodec(BaseJsonCodec):
+    name = "json"
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps_str(self, obj: Any, sort_keys: bool = False) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys)
+
+
+class OrjsonCodec(BaseJsonCodec):
+    name = "orjson"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return orjson is not None
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(BaseJsonCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        self._encoder = msgspec.json.Encoder()
+        self._sorted_encoder = msgspec.json.Encoder(order='sorted')
+        self._decoder = msgspec.json.Decoder()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return msgspec is not None
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        try:
+            return (self._sorted_encoder if sort_keys else self._encoder).encode(obj)
+        except msgspec.EncodeError as error:
+            raise TypeError(str(error)) from error
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as error:
+            raise ValueError(str(error)) from error
+
+
+class UjsonCodec(BaseJsonCodec):
+    name = "ujson"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return ujson is not None
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return self.dumps_str(obj, sort_keys=sort_keys).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+    def dumps_str(self, obj: Any, sort_keys: bool = False) -> str:
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, reject_bytes=True)
+        except OverflowError as error:
+            raise TypeError(str(error)) from error
+
+
+# Codecs in order of preference for `JSON_CODEC = "auto"`
+JSON_CODECS: Dict[str, Type[BaseJsonCodec]] = {
+    codec.name: codec for codec in (OrjsonCodec, MsgspecCodec, UjsonCodec, StdlibJsonCodec)
+}
+
+_codecs: Dict[str, BaseJsonCodec] = {}
+
+
+def make_json_codec(name: str = "auto") -> BaseJsonCodec:
+    """
+    Makes JSON codec
+
+    :param name: `str`
+        Codec name (key of `JSON_CODECS`). If "auto", the fastest installed codec is used
+
+    :return: `BaseJsonCodec`
+        JSON codec
+
+    :raises:
+        :raise ValueError: If codec is unknown
+        :raise ImportError: If codec library is not installed
+    """
+
+    if name == "auto":
+        name = next(codec.name for codec in JSON_CODECS.values() if codec.is_available())
+
+    codec_class = JSON_CODECS.get(name)
+
+    if codec_class is None:
+        raise ValueError(f"Unknown JSON codec: {name}. Available codecs: {', '.join(JSON_CODECS)}")
+    if not codec_class.is_available():
+        raise ImportError(f"JSON codec {name} requires {name} package to be installed")
+
+    return codec_class()
+
+
+def get_json_codec() -> BaseJsonCodec:
+    """
+    Returns JSON codec configured with `JSON_CODEC` setting (codec name or `BaseJsonCodec` instance, "auto" by default)
+
+    :return: `BaseJsonCodec`
+        JSON codec
+    """
+
+    codec: Optional[Union[str, BaseJsonCodec]] = project_settings.get('JSON_CODEC', "auto")
+
+    if isinstance(codec, BaseJsonCodec):
+        return codec
+
+    if codec not in _codecs:
+        _codecs[codec] = make_json_codec(codec)
+
+    return _codecs[codec]
@@ -0,0 +1,538 @@
+import asyncio
+import contextvars
+import importlib
+import inspect
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from teleapi.core.metrics.instruments import get_metrics
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.syntax import default
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT = object()
+_default_thread_offloader: Optional['ThreadOffloader'] = None
+_default_process_offloader: Optional['ProcessOffloader'] = None
+
+# Functions of process handlers by '<module>:<qualname>' (filled on import of their modules, also in worker processes)
+_process_functions: Dict[str, Callable] = {}
+
+# Event loop of the handler that runs in the current worker thread
+_thread_state = threading.local()
+
+
+def _release_when_done(future: Future, loop: asyncio.AbstractEventLoop, release: Callable[[], None]) -> None:
+    # Cancelled handler (e.g. on timeout) can't interrupt a running function,
+    # so its place is released when the function returns
+    if future.done():
+        release()
+    else:
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(release))
+
+
+class ThreadOffloader:
+    """
+    Runs synchronous (blocking) handlers in a thread pool, so they don't block the event loop.
+    Amount of handlers of one owner (executor) running at the same time can be limited with owner's `thread_limit`
+
+    Notes:
+     - Context variables (current update, trace span, etc.) are copied to the worker thread
+     - Coroutines can be run from handlers with `call_in_loop`
+    """
+
+    def __init__(self, max_workers: int = None, thread_name_prefix: str = 'teleapi-handler') -> None:
+        """
+        Initialize the ThreadOffloader instance.
+
+        :param max_workers: `int`
+            (Optional) Max amount of worker threads. Defaults to `HANDLER_THREADS` setting
+            (`ThreadPoolExecutor` default if the setting is not defined)
+        :param thread_name_prefix: `str`
+            (Optional) Prefix of worker thread names
+        """
+
+        self.max_workers = default(max_workers, project_settings.get('HANDLER_THREADS', None))
+        self.thread_name_prefix = thread_name_prefix
+
+        self.queued = 0  # Handlers waiting for owner limit or for a free worker
+        self.running = 0
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._semaphores: 'WeakKeyDictionary[Any, asyncio.Semaphore]' = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+
+        return self._pool
+
+    async def run(self, func: Callable, *args, owner: Any = None, **kwargs) -> Any:
+        """
+        Runs `func` in the thread pool and returns its result
+
+        :param func: `Callable`
+            Synchronous function
+        :param owner: `Any`
+            (Optional) Owner of the handler (e.g. executor). Its `thread_limit` attribute limits
+            amount of its handlers running at the same time
+
+        :return: `Any`
+            Result of the function
+        """
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore(owner)
+        submitted_at = time.perf_counter()
+        state = {'started': False}
+
+        with self._lock:
+            self.queued += 1
+
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+
+            context = contextvars.copy_context()
+
+            try:
+                future = self.pool.submit(context.run, self._call, loop, state, submitted_at, func, args, kwargs)
+            except BaseException:
+                if semaphore is not None:
+                    semaphore.release()
+
+                raise
+
+            try:
+                wait, result = await asyncio.wrap_future(future)
+            finally:
+                if semaphore is not None:
+                    _release_when_done(future, loop, semaphore.release)
+        except BaseException:
+            with self._lock:
+                # Handler was cancelled before a worker took it (a started function can't be interrupted)
+                if not state['started']:
+                    state['started'] = True
+                    self.queued -= 1
+            raise
+
+        if (metrics := get_metrics()) is not None:
+            metrics.offload_wait.labels('thread').observe(wait)
+
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def _call(self, loop: asyncio.AbstractEventLoop, state: dict, submitted_at: float,
+              func: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            if state['started']:
+                # Handler was cancelled while waiting for a worker
+                return 0.0, None
+
+            state['started'] = True
+            self.queued -= 1
+            self.running += 1
+
+        wait = time.perf_counter() - submitted_at
+        _thread_state.loop = loop
+
+        try:
+            return wait, func(*args, **kwargs)
+        finally:
+            _thread_state.loop = None
+
+            with self._lock:
+                self.running -= 1
+
+    def _get_semaphore(self, owner: Any) -> Optional[asyncio.Semaphore]:
+        limit = getattr(owner, 'thread_limit', None)
+
+        if limit is None:
+            return None
+
+        semaphore = self._semaphores.get(owner)
+
+        if semaphore is None:
+            semaphore = self._semaphores[owner] = asyncio.Semaphore(limit)
+
+        return semaphore
+
+
+def get_thread_offloader() -> Optional[ThreadOffloader]:
+    """
+    Returns thread offloader configured with `HANDLER_THREAD_POOL` setting (default offloader if setting is not defined)
+
+    :return: `Optional[ThreadOffloader]`
+        Thread offloader or None if sync handlers should run in the event loop thread
+    """
+
+    global _default_thread_offloader
+
+    offloader = project_settings.get('HANDLER_THREAD_POOL', _DEFAULT)
+
+    if offloader is _DEFAULT:
+        if _default_thread_offloader is None:
+            _default_thread_offloader = ThreadOffloader()
+
+        return _default_thread_offloader
+
+    if offloader is not None and not isinstance(offloader, ThreadOffloader):
+        raise TypeError("HANDLER_THREAD_POOL setting must be instance of ThreadOffloader")
+
+    return offloader
+
+
+async def run_in_thread(func: Callable, *args, owner: Any = None, **kwargs) -> Any:
+    """
+    Runs synchronous `func` with the configured thread offloader (in the event loop thread if it's disabled)
+
+    :param func: `Callable`
+        Synchronous function
+    :param owner: `Any`
+        (Optional) Owner of the handler which `thread_limit` is applied
+
+    :return: `Any`
+        Result of the function
+    """
+
+    offloader = get_thread_offloader()
+
+    if offloader is None:
+        return func(*args, **kwargs)
+
+    return await offloader.run(func, *args, owner=owner, **kwargs)
+
+
+def call_in_loop(coro: Awaitable, timeout: float = None) -> Any:
+    """
+    Runs coroutine in the event loop from a synchronous handler running in a worker thread and waits for its result
+    (e.g. `call_in_loop(message.reply("Done"))`)
+
+    :param coro: `Awaitable`
+        Coroutine
+    :param timeout: `float`
+        (Optional) Max time to wait for the result in seconds
+
+    :return: `Any`
+        Result of the coroutine
+
+    :raises:
+        :raise RuntimeError: If called outside of offloaded handler
+    """
+
+    loop = getattr(_thread_state, 'loop', None)
+
+    if loop is None:
+        coro.close()
+        raise RuntimeError("call_in_loop can be used only in handlers running in a worker thread")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def to_async_handler(func: Callable, get_owner: Callable[[Any], Any] = None) -> Callable:
+    """
+    Returns coroutine function that runs synchronous `func` with `run_in_thread`.
+    Coroutine functions are returned as is
+
+    :param func: `Callable`
+        Handler function (first argument is handler instance)
+    :param get_owner: `Callable[[Any], Any]`
+        (Optional) Function that returns owner of the handler (which `thread_limit` is applied) by its first argument
+
+    :return: `Callable`
+        Coroutine function
+
+    :raises:
+        :raise TypeError: If `func` is not callable
+    """
+
+    if inspect.iscoroutinefunction(func):
+        return func
+
+    if not callable(func):
+        raise TypeError('You can use this decorator only with functions')
+
+    @wraps(func)
+    async def wrapper(obj, *args, **kwargs):
+        owner = get_owner(obj) if get_owner is not None else None
+        return await run_in_thread(func, obj, *args, owner=owner, **kwargs)
+
+    return wrapper
+
+
+class ProcessFunction:
+    """
+    Picklable reference to a function that runs in worker processes.
+    Decorators replace module attributes of functions with handler classes, so such functions can't be pickled directly:
+    the reference is pickled by module and qualified name, and the function is found in the registry
+    that is filled when the module is imported (in a worker process too)
+    """
+
+    __slots__ = ('module', 'qualname')
+
+    def __init__(self, func: Callable) -> None:
+        """
+        Initialize the ProcessFunction instance.
+
+        :param func: `Callable`
+            Sync function defined at module level (or static method of module level class)
+
+        :raises:
+            :raise TypeError: If `func` is a coroutine function or is defined inside a function
+        """
+
+        if inspect.iscoroutinefunction(func) or not callable(func):
+            raise TypeError("Functions running in process must be sync functions")
+
+        if '<locals>' in func.__qualname__:
+            raise TypeError("Functions running in process must be defined at module level")
+
+        self.module = func.__module__
+        self.qualname = func.__qualname__
+
+        _process_functions[self.key] = func
+
+    @property
+    def key(self) -> str:
+        return f"{self.module}:{self.qualname}"
+
+    def __repr__(self) -> str:
+        return f"<ProcessFunction {self.key}>"
+
+    def __call__(self, *args, **kwargs) -> Any:
+        func = _process_functions.get(self.key)
+
+        if func is None:
+            importlib.import_module(self.module)
+            func = _process_functions[self.key]
+
+        return func(*args, **kwargs)
+
+
+def _call_in_process(func: Callable, args: tuple, kwargs: dict) -> Tuple[float, Any]:
+    return time.time(), func(*args, **kwargs)
+
+
+def _warm_up_worker(modules: Tuple[str, ...], delay: float) -> int:
+    for module in modules:
+        importlib.import_module(module)
+
+    # Keeps the worker busy, so every warm up task starts a separate process
+    time.sleep(delay)
+    return os.getpid()
+
+
+class ProcessOffloader:
+    """
+    Runs CPU-heavy handlers in a process pool, so they don't hold the GIL of the event loop process.
+    Amount of submitted tasks is bounded: when `max_workers + max_queue` tasks are submitted, handlers wait
+    until some task is finished
+
+    Notes:
+     - Functions, their arguments and results are pickled
+     - Worker processes are started (and `preload` modules are imported in them) on `start`,
+       so the first handlers don't wait for process start
+    """
+
+    def __init__(self,
+                 max_workers: int = None,
+                 max_queue: int = None,
+                 preload: Iterable[str] = None,
+                 start_method: str = None) -> None:
+        """
+        Initialize the ProcessOffloader instance.
+
+        :param max_workers: `int`
+            (Optional) Amount of worker processes. Defaults to `HANDLER_PROCESSES` setting (amount of CPUs)
+        :param max_queue: `int`
+            (Optional) Max amount of tasks waiting for a worker. Defaults to `HANDLER_PROCESS_QUEUE` setting
+            (two tasks per worker)
+        :param preload: `Iterable[str]`
+            (Optional) Modules imported in workers on start. Defaults to `HANDLER_PROCESS_PRELOAD` setting
+        :param start_method: `str`
+            (Optional) Multiprocessing start method ('fork', 'spawn' or 'forkserver').
+            Defaults to `HANDLER_PROCESS_START_METHOD` setting (platform default)
+        """
+
+        self.max_workers = default(max_workers, project_settings.get('HANDLER_PROCESSES', None)) or os.cpu_count() or 1
+        self.max_queue = default(max_queue, project_settings.get('HANDLER_PROCESS_QUEUE', self.max_workers * 2))
+        self.preload = tuple(default(preload, project_settings.get('HANDLER_PROCESS_PRELOAD', ())))
+        self.start_method = default(start_method, project_settings.get('HANDLER_PROCESS_START_METHOD', None))
+
+        self.waiting = 0  # Handlers waiting for a place in the bounded queue
+        self.submitted = 0
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._started: Optional[asyncio.Task] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            context = multiprocessing.get_context(self.start_method) if self.start_method is not None else None
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+        return self._pool
+
+    @property
+    def queued(self) -> int:
+        return self.waiting + max(0, self.submitted - self.max_workers)
+
+    @property
+    def running(self) -> int:
+        return min(self.submitted, self.max_workers)
+
+    async def start(self) -> None:
+        """
+        Starts worker processes and imports `preload` modules in them. Can be called several times
+        """
+
+        if self._started is None:
+            self._started = asyncio.create_task(self._warm_up())
+
+        await asyncio.shield(self._started)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs `func` in a worker process and returns its result
+
+        :param func: `Callable`
+            Picklable sync function (module level function or `ProcessFunction`)
+
+        :return: `Any`
+            Result of the function
+
+        :raises:
+            :raise BrokenProcessPool: If a worker process was terminated (the pool is recreated for the next tasks)
+        """
+
+        loop = asyncio.get_running_loop()
+        slots = self._get_slots()
+
+        self.waiting += 1
+
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.submitted += 1
+        submitted_at = time.time()
+        pool = self.pool
+
+        def release() -> None:
+            self.submitted -= 1
+            slots.release()
+
+        try:
+            future = pool.submit(_call_in_process, func, args, kwargs)
+        except BaseException:
+            release()
+            raise
+
+        try:
+            started_at, result = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            if self._pool is pool:
+                logger.error("Handler process pool is broken (a worker was terminated), recreating it")
+                self._reset_pool()
+
+            raise
+        finally:
+            _release_when_done(future, loop, release)
+
+        if (metrics := get_metrics()) is not None:
+            metrics.offload_wait.labels('process').observe(max(0.0, started_at - submitted_at))
+
+        return result
+
+    async def close(self) -> None:
+        """
+        Stops worker processes (running tasks are finished, queued are cancelled)
+        """
+
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+        self._started = None
+
+    async def _warm_up(self) -> None:
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+
+        pids = await asyncio.gather(*[
+            loop.run_in_executor(self.pool, _warm_up_worker, self.preload, 0.1) for _ in range(self.max_workers)
+        ])
+
+        logger.info("Started %s handler processes in %.2fs", len(set(pids)), time.perf_counter() - started_at)
+
+    def _reset_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        self._started = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+        return self._slots
+
+
+def get_process_offloader() -> Optional[ProcessOffloader]:
+    """
+    Returns process offloader configured with `HANDLER_PROCESS_POOL` setting (default offloader if setting is not defined)
+
+    :return: `Optional[ProcessOffloader]`
+        Process offloader or None if process handlers should run in the handler thread pool
+    """
+
+    global _default_process_offloader
+
+    offloader = project_settings.get('HANDLER_PROCESS_POOL', _DEFAULT)
+
+    if offloader is _DEFAULT:
+        if _default_process_offloader is None:
+            _default_process_offloader = ProcessOffloader()
+
+        return _default_process_offloader
+
+    if offloader is not None and not isinstance(offloader, ProcessOffloader):
+        raise TypeError("HANDLER_PROCESS_POOL setting must be instance of ProcessOffloader")
+
+    return offloader
+
+
+async def run_in_process(func: Callable, *args, **kwargs) -> Any:
+    """
+    Runs picklable sync `func` with the configured process offloader (in the handler thread pool if it's disabled)
+
+    :param func: `Callable`
+        Picklable sync function
+
+    :return: `Any`
+        Result of the function
+    """
+
+    offloader = get_process_offloader()
+
+    if offloader is None:
+        return await run_in_thread(func, *args, **kwargs)
+
+    return await offloader.run(func, *args, **kwargs)
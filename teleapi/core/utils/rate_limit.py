@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Asynchronous token bucket rate limiter
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Initialize the RateLimiter instance.
+
+        :param rate: `float`
+            Maximum amount of acquisitions per second
+
+        :param burst: `int`
+            Maximum amount of acquisitions that can be made at once after idle period
+        """
+
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        """
+        Acquires a token without waiting
+
+        :return: `bool`
+            True if token was acquired
+        """
+
+        now = time.monotonic()
+
+        if now < self._paused_until:
+            return False
+
+        self._refill(now)
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+
+        return False
+
+    def delay(self) -> float:
+        """
+        Returns time in seconds after which a token can be available
+
+        :return: `float`
+            Delay in seconds
+        """
+
+        now = time.monotonic()
+
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        self._refill(now)
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and acquires it
+        """
+
+        while not self.try_acquire():
+            await asyncio.sleep(self.delay())
+
+    def pause(self, seconds: float) -> None:
+        """
+        Forbids acquisitions for specified time (e.g. after `429 Too Many Requests` response)
+
+        :param seconds: `float`
+            Pause duration in seconds
+        """
+
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._updated_at = self._paused_until
+        self._tokens = 0.0
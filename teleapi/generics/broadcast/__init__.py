@@ -0,0 +1,2 @@
+from .broadcast import Broadcast
+from .result import BroadcastResult, BroadcastStatus
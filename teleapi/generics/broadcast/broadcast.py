@@ -0,0 +1,452 @@
+import asyncio
+import base64
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import aiohttp
+
+from teleapi.core.http.exceptions import ApiRequestError, BadRequest, CircuitOpenError, DeadlineExceededError, Forbidden, \
+    HttpError, TooManyRequests, Unauthorized
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.request.api_request import method_request
+from teleapi.core.http.request.scheduler import RequestPriority
+from teleapi.core.state.settings import project_settings
+from teleapi.core.utils.collections import clear_none_values
+from teleapi.core.utils.json_codec import get_json_codec
+from teleapi.core.utils.rate_limit import RateLimiter
+from teleapi.core.utils.syntax import default
+from teleapi.enums.parse_mode import ParseMode
+from teleapi.generics.http.methods.messages.utils import get_converted_reply_markup
+from teleapi.types.message_entity import MessageEntity, MessageEntitySerializer
+from .result import BroadcastResult, BroadcastStatus
+
+logger = logging.getLogger(__name__)
+
+
+class Broadcast:
+    """
+    Sends the same message to many chats.
+
+    Request body is serialized once, only `chat_id` is substituted for every chat.
+    Requests are sent by `concurrency` workers, their rate is limited with `rate` requests per second
+    (see `BROADCAST_RATE` and `BROADCAST_CONCURRENCY` settings).
+
+    Notes:
+     - `429 Too Many Requests` pauses all workers for `retry_after` seconds, request is retried
+     - Chats that blocked the bot, deactivated users, migrated and not found chats are not retried
+     - Only transient errors (5xx responses, connection errors and timeouts) are retried,
+       other API errors mark the chat as failed
+     - `401 Unauthorized` aborts the broadcast (every other request would fail too)
+     - If `checkpoint_path` is specified, progress is saved periodically and broadcast is resumed from it on the next run
+    """
+
+    CHECKPOINT_VERSION: int = 1
+
+    def __init__(self,
+                 chat_ids: Sequence[Union[int, str]],
+                 method: APIMethod,
+                 payload: Dict[str, Any],
+                 rate: float = None,
+                 concurrency: int = None,
+                 checkpoint_path: str = None,
+                 checkpoint_interval: float = 5,
+                 max_retries: int = 3,
+                 follow_migrations: bool = True,
+                 token: str = None
+                 ) -> None:
+        """
+        Initialize the Broadcast instance.
+
+        :param chat_ids: `Sequence[Union[int, str]]`
+            Ids of chats the message is sent to
+
+        :param method: `APIMethod`
+            The API method used to send the message (e.g. `APIMethod.SEND_MESSAGE` or `APIMethod.COPY_MESSAGE`)
+
+        :param payload: `Dict[str, Any]`
+            Request parameters except `chat_id`
+
+        :param rate: `float`
+            (Optional) Maximum amount of requests per second. Defaults to `BROADCAST_RATE` setting (25)
+
+        :param concurrency: `int`
+            (Optional) Maximum amount of requests in flight. Defaults to `BROADCAST_CONCURRENCY` setting (16)
+
+        :param checkpoint_path: `str`
+            (Optional) Path of the JSON file the progress is saved to
+
+        :param checkpoint_interval: `float`
+            (Optional) Interval in seconds between checkpoints
+
+        :param max_retries: `int`
+            (Optional) Maximum amount of retries after network and server errors
+
+        :param follow_migrations: `bool`
+            (Optional) Whether to resend the message to the supergroup if group was migrated
+
+        :param token: `str`
+            (Optional) The bot token. Defaults to `API_TOKEN` setting
+        """
+
+        self.chat_ids = chat_ids
+        self.method = method
+        self.payload = payload
+        self.rate = default(rate, project_settings.get('BROADCAST_RATE', 25))
+        self.concurrency = max(1, default(concurrency, project_settings.get('BROADCAST_CONCURRENCY', 16)))
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.max_retries = max_retries
+        self.follow_migrations = follow_migrations
+        self.token = token
+
+        self.result = BroadcastResult(chat_ids, bytearray(len(chat_ids)), {})
+
+        self._limiter = RateLimiter(self.rate, burst=self.concurrency)
+        self._body_tail: Optional[bytes] = None
+
+    @classmethod
+    def send_message(cls,
+                     chat_ids: Sequence[Union[int, str]],
+                     text: str,
+                     parse_mode: ParseMode = ParseMode.NONE,
+                     entities: List[MessageEntity] = None,
+                     disable_web_page_preview: bool = None,
+                     disable_notification: bool = None,
+                     protect_content: bool = None,
+                     reply_markup: Any = None,
+                     **kwargs
+                     ) -> 'Broadcast':
+        """
+        Makes broadcast of text message
+
+        :param chat_ids: `Sequence[Union[int, str]]`
+            Ids of chats the message is sent to
+
+        :param text: `str`
+            The text of the message
+
+        :param parse_mode: `ParseMode`
+            (Optional) The mode for parsing entities in the message text
+
+        :param entities: `List[MessageEntity]`
+            (Optional) List of special entities that appear in the message text
+
+        :param disable_web_page_preview: `bool`
+            (Optional) Disable web page previews for links in the message
+
+        :param disable_notification: `bool`
+            (Optional) Sends the message silently
+
+        :param protect_content: `bool`
+            (Optional) Protects the contents of the sent message from forwarding and saving
+
+        :param reply_markup: `Union[InlineKeyboardMarkup, ReplyKeyboardMarkup, ReplyKeyboardRemove, ForceReply, dict]`
+            (Optional) Additional interface options
+
+        :param kwargs: `dict`
+            Other parameters of `Broadcast` constructor
+
+        :return: `Broadcast`
+            The broadcast
+        """
+
+        return cls(chat_ids, APIMethod.SEND_MESSAGE, {
+            "text": text,
+            "parse_mode": parse_mode.value,
+            "entities": MessageEntitySerializer().serialize(
+                obj=entities, many=True, keep_none_fields=False
+            ) if entities is not None else None,
+            "disable_web_page_preview": disable_web_page_preview,
+            "disable_notification": disable_notification,
+            "protect_content": protect_content,
+            "reply_markup": reply_markup
+        }, **kwargs)
+
+    @classmethod
+    def copy_message(cls,
+                     chat_ids: Sequence[Union[int, str]],
+                     from_chat_id: Union[int, str],
+                     message_id: int,
+                     caption: str = None,
+                     parse_mode: ParseMode = ParseMode.NONE,
+                     caption_entities: List[MessageEntity] = None,
+                     disable_notification: bool = None,
+                     protect_content: bool = None,
+                     reply_markup: Any = None,
+                     **kwargs
+                     ) -> 'Broadcast':
+        """
+        Makes broadcast of existing message copies (message of any type can be broadcast this way)
+
+        :param chat_ids: `Sequence[Union[int, str]]`
+            Ids of chats the message is sent to
+
+        :param from_chat_id: `Union[int, str]`
+            Id of the chat the original message was sent to
+
+        :param message_id: `int`
+            Id of the original message
+
+        :param caption: `str`
+            (Optional) New caption of the media
+
+        :param parse_mode: `ParseMode`
+            (Optional) The mode for parsing entities in the new caption
+
+        :param caption_entities: `List[MessageEntity]`
+            (Optional) List of special entities that appear in the new caption
+
+        :param disable_notification: `bool`
+            (Optional) Sends the message silently
+
+        :param protect_content: `bool`
+            (Optional) Protects the contents of the sent message from forwarding and saving
+
+        :param reply_markup: `Union[InlineKeyboardMarkup, ReplyKeyboardMarkup, ReplyKeyboardRemove, ForceReply, dict]`
+            (Optional) Additional interface options
+
+        :param kwargs: `dict`
+            Other parameters of `Broadcast` constructor
+
+        :return: `Broadcast`
+            The broadcast
+        """
+
+        return cls(chat_ids, APIMethod.COPY_MESSAGE, {
+            "from_chat_id": from_chat_id,
+            "message_id": message_id,
+            "caption": caption,
+            "parse_mode": parse_mode.value,
+            "caption_entities": MessageEntitySerializer().serialize(
+                obj=caption_entities, many=True, keep_none_fields=False
+            ) if caption_entities is not None else None,
+            "disable_notification": disable_notification,
+            "protect_content": protect_content,
+            "reply_markup": reply_markup
+        }, **kwargs)
+
+    @property
+    def done(self) -> int:
+        return len(self.result) - self.result.count(BroadcastStatus.PENDING)
+
+    async def prepare(self) -> None:
+        """
+        Serializes request body (without `chat_id`)
+        """
+
+        payload = dict(self.payload)
+        payload.pop("chat_id", None)
+        payload["reply_markup"] = await get_converted_reply_markup(payload.get("reply_markup"))
+
+        body = get_json_codec().dumps(clear_none_values(payload))
+        self._body_tail = b',' + body[1:] if body != b'{}' else b'}'
+
+    def make_body(self, chat_id: Union[int, str]) -> bytes:
+        """
+        Makes request body for the chat
+
+        :param chat_id: `Union[int, str]`
+            Chat id
+
+        :return: `bytes`
+            JSON request body
+        """
+
+        return b'{"chat_id":' + get_json_codec().dumps(chat_id) + self._body_tail
+
+    async def run(self) -> BroadcastResult:
+        """
+        Runs the broadcast (or resumes it from the checkpoint)
+
+        :return: `BroadcastResult`
+            Delivery results
+
+        :raises:
+            :raise Unauthorized: If the bot token is invalid. Progress is saved to checkpoint before
+        """
+
+        await self.prepare()
+
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            await asyncio.to_thread(self.load_checkpoint)
+            logger.info(f"Resuming broadcast from checkpoint: {self.done}/{len(self.result)} chats done")
+
+        statuses = self.result.statuses
+        indices = (i for i in range(len(statuses)) if statuses[i] == BroadcastStatus.PENDING)
+        checkpoint_task = asyncio.create_task(self._checkpoint_loop()) if self.checkpoint_path is not None else None
+
+        workers = [asyncio.create_task(self._worker(indices)) for _ in range(self.concurrency)]
+
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            if checkpoint_task is not None:
+                checkpoint_task.cancel()
+                await asyncio.to_thread(self.save_checkpoint, self.dump())
+
+        logger.info(f"Broadcast finished: {self.result}")
+        return self.result
+
+    async def _worker(self, indices) -> None:
+        for index in indices:
+            self.result.statuses[index] = await self._deliver(self.chat_ids[index])
+
+    async def _deliver(self, chat_id: Union[int, str]) -> BroadcastStatus:
+        original_chat_id = chat_id
+        retries = 0
+
+        while True:
+            await self._limiter.acquire()
+
+            try:
+                await method_request(
+                    "POST", self.method, token=self.token, priority=RequestPriority.BULK,
+                    data=self.make_body(chat_id), headers={'Content-Type': 'application/json'}
+                )
+                return BroadcastStatus.SENT if chat_id == original_chat_id else BroadcastStatus.MIGRATED
+            except TooManyRequests as error:
+                self._limiter.pause(self._get_parameter(error, 'retry_after', 1))
+            except CircuitOpenError as error:
+                self._limiter.pause(max(1.0, default(error.retry_after, 0)))
+            except Forbidden as error:
+                description = self._get_description(error)
+
+                if "blocked" in description:
+                    return BroadcastStatus.BLOCKED
+                if "deactivated" in description:
+                    return BroadcastStatus.DEACTIVATED
+
+                return BroadcastStatus.FORBIDDEN
+            except BadRequest as error:
+                migrate_to_chat_id = self._get_parameter(error, 'migrate_to_chat_id')
+
+                if migrate_to_chat_id is not None:
+                    self.result.migrated[original_chat_id] = migrate_to_chat_id
+
+                    if not self.follow_migrations or migrate_to_chat_id == chat_id:
+                        return BroadcastStatus.MIGRATED
+
+                    chat_id = migrate_to_chat_id
+                    continue
+
+                if "chat not found" in self._get_description(error):
+                    return BroadcastStatus.CHAT_NOT_FOUND
+
+                logger.warning(f"Failed to broadcast message to chat {chat_id}: {error}")
+                return BroadcastStatus.FAILED
+            except DeadlineExceededError as error:
+                # Deadline of the caller is shared by all chats, so retries would fail too
+                logger.warning(f"Failed to broadcast message to chat {chat_id}: {error}")
+                return BroadcastStatus.FAILED
+            except Unauthorized as error:
+                logger.error(f"Broadcast is aborted, bot token is invalid: {error}")
+                raise
+            except (HttpError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if not self._is_transient(error):
+                    logger.warning(f"Failed to broadcast message to chat {chat_id}: {error.__class__.__name__}: {error}")
+                    return BroadcastStatus.FAILED
+
+                retries += 1
+
+                if retries > self.max_retries:
+                    logger.warning(f"Failed to broadcast message to chat {chat_id}: {error.__class__.__name__}: {error}")
+                    return BroadcastStatus.FAILED
+
+                await asyncio.sleep(min(2 ** retries, 30))
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, ApiRequestError):
+            return getattr(error.response, 'status', error.status_code) >= 500
+
+        return not isinstance(error, HttpError)
+
+    @staticmethod
+    def _get_description(error: ApiRequestError) -> str:
+        return str((error.data or {}).get('description', '')).lower()
+
+    @staticmethod
+    def _get_parameter(error: ApiRequestError, name: str, default_value: Any = None) -> Any:
+        return ((error.data or {}).get('parameters') or {}).get(name, default_value)
+
+    def dump(self) -> Dict[str, Any]:
+        """
+        Returns checkpoint of the broadcast
+
+        :return: `dict`
+            JSON-serializable checkpoint
+        """
+
+        return {
+            'version': self.__class__.CHECKPOINT_VERSION,
+            'method': self.method.value,
+            'total': len(self.result),
+            'statuses': base64.b64encode(self.result.statuses).decode(),
+            'migrated': [[chat_id, new_chat_id] for chat_id, new_chat_id in self.result.migrated.items()]
+        }
+
+    def restore(self, checkpoint: Dict[str, Any]) -> None:
+        """
+        Restores progress from checkpoint
+
+        :param checkpoint: `dict`
+            Checkpoint made by `dump`
+
+        :raises:
+            :raise ValueError: If checkpoint version is not supported or checkpoint was made for another broadcast
+        """
+
+        if checkpoint.get('version') != self.__class__.CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported broadcast checkpoint version: {checkpoint.get('version')}")
+
+        if checkpoint['total'] != len(self.result) or checkpoint['method'] != self.method.value:
+            raise ValueError("Checkpoint was made for another broadcast")
+
+        self.result.statuses[:] = base64.b64decode(checkpoint['statuses'])
+        self.result.migrated.update({chat_id: new_chat_id for chat_id, new_chat_id in checkpoint['migrated']})
+
+    def save_checkpoint(self, checkpoint: Dict[str, Any] = None) -> None:
+        """
+        Saves checkpoint to `checkpoint_path`
+
+        :param checkpoint: `dict`
+            (Optional) Checkpoint to be saved. If None, makes new checkpoint
+        """
+
+        if self.checkpoint_path is None:
+            raise ValueError("checkpoint_path was not specified")
+
+        checkpoint = checkpoint if checkpoint is not None else self.dump()
+        tmp_path = f"{self.checkpoint_path}.tmp"
+
+        with open(tmp_path, "wb") as file:
+            file.write(get_json_codec().dumps(checkpoint))
+
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def load_checkpoint(self) -> None:
+        """
+        Loads progress from `checkpoint_path`
+        """
+
+        if self.checkpoint_path is None:
+            raise ValueError("checkpoint_path was not specified")
+
+        with open(self.checkpoint_path, "rb") as file:
+            self.restore(get_json_codec().loads(file.read()))
+
+    async def _checkpoint_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+
+            try:
+                await asyncio.to_thread(self.save_checkpoint, self.dump())
+            except Exception as error:
+                logger.error(f"Failed to save broadcast checkpoint: {error.__class__.__name__}: {error}")
@@ -0,0 +1,76 @@
+from enum import IntEnum
+from typing import Dict, List, Sequence, Union
+
+
+class BroadcastStatus(IntEnum):
+    PENDING = 0
+    SENT = 1
+    BLOCKED = 2  # Bot was blocked by the user
+    DEACTIVATED = 3  # User is deactivated
+    MIGRATED = 4  # Group was upgraded to a supergroup (see BroadcastResult.migrated)
+    CHAT_NOT_FOUND = 5
+    FORBIDDEN = 6  # Bot was kicked from the chat or can't write to it
+    FAILED = 7
+
+
+class BroadcastResult:
+    """
+    Delivery results of the broadcast. Statuses are stored as one byte per chat
+    """
+
+    def __init__(self, chat_ids: Sequence[Union[int, str]], statuses: bytearray, migrated: Dict[Union[int, str], int]) -> None:
+        """
+        Initialize the BroadcastResult instance.
+
+        :param chat_ids: `Sequence[Union[int, str]]`
+            Chat ids of the broadcast
+
+        :param statuses: `bytearray`
+            `BroadcastStatus` of every chat (in the same order as `chat_ids`)
+
+        :param migrated: `Dict[Union[int, str], int]`
+            Old chat id -> new chat id of migrated chats
+        """
+
+        self.chat_ids = chat_ids
+        self.statuses = statuses
+        self.migrated = migrated
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__name__} [{'; '.join(f'{name}[{count}]' for name, count in self.summary().items())}]>"
+
+    @property
+    def is_complete(self) -> bool:
+        return BroadcastStatus.PENDING not in self.statuses
+
+    def get_status(self, index: int) -> BroadcastStatus:
+        return BroadcastStatus(self.statuses[index])
+
+    def count(self, status: BroadcastStatus) -> int:
+        return self.statuses.count(status)
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Returns amount of chats with every status
+
+        :return: `Dict[str, int]`
+            Status name -> amount of chats
+        """
+
+        return {status.name.lower(): self.count(status) for status in BroadcastStatus if self.count(status) != 0}
+
+    def get_chat_ids(self, status: BroadcastStatus) -> List[Union[int, str]]:
+        """
+        Returns ids of chats with specified status
+
+        :param status: `BroadcastStatus`
+            Delivery status
+
+        :return: `List[Union[int, str]]`
+            Chat ids
+        """
+
+        return [chat_id for chat_id, chat_status in zip(self.chat_ids, self.statuses) if chat_status == status]
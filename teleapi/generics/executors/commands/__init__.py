@@ -0,0 +1 @@
+from .profile import ProfileCommand
@@ -0,0 +1,53 @@
+import asyncio
+import os
+from typing import List
+
+from teleapi.core.executors.commands import Command
+from teleapi.core.profiling import get_profiling_controller, parse_profile_args
+from teleapi.core.state.settings import project_settings
+from teleapi.types.message import Message
+
+
+class ProfileCommand(Command):
+    """
+    Admin command that profiles the running bot: /profile <cpu|sample|memory> [seconds]
+    Only users from `PROFILING_ADMINS` setting (list of user ids) can use it. Report is sent back as a document
+
+    Notes:
+     - Add it to `__executor_commands__` of an executor to enable it
+    """
+
+    class Meta:
+        name = "profile"
+        # Sessions can be longer than handler timeout
+        timeout = None
+
+    async def execute(self, message: Message, parameters: List[str] = None, **kwargs) -> None:
+        if message.author is None or message.author.id not in project_settings.get('PROFILING_ADMINS', []):
+            return
+
+        if (controller := get_profiling_controller()) is None:
+            await message.reply("Profiling is disabled")
+            return
+
+        try:
+            kind, duration = parse_profile_args(parameters or ['sample'])
+        except ValueError as error:
+            await message.reply(f"Usage: /profile <cpu|sample|memory> [seconds] ({error})")
+            return
+
+        await message.reply(f"Profiling ({kind.value}) for {duration or controller.duration}s...")
+
+        try:
+            path = await controller.profile(kind, duration)
+        except RuntimeError as error:
+            await message.reply(str(error))
+            return
+
+        report = await asyncio.to_thread(read_file, path)
+        await message.reply_document(report, filename=os.path.basename(path), caption=path)
+
+
+def read_file(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
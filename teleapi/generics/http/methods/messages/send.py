@@ -9,7 +9,7 @@ from teleapi.core.exceptions.generics import FileTooLargeError, InvalidParameter
 from teleapi.core.http.request.api_method import APIMethod
 from teleapi.core.http.request.api_request import method_request
 from teleapi.core.utils.collections import clear_none_values, exclude_from_dict
-from teleapi.core.utils.files import get_file
+from teleapi.core.utils.files import get_input_file
 from teleapi.core.utils.syntax import default
 from teleapi.enums.parse_mode import ParseMode
 from teleapi.generics.http.methods.utils import make_form_data
@@ -201,7 +201,7 @@ async def send_photo(photo: Union[bytes, str],
     """
 
     if isinstance(photo, str):  # FIXME
-        filename, photo = get_file(photo)
+        filename, photo = get_input_file(photo)
 
         if (len(photo) // 1024) // 1024 > 10:
             raise FileTooLargeError(
@@ -283,9 +283,9 @@ async def send_audio(audio: Union[bytes, str],
     """
 
     if isinstance(audio, str) and os.path.exists(audio):
-        filename, audio = get_file(audio)
+        filename, audio = get_input_file(audio)
     if isinstance(thumbnail, str) and os.path.exists(thumbnail):
-        _, thumbnail = get_file(thumbnail)
+        _, thumbnail = get_input_file(thumbnail)
 
         if len(thumbnail) // 1024 > 200:
             raise FileTooLargeError(
@@ -362,14 +362,14 @@ async def send_document(document: Union[bytes, str],
     """
 
     if isinstance(document, str) and os.path.exists(document):
-        filename, document = get_file(document)
+        filename, document = get_input_file(document)
 
         if (len(document) // 1024) // 1024 > 50:
             raise FileTooLargeError(
                 f"Specified document must be less than 50MB in size, got {(len(document) // 1024) // 1024}kB")
 
     if isinstance(thumbnail, str) and os.path.exists(thumbnail):
-        _, thumbnail = get_file(thumbnail)
+        _, thumbnail = get_input_file(thumbnail)
 
         if len(thumbnail) // 1024 > 200:
             raise FileTooLargeError(
@@ -463,9 +463,9 @@ async def send_video(video: Union[bytes, str],
     """
 
     if isinstance(video, str) and os.path.exists(video):
-        filename, video = get_file(video)
+        filename, video = get_input_file(video)
     if isinstance(thumbnail, str) and os.path.exists(video):
-        _, thumbnail = get_file(thumbnail)
+        _, thumbnail = get_input_file(thumbnail)
 
         if len(thumbnail) // 1024 > 200:
             raise FileTooLargeError(
@@ -553,9 +553,9 @@ async def send_animation(animation: Union[bytes, str],
     """
 
     if isinstance(animation, str) and os.path.exists(animation):
-        filename, animation = get_file(animation)
+        filename, animation = get_input_file(animation)
     if isinstance(thumbnail, str) and os.path.exists(thumbnail):
-        _, thumbnail = get_file(thumbnail)
+        _, thumbnail = get_input_file(thumbnail)
 
         if len(thumbnail) // 1024 > 200:
             raise FileTooLargeError(
@@ -615,7 +615,7 @@ async def send_voice(voice: Union[bytes, str],
     """
 
     if isinstance(voice, str) and os.path.exists(voice):
-        _, voice = get_file(voice)
+        _, voice = get_input_file(voice)
 
     parse_mode = parse_mode.value
     caption_entities = MessageEntitySerializer().serialize(
@@ -657,7 +657,7 @@ async def send_video_note(video_note: Union[bytes, str],
     """
 
     if isinstance(video_note, str) and os.path.exists(video_note):
-        _, video_note = get_file(video_note)
+        _, video_note = get_input_file(video_note)
 
     return await send(
         method=APIMethod.SEND_VIDEO_NOTE,
@@ -907,7 +907,7 @@ async def send_sticker(sticker: Union[str, bytes], emoji: str = None, **kwargs)
     """
 
     if isinstance(sticker, str) and os.path.exists(sticker):
-        _, sticker = get_file(sticker)
+        _, sticker = get_input_file(sticker)
 
     form_data = FormData()
     form_data.add_field('sticker', sticker)
@@ -1,7 +1,8 @@
-import json
 from typing import Any, Dict
 from aiohttp import FormData
 
+from teleapi.core.utils.json_codec import get_json_codec
+
 
 def prepare_field(value: Any) -> str:
     """
@@ -15,7 +16,7 @@ def prepare_field(value: Any) -> str:
     """
 
     try:
-        return value if isinstance(value, (str, bytes)) else json.dumps(value)
+        return value if isinstance(value, (str, bytes)) else get_json_codec().dumps_str(value)
     except Exception as error:
         raise ValueError(f"Unable to serialize {value}") from error
 
@@ -1,8 +1,10 @@
 import asyncio
+import time
 from typing import List
 
 from teleapi.core.http.request import method_request
 from teleapi.core.http.updaters import BaseUpdater
+from teleapi.core.metrics.instruments import get_metrics
 from teleapi.types.update.obj import Update
 from teleapi.types.update.serializer import UpdateSerializer
 from teleapi.core.http.request import APIMethod
@@ -59,8 +61,12 @@ class LongPollingUpdater(BaseUpdater):
             attempt = 0
 
             try:
+                started_at = time.perf_counter()
                 response, data = await method_request('GET', APIMethod.GET_UPDATES, params=params)
 
+                if (metrics := get_metrics()) is not None:
+                    metrics.observe_poll(time.perf_counter() - started_at, len(data['result']))
+
                 if len(data['result']) == 0:
                     return []
 
@@ -0,0 +1 @@
+from .fake_server import FakeBotApiServer, TELEGRAM_GLOBAL_RATE, TELEGRAM_CHAT_RATE, TELEGRAM_GROUP_RATE
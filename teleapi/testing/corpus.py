@@ -0,0 +1,294 @@
+"""
+Curated corpus of real-world Telegram Bot API JSON (updates, method results, input media) used by serializer benchmarks.
+Unlike `payloads`, entries are static and cover rarely used fields (service messages, forwards, albums, member changes)
+"""
+from typing import Any, Dict
+
+BOT = {
+    "id": 5000000000, "is_bot": True, "first_name": "Teleapi Bot", "username": "teleapi_bot",
+    "can_join_groups": True, "can_read_all_group_messages": False, "supports_inline_queries": False
+}
+USER = {
+    "id": 281234567, "is_bot": False, "first_name": "Анна", "last_name": "Smith", "username": "anna_smith",
+    "language_code": "ru", "is_premium": True
+}
+OTHER_USER = {"id": 395123456, "is_bot": False, "first_name": "Max", "language_code": "en"}
+PRIVATE_CHAT = {"id": 281234567, "first_name": "Анна", "last_name": "Smith", "username": "anna_smith", "type": "private"}
+GROUP_CHAT = {"id": -1001765432109, "title": "Teleapi Community 🚀", "username": "teleapi_chat", "type": "supergroup", "is_forum": True}
+CHANNEL_CHAT = {"id": -1001234567890, "title": "Teleapi News", "username": "teleapi_news", "type": "channel"}
+
+PHOTO_SIZES = [
+    {"file_id": "AgACAgIAAxkBAAIBZ2VkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAQMAA3MAAzME", "file_unique_id": "AQADZ2VkYWJjZGVmAANz",
+     "file_size": 1432, "width": 90, "height": 68},
+    {"file_id": "AgACAgIAAxkBAAIBZ2VkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAQMAA20AAzME", "file_unique_id": "AQADZ2VkYWJjZGVmAANy",
+     "file_size": 21087, "width": 320, "height": 240},
+    {"file_id": "AgACAgIAAxkBAAIBZ2VkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAQMAA3gAAzME", "file_unique_id": "AQADZ2VkYWJjZGVmAAN4",
+     "file_size": 98653, "width": 800, "height": 600},
+    {"file_id": "AgACAgIAAxkBAAIBZ2VkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAQMAA3kAAzME", "file_unique_id": "AQADZ2VkYWJjZGVmAAN5",
+     "file_size": 187316, "width": 1280, "height": 960}
+]
+THUMBNAIL = {"file_id": "AAMCAgADGQEAAgFnZWRhYmNkZWYAAfRmQ29tbW9uRmlsZUlkcwABbQADMwQ", "file_unique_id": "AQADbQADMwQ",
+             "file_size": 5644, "width": 320, "height": 180}
+INLINE_KEYBOARD = {
+    "inline_keyboard": [
+        [{"text": "✅ Confirm", "callback_data": "[ab12c=cd34e]"}, {"text": "❌ Cancel", "callback_data": "[ab12c=ef56g]"}],
+        [{"text": "Open docs", "url": "https://example.com/docs"}]
+    ]
+}
+
+
+def _message(message_id: int, chat: Dict[str, Any] = None, author: Dict[str, Any] = None, **fields) -> Dict[str, Any]:
+    message = {"message_id": message_id, "from": author or USER, "chat": chat or PRIVATE_CHAT, "date": 1700000000 + message_id}
+    message.update(fields)
+    return message
+
+
+TEXT_MESSAGE = _message(
+    1201, text="Hi @teleapi_bot! Please check https://example.com/order/1234 — it's *urgent*",
+    entities=[
+        {"offset": 3, "length": 12, "type": "mention"},
+        {"offset": 29, "length": 30, "type": "url"},
+        {"offset": 66, "length": 8, "type": "bold"}
+    ]
+)
+GROUP_COMMAND_MESSAGE = _message(
+    88412, chat=GROUP_CHAT, text="/report@teleapi_bot weekly", message_thread_id=88001, is_topic_message=True,
+    entities=[{"offset": 0, "length": 19, "type": "bot_command"}]
+)
+REPLY_MESSAGE = _message(
+    88415, chat=GROUP_CHAT, author=OTHER_USER, text="Agreed, let's ship it",
+    reply_to_message=_message(
+        88410, chat=GROUP_CHAT, text="Release is ready for review", entities=[{"offset": 0, "length": 7, "type": "italic"}]
+    )
+)
+PHOTO_MESSAGE = _message(
+    1202, photo=PHOTO_SIZES, caption="Screenshot of the error 👇 see logs",
+    caption_entities=[{"offset": 29, "length": 4, "type": "code"}]
+)
+ALBUM_MESSAGES = [
+    _message(1203 + index, chat=GROUP_CHAT, media_group_id="13601934845739162", photo=PHOTO_SIZES,
+             **({"caption": "Photos from the meetup"} if index == 0 else {}))
+    for index in range(3)
+]
+DOCUMENT_MESSAGE = _message(
+    1206, document={
+        "file_name": "report-2023-11.pdf", "mime_type": "application/pdf", "thumbnail": THUMBNAIL,
+        "file_id": "BQACAgIAAxkBAAIBaGVkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAj4uAAIzBA", "file_unique_id": "AgADPi4AAjME",
+        "file_size": 482113
+    }, caption="Monthly report"
+)
+VIDEO_MESSAGE = _message(
+    1207, video={
+        "duration": 17, "width": 1280, "height": 720, "file_name": "demo.mp4", "mime_type": "video/mp4", "thumbnail": THUMBNAIL,
+        "file_id": "BAACAgIAAxkBAAIBaWVkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAj8uAAIzBA", "file_unique_id": "AgADPy4AAjME",
+        "file_size": 3145728
+    }
+)
+VOICE_MESSAGE = _message(
+    1208, voice={
+        "duration": 4, "mime_type": "audio/ogg",
+        "file_id": "AwACAgIAAxkBAAIBamVkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAkAuAAIzBA", "file_unique_id": "AgADQC4AAjME",
+        "file_size": 16384
+    }
+)
+ANIMATION_MESSAGE = _message(
+    1209, animation={
+        "file_name": "party.mp4", "mime_type": "video/mp4", "duration": 3, "width": 320, "height": 240, "thumbnail": THUMBNAIL,
+        "file_id": "CgACAgIAAxkBAAIBa2VkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAkEuAAIzBA", "file_unique_id": "AgADQS4AAjME",
+        "file_size": 204800
+    }, document={
+        "file_name": "party.mp4", "mime_type": "video/mp4", "thumbnail": THUMBNAIL,
+        "file_id": "CgACAgIAAxkBAAIBa2VkYWJjZGVmAAH0ZkNvbW1vbkZpbGVJZHMAAkEuAAIzBA", "file_unique_id": "AgADQS4AAjME",
+        "file_size": 204800
+    }
+)
+LOCATION_MESSAGE = _message(1210, location={"latitude": 55.751244, "longitude": 37.618423, "horizontal_accuracy": 12.5})
+CONTACT_MESSAGE = _message(1211, contact={"phone_number": "+79001234567", "first_name": "Max", "user_id": 395123456})
+POLL_MESSAGE = _message(
+    88420, chat=GROUP_CHAT, poll={
+        "id": "5321987654321098765", "question": "Next release date?", "total_voter_count": 12, "is_closed": False,
+        "is_anonymous": False, "type": "regular", "allows_multiple_answers": False,
+        "options": [{"text": "This week", "voter_count": 7}, {"text": "Next week", "voter_count": 5}]
+    }
+)
+DICE_MESSAGE = _message(1212, dice={"emoji": "🎲", "value": 4})
+FORWARDED_FROM_USER_MESSAGE = _message(
+    1213, text="Meeting moved to 15:00", forward_from=OTHER_USER, forward_date=1699990000
+)
+FORWARDED_FROM_CHANNEL_MESSAGE = _message(
+    1214, text="Teleapi 1.2 is released!", forward_from_chat=CHANNEL_CHAT, forward_from_message_id=312,
+    forward_signature="Admin", forward_date=1699980000,
+    entities=[{"offset": 0, "length": 11, "type": "bold"}]
+)
+EDITED_MESSAGE = _message(1215, text="Fixed typo in the message", edit_date=1700001300)
+CHANNEL_POST = {
+    "message_id": 313, "sender_chat": CHANNEL_CHAT, "chat": CHANNEL_CHAT, "date": 1700000313, "author_signature": "Admin",
+    "text": "Maintenance tonight at 02:00 UTC", "entities": [{"offset": 0, "length": 11, "type": "underline"}]
+}
+NEW_CHAT_MEMBERS_MESSAGE = _message(88430, chat=GROUP_CHAT, new_chat_members=[OTHER_USER, USER])
+LEFT_CHAT_MEMBER_MESSAGE = _message(88431, chat=GROUP_CHAT, author=OTHER_USER, left_chat_member=OTHER_USER)
+NEW_CHAT_TITLE_MESSAGE = _message(88432, chat=GROUP_CHAT, new_chat_title="Teleapi Community 🚀")
+PINNED_MESSAGE_MESSAGE = _message(88433, chat=GROUP_CHAT, pinned_message=GROUP_COMMAND_MESSAGE)
+MIGRATE_MESSAGE = _message(
+    88434, chat={"id": -987654321, "title": "Old group", "type": "group"}, migrate_to_chat_id=-1001765432109
+)
+FORUM_TOPIC_CREATED_MESSAGE = _message(
+    88435, chat=GROUP_CHAT, message_thread_id=88435, is_topic_message=True,
+    forum_topic_created={"name": "Releases", "icon_color": 7322096}
+)
+
+CALLBACK_QUERY = {
+    "id": "1207345098123456789", "from": USER, "chat_instance": "-4312876509871234567", "data": "[ab12c=cd34e]",
+    "message": _message(1216, author=BOT, text="Confirm the order?", reply_markup=INLINE_KEYBOARD)
+}
+INLINE_CALLBACK_QUERY = {
+    "id": "1207345098123456790", "from": USER, "chat_instance": "-4312876509871234568",
+    "inline_message_id": "BAAAAN4gAQBCbUQQ1Y4Wbd8x1Ak", "data": "like:42"
+}
+
+MEMBER = {"user": OTHER_USER, "status": "member"}
+OWNER = {"user": USER, "status": "creator", "is_anonymous": False, "custom_title": "Founder"}
+ADMINISTRATOR = {
+    "user": OTHER_USER, "status": "administrator", "can_be_edited": False, "is_anonymous": False,
+    "can_manage_chat": True, "can_delete_messages": True, "can_manage_video_chats": True, "can_restrict_members": True,
+    "can_promote_members": False, "can_change_info": True, "can_invite_users": True, "can_post_stories": False,
+    "can_edit_stories": False, "can_delete_stories": False, "can_pin_messages": True, "can_manage_topics": True
+}
+RESTRICTED = {
+    "user": OTHER_USER, "status": "restricted", "is_member": True, "until_date": 1700086400,
+    "can_send_messages": True, "can_send_audios": False, "can_send_documents": False, "can_send_photos": True,
+    "can_send_videos": False, "can_send_video_notes": False, "can_send_voice_notes": False, "can_send_polls": False,
+    "can_send_other_messages": False, "can_add_web_page_previews": False, "can_change_info": False,
+    "can_invite_users": True, "can_pin_messages": False, "can_manage_topics": False
+}
+LEFT = {"user": OTHER_USER, "status": "left"}
+BANNED = {"user": OTHER_USER, "status": "kicked", "until_date": 0}
+
+CHAT_MEMBERS: Dict[str, Dict[str, Any]] = {
+    "member": MEMBER,
+    "creator": OWNER,
+    "administrator": ADMINISTRATOR,
+    "restricted": RESTRICTED,
+    "left": LEFT,
+    "kicked": BANNED
+}
+
+
+def _member_update(old: Dict[str, Any], new: Dict[str, Any], **fields) -> Dict[str, Any]:
+    return {"chat": GROUP_CHAT, "from": USER, "date": 1700000500, "old_chat_member": old, "new_chat_member": new, **fields}
+
+
+MESSAGES: Dict[str, Dict[str, Any]] = {
+    "text": TEXT_MESSAGE,
+    "group_command": GROUP_COMMAND_MESSAGE,
+    "reply": REPLY_MESSAGE,
+    "photo": PHOTO_MESSAGE,
+    "album_item": ALBUM_MESSAGES[0],
+    "document": DOCUMENT_MESSAGE,
+    "video": VIDEO_MESSAGE,
+    "voice": VOICE_MESSAGE,
+    "animation": ANIMATION_MESSAGE,
+    "location": LOCATION_MESSAGE,
+    "contact": CONTACT_MESSAGE,
+    "poll": POLL_MESSAGE,
+    "dice": DICE_MESSAGE,
+    "forward_from_user": FORWARDED_FROM_USER_MESSAGE,
+    "forward_from_channel": FORWARDED_FROM_CHANNEL_MESSAGE,
+    "edited": EDITED_MESSAGE,
+    "channel_post": CHANNEL_POST,
+    "new_chat_members": NEW_CHAT_MEMBERS_MESSAGE,
+    "left_chat_member": LEFT_CHAT_MEMBER_MESSAGE,
+    "new_chat_title": NEW_CHAT_TITLE_MESSAGE,
+    "pinned_message": PINNED_MESSAGE_MESSAGE,
+    "migrate_to_chat": MIGRATE_MESSAGE,
+    "forum_topic_created": FORUM_TOPIC_CREATED_MESSAGE
+}
+
+CALLBACK_QUERIES: Dict[str, Dict[str, Any]] = {
+    "message": CALLBACK_QUERY,
+    "inline_message": INLINE_CALLBACK_QUERY
+}
+
+CHAT_MEMBER_UPDATES: Dict[str, Dict[str, Any]] = {
+    "joined": _member_update(LEFT, MEMBER),
+    "promoted": _member_update(MEMBER, ADMINISTRATOR),
+    "restricted": _member_update(MEMBER, RESTRICTED),
+    "banned": _member_update(MEMBER, BANNED),
+    "bot_added": _member_update(
+        {"user": BOT, "status": "left"}, {"user": BOT, "status": "member"},
+        invite_link={
+            "invite_link": "https://t.me/+AbCdEfGhIjKlMnOp", "creator": USER, "creates_join_request": False,
+            "is_primary": False, "is_revoked": False, "name": "Bots"
+        }
+    )
+}
+
+
+def _updates() -> Dict[str, Dict[str, Any]]:
+    updates = {}
+    update_id = 715300000
+
+    for name, message in MESSAGES.items():
+        update_id += 1
+        key = "edited_message" if name == "edited" else "channel_post" if name == "channel_post" else "message"
+        updates[f"message_{name}"] = {"update_id": update_id, key: message}
+
+    for name, callback_query in CALLBACK_QUERIES.items():
+        update_id += 1
+        updates[f"callback_query_{name}"] = {"update_id": update_id, "callback_query": callback_query}
+
+    for name, member_update in CHAT_MEMBER_UPDATES.items():
+        update_id += 1
+        key = "my_chat_member" if name == "bot_added" else "chat_member"
+        updates[f"{key}_{name}"] = {"update_id": update_id, key: member_update}
+
+    updates["chat_join_request"] = {
+        "update_id": update_id + 1,
+        "chat_join_request": {
+            "chat": GROUP_CHAT, "from": OTHER_USER, "user_chat_id": 395123456, "date": 1700000600, "bio": "Python developer",
+            "invite_link": {
+                "invite_link": "https://t.me/+XyZ0123456789abc", "creator": USER, "creates_join_request": True,
+                "is_primary": False, "is_revoked": False, "pending_join_request_count": 3
+            }
+        }
+    }
+    updates["poll_answer"] = {
+        "update_id": update_id + 2,
+        "poll_answer": {"poll_id": "5321987654321098765", "user": OTHER_USER, "option_ids": [1]}
+    }
+
+    return updates
+
+
+# Update name -> update object
+UPDATES: Dict[str, Dict[str, Any]] = _updates()
+
+# Method name -> `result` of the method response
+RESULTS: Dict[str, Any] = {
+    "getMe": BOT,
+    "getChat": {
+        **GROUP_CHAT, "active_usernames": ["teleapi_chat", "teleapi_community"], "description": "Discussion of teleapi",
+        "invite_link": "https://t.me/+QrStUvWxYz012345", "pinned_message": GROUP_COMMAND_MESSAGE, "slow_mode_delay": 10,
+        "photo": {"small_file_id": "AQADAgADq6cxG1SmAAEJ", "small_file_unique_id": "AQADq6cx",
+                  "big_file_id": "AQADAgADq6cxG1SmAAEK", "big_file_unique_id": "AQADq6cy"},
+        "permissions": {key: value for key, value in RESTRICTED.items() if key.startswith("can_")}
+    },
+    "getChatAdministrators": [OWNER, ADMINISTRATOR],
+    "sendMessage": _message(1217, author=BOT, text="Done ✅", reply_markup=INLINE_KEYBOARD),
+    "sendMediaGroup": ALBUM_MESSAGES,
+    "getFile": {"file_id": DOCUMENT_MESSAGE["document"]["file_id"], "file_unique_id": "AgADPi4AAjME",
+                "file_size": 482113, "file_path": "documents/file_42.pdf"}
+}
+
+# Media type -> InputMedia object (as sent in sendMediaGroup and editMessageMedia)
+INPUT_MEDIA: Dict[str, Dict[str, Any]] = {
+    "photo": {"type": "photo", "media": PHOTO_SIZES[-1]["file_id"], "caption": "<b>Meetup</b> photos", "parse_mode": "html"},
+    "video": {"type": "video", "media": "https://example.com/demo.mp4", "caption": "Demo", "parse_mode": "none", "width": 1280, "height": 720,
+              "duration": 17, "supports_streaming": True},
+    "animation": {"type": "animation", "media": ANIMATION_MESSAGE["animation"]["file_id"], "parse_mode": "none", "has_spoiler": True},
+    "audio": {"type": "audio", "media": "https://example.com/track.mp3", "duration": 215, "performer": "Band",
+              "title": "Song", "parse_mode": "markdownv2"},
+    "document": {"type": "document", "media": DOCUMENT_MESSAGE["document"]["file_id"], "caption": "Monthly report", "parse_mode": "none",
+                 "caption_entities": [{"offset": 0, "length": 7, "type": "bold"}]}
+}
+
@@ -0,0 +1,786 @@
+"""
+Local fake Telegram Bot API server for load and integration testing.
+
+Usage: python -m teleapi.testing.fake_server [--port 8081] [--rate 100] [--shape text] [--global-rate 30] [--chat-rate 1]
+"""
+import argparse
+import asyncio
+import inspect
+import itertools
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from aiohttp import web
+
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.transports.memory import FakeApiError, MemoryCall, MethodHandler, decode_form_field
+from teleapi.core.utils.json_codec import get_json_codec
+from teleapi.core.utils.rate_limit import RateLimiter
+from teleapi.core.utils.syntax import default
+from .payloads import make_group_chat, make_private_chat, make_text_message, make_updates, make_user
+
+logger = logging.getLogger(__name__)
+
+# Telegram limits: ~30 messages per second in total, 1 message per second in a private chat, 20 messages per minute in a group
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_RATE = 1
+TELEGRAM_GROUP_RATE = 20 / 60
+
+RATE_LIMITED_METHODS = frozenset(
+    method for method in APIMethod if method.value.startswith(('send', 'copy', 'forward'))
+    and method is not APIMethod.SEND_CHAT_ACTION
+)
+
+# Method name -> key of the message field that holds sent media
+MEDIA_METHODS = {
+    APIMethod.SEND_PHOTO: 'photo',
+    APIMethod.SEND_AUDIO: 'audio',
+    APIMethod.SEND_DOCUMENT: 'document',
+    APIMethod.SEND_VIDEO: 'video',
+    APIMethod.SEND_ANIMATION: 'animation',
+    APIMethod.SEND_VOICE: 'voice',
+    APIMethod.SEND_VIDEO_NOTE: 'video_note',
+    APIMethod.SEND_STICKER: 'sticker'
+}
+
+_METHODS_BY_NAME = {method.value.lower(): method for method in APIMethod}
+
+
+class FakeBotApiServer:
+    """
+    HTTP server (`aiohttp.web`) that behaves like the Telegram Bot API server (api.telegram.org):
+     - `getUpdates` with long polling, `offset` confirmation, `limit` and `allowed_updates`
+     - sending methods return realistic `Message` objects (message ids are sequential per chat)
+     - `getFile` and file downloads (files uploaded with sending methods can be downloaded back)
+     - simulated rate limits (`429 Too Many Requests` with `retry_after`), latency and errors
+
+    Every call is recorded to `calls` list. Synthetic updates are added with `push_update`, `push_message`
+    or generated at configurable rate with `start_stream`.
+
+    Bot is pointed at the server with `API_SERVER_URL` setting::
+
+        async with FakeBotApiServer(global_rate=TELEGRAM_GLOBAL_RATE) as server:
+            project_settings.API_SERVER_URL = server.url
+            server.start_stream(rate=100, count=10000)
+            ...
+
+    Notes:
+     - Methods that have no default behaviour return `True`. Behaviour of any method can be overridden with `route`
+     - Form fields are decoded as JSON if possible, uploaded files are passed to handlers as bytes
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 token: str = None,
+                 global_rate: float = None,
+                 chat_rate: float = None,
+                 group_rate: float = None,
+                 error_rate: float = 0,
+                 latency: float = 0,
+                 record: bool = True,
+                 files: Dict[str, bytes] = None,
+                 seed: int = 0
+                 ) -> None:
+        """
+        Initialize the FakeBotApiServer instance.
+
+        :param host: `str`
+            (Optional) Host the server listens on
+
+        :param port: `int`
+            (Optional) Port the server listens on. If 0, a free port is chosen
+
+        :param token: `str`
+            (Optional) The only accepted bot token. If None, any token is accepted
+
+        :param global_rate: `float`
+            (Optional) Maximum amount of sent messages per second (`TELEGRAM_GLOBAL_RATE` for Telegram limit).
+            If None, there's no limit
+
+        :param chat_rate: `float`
+            (Optional) Maximum amount of sent messages per second in a private chat (`TELEGRAM_CHAT_RATE`).
+            If None, there's no limit
+
+        :param group_rate: `float`
+            (Optional) Maximum amount of sent messages per second in a group (`TELEGRAM_GROUP_RATE`).
+            Defaults to `chat_rate`
+
+        :param error_rate: `float`
+            (Optional) Probability of `502 Bad Gateway` response to any method except getUpdates
+
+        :param latency: `float`
+            (Optional) Simulated processing time of every request in seconds
+
+        :param record: `bool`
+            (Optional) Whether to record calls to `calls` list
+
+        :param files: `Dict[str, bytes]`
+            (Optional) Contents of files available for download (file path -> content)
+
+        :param seed: `int`
+            (Optional) Random seed (used for errors and generated updates)
+        """
+
+        self.host = host
+        self.port = port
+        self.token = token
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.group_rate = default(group_rate, chat_rate)
+        self.error_rate = error_rate
+        self.latency = latency
+        self.record = record
+        self.files: Dict[str, bytes] = dict(files or {})
+        self.seed = seed
+
+        self.calls: List[MemoryCall] = []
+        self.handlers: Dict[APIMethod, MethodHandler] = {}
+        self.bot_user = make_user(5000000000, is_bot=True)
+
+        self._rng = random.Random(seed)
+        self._updates: Deque[Dict[str, Any]] = deque()
+        self._next_update_id = 1
+        self._updates_event: Optional[asyncio.Event] = None
+
+        self._global_limiter: Optional[RateLimiter] = None
+        self._chat_limiters: Dict[Any, RateLimiter] = {}
+        self._injected_errors: Dict[Optional[APIMethod], Deque[FakeApiError]] = {}
+
+        self._message_ids: Dict[Any, int] = {}
+        self._file_ids = itertools.count(1)
+        self._file_paths: Dict[str, str] = {}
+
+        self._runner: Optional[web.AppRunner] = None
+        self._streams: List[asyncio.Task] = []
+        self._closing = False
+
+        self._default_handlers: Dict[APIMethod, MethodHandler] = {
+            APIMethod.GET_UPDATES: self.get_updates,
+            APIMethod.GET_ME: lambda params: self.bot_user,
+            APIMethod.GET_CHAT: lambda params: self.make_chat(params['chat_id']),
+            APIMethod.GET_FILE: self.get_file,
+            APIMethod.SEND_MEDIA_GROUP: self.send_media_group,
+            APIMethod.COPY_MESSAGE: lambda params: {"message_id": self.next_message_id(params['chat_id'])},
+            APIMethod.EDIT_MESSAGE_TEXT: self.edit_message,
+            APIMethod.EDIT_MESSAGE_CAPTION: self.edit_message,
+            APIMethod.EDIT_MESSAGE_REPLY_MARKUP: self.edit_message
+        }
+
+    @property
+    def url(self) -> str:
+        """
+        Returns the URL of the server (value for `API_SERVER_URL` setting)
+
+        :return: `str`
+            The server URL
+        """
+
+        return f"http://{self.host}:{self.port}"
+
+    def make_app(self) -> web.Application:
+        """
+        Makes aiohttp application of the server
+
+        :return: `web.Application`
+            The application
+        """
+
+        app = web.Application(client_max_size=50 * 1024 * 1024)
+        app.router.add_route('*', '/bot{token}/{method}', self.handle_method)
+        app.router.add_route('GET', '/file/bot{token}/{path:.+}', self.handle_file)
+        return app
+
+    async def start(self) -> None:
+        """
+        Starts the server. If `port` is 0, it's set to the chosen port
+        """
+
+        self._closing = False
+        self._updates_event = asyncio.Event()
+
+        if self.global_rate is not None:
+            self._global_limiter = RateLimiter(self.global_rate, burst=math.ceil(self.global_rate))
+
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Fake Bot API server is started on {self.url}")
+
+    async def stop(self) -> None:
+        """
+        Stops the server and update streams
+        """
+
+        self._closing = True
+
+        for stream in self._streams:
+            stream.cancel()
+
+        await asyncio.gather(*self._streams, return_exceptions=True)
+        self._streams.clear()
+
+        if self._updates_event is not None:
+            self._updates_event.set()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'FakeBotApiServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def route(self, method: APIMethod):
+        """
+        Decorator that registers handler of API method (overrides default behaviour).
+        Handler gets request parameters dict and returns `result` of the response, raises `FakeApiError` to return error
+
+        :param method: `APIMethod`
+            The API method
+        """
+
+        def decorator(handler: MethodHandler) -> MethodHandler:
+            self.handlers[method] = handler
+            return handler
+
+        return decorator
+
+    def get_calls(self, method: APIMethod = None) -> List[MemoryCall]:
+        """
+        Returns recorded calls
+
+        :param method: `APIMethod`
+            (Optional) If specified, returns only calls of this method
+
+        :return: `List[MemoryCall]`
+            Recorded calls
+        """
+
+        return [call for call in self.calls if method is None or call.method is method]
+
+    def inject_error(self, error: FakeApiError, method: APIMethod = None, times: int = 1) -> None:
+        """
+        Makes next calls return the error
+
+        :param error: `FakeApiError`
+            The error
+        :param method: `APIMethod`
+            (Optional) The method that fails. If None, any method except getUpdates fails
+        :param times: `int`
+            (Optional) Amount of calls that fail
+        """
+
+        self._injected_errors.setdefault(method, deque()).extend([error] * times)
+
+    # ---- Updates ----
+
+    def push_update(self, update: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds update to the queue returned by getUpdates. Update id is assigned if update doesn't have it
+
+        :param update: `Dict[str, Any]`
+            Update object
+
+        :return: `Dict[str, Any]`
+            The added update
+        """
+
+        if 'update_id' not in update:
+            update['update_id'] = self._next_update_id
+
+        self._next_update_id = max(self._next_update_id, update['update_id'] + 1)
+        self._updates.append(update)
+
+        if self._updates_event is not None:
+            self._updates_event.set()
+
+        return update
+
+    def push_updates(self, updates: Iterable[Dict[str, Any]]) -> None:
+        """
+        Adds updates to the queue returned by getUpdates. Update ids are reassigned to be sequential
+
+        :param updates: `Iterable[Dict[str, Any]]`
+            Update objects
+        """
+
+        for update in updates:
+            update['update_id'] = self._next_update_id
+            self.push_update(update)
+
+    def push_message(self, text: str, user_id: int = 100000001, chat_id: int = None) -> Dict[str, Any]:
+        """
+        Adds update with a text message from user
+
+        :param text: `str`
+            Text of the message
+        :param user_id: `int`
+            (Optional) Id of the sender
+        :param chat_id: `int`
+            (Optional) Id of the chat. Defaults to the private chat with the sender
+
+        :return: `Dict[str, Any]`
+            The added update
+        """
+
+        chat_id = default(chat_id, user_id)
+        message = make_text_message(self.next_message_id(chat_id), user_id, text, self.make_chat(chat_id))
+        message['date'] = int(time.time())
+
+        return self.push_update({"message": message})
+
+    def pending_updates(self) -> int:
+        """
+        Returns amount of updates that are not confirmed by the bot
+        """
+
+        return len(self._updates)
+
+    async def generate_updates(self, rate: float, count: int = None, shape: str = None, batch: int = 1000) -> None:
+        """
+        Adds synthetic updates (see `teleapi.testing.payloads.make_updates`) at a constant rate
+
+        :param rate: `float`
+            Amount of updates per second
+        :param count: `int`
+            (Optional) Amount of updates. If None, generates until cancelled
+        :param shape: `str`
+            (Optional) Shape of updates (key of `UPDATE_SHAPES`). If None, shapes are mixed
+        :param batch: `int`
+            (Optional) Amount of updates generated at once
+        """
+
+        generated = 0
+        started_at = time.monotonic()
+
+        for seed in itertools.count(self.seed):
+            updates = make_updates(batch if count is None else min(batch, count - generated), shape=shape, seed=seed)
+
+            for update in updates:
+                delay = started_at + generated / rate - time.monotonic()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                self.push_updates((update,))
+                generated += 1
+
+            if count is not None and generated >= count:
+                return
+
+    def start_stream(self, rate: float, count: int = None, shape: str = None) -> asyncio.Task:
+        """
+        Starts `generate_updates` in background. Stream is cancelled when the server is stopped
+
+        :return: `asyncio.Task`
+            The stream task
+        """
+
+        task = asyncio.create_task(self.generate_updates(rate, count=count, shape=shape))
+        self._streams.append(task)
+        return task
+
+    async def get_updates(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        offset = params.get('offset')
+        limit = min(max(int(params.get('limit', 100)), 1), 100)
+        timeout = float(params.get('timeout', 0))
+        allowed_updates = params.get('allowed_updates') or None
+
+        if offset is not None:
+            offset = int(offset)
+
+            if offset < 0:
+                while len(self._updates) > -offset:
+                    self._updates.popleft()
+            else:
+                while self._updates and self._updates[0]['update_id'] < offset:
+                    self._updates.popleft()
+
+        if allowed_updates is not None:
+            while self._updates and not any(key in self._updates[0] for key in allowed_updates):
+                self._updates.popleft()
+
+        if not self._updates and timeout > 0 and not self._closing:
+            self._updates_event.clear()
+
+            try:
+                await asyncio.wait_for(self._updates_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        updates = itertools.islice(self._updates, limit)
+
+        if allowed_updates is not None:
+            return [update for update in updates if any(key in update for key in allowed_updates)]
+
+        return list(updates)
+
+    # ---- Messages ----
+
+    def make_chat(self, chat_id: Any) -> Dict[str, Any]:
+        """
+        Returns Chat object of the chat (private chat for positive ids, supergroup for negative ones and usernames)
+        """
+
+        if isinstance(chat_id, int) and chat_id > 0:
+            return make_private_chat(chat_id)
+
+        if isinstance(chat_id, int):
+            return make_group_chat(chat_id)
+
+        chat = make_group_chat(-1000000000000 - abs(hash(chat_id)) % 10 ** 9)
+        chat['username'] = str(chat_id).lstrip('@')
+        return chat
+
+    def next_message_id(self, chat_id: Any) -> int:
+        """
+        Returns next message id in the chat
+        """
+
+        message_id = self._message_ids.get(chat_id, 0) + 1
+        self._message_ids[chat_id] = message_id
+        return message_id
+
+    def make_message(self, params: Dict[str, Any], message_id: int = None, **fields) -> Dict[str, Any]:
+        """
+        Returns Message object sent by the bot
+
+        :param params: `Dict[str, Any]`
+            Request parameters (`chat_id`, `reply_markup`, `message_thread_id` are used)
+        :param message_id: `int`
+            (Optional) Id of the message. If None, next id in the chat is used
+        :param fields: `dict`
+            Message content fields
+        """
+
+        chat_id = params['chat_id']
+        message = {
+            "message_id": message_id if message_id is not None else self.next_message_id(chat_id),
+            "from": self.bot_user,
+            "chat": self.make_chat(chat_id),
+            "date": int(time.time()),
+            **fields
+        }
+
+        if params.get('message_thread_id') is not None:
+            message['message_thread_id'] = params['message_thread_id']
+
+        if isinstance(params.get('reply_markup'), dict) and 'inline_keyboard' in params['reply_markup']:
+            message['reply_markup'] = params['reply_markup']
+
+        return message
+
+    def store_file(self, value: Any, kind: str) -> Dict[str, Any]:
+        """
+        Returns File-like object of the media. Uploaded files are saved and can be downloaded with file path
+
+        :param value: `Any`
+            File id, URL or uploaded content
+        :param kind: `str`
+            Kind of media (message field name)
+        """
+
+        file_number = next(self._file_ids)
+        file_id = value if isinstance(value, str) and value in self._file_paths else f"{kind.upper()}_{file_number}"
+
+        if file_id not in self._file_paths:
+            file_path = f"{kind}s/file_{file_number}"
+            self._file_paths[file_id] = file_path
+            self.files[file_path] = value if isinstance(value, bytes) else b""
+
+        content = self.files.get(self._file_paths[file_id], b"")
+
+        return {"file_id": file_id, "file_unique_id": f"U{file_id}", "file_size": len(content)}
+
+    def make_media(self, kind: str, value: Any) -> Any:
+        file = self.store_file(value, kind)
+
+        if kind == 'photo':
+            return [
+                {**file, "width": 90, "height": 90},
+                {**file, "width": 1280, "height": 1280}
+            ]
+
+        if kind in ('video', 'animation', 'video_note', 'sticker'):
+            file.update(width=640, height=640, duration=5)
+        elif kind in ('audio', 'voice'):
+            file.update(duration=5)
+
+        if kind == 'sticker':
+            file.update(type="regular", is_animated=False, is_video=False)
+        elif kind == 'document':
+            file.update(file_name=f"file_{file['file_id']}")
+
+        return file
+
+    def send_message(self, method: APIMethod, params: Dict[str, Any]) -> Dict[str, Any]:
+        if method is APIMethod.SEND_MESSAGE:
+            return self.make_message(params, text=str(params['text']))
+
+        kind = MEDIA_METHODS.get(method)
+
+        if kind is not None:
+            fields = {kind: self.make_media(kind, params.get(kind))}
+
+            if params.get('caption') is not None:
+                fields['caption'] = str(params['caption'])
+
+            return self.make_message(params, **fields)
+
+        if method is APIMethod.FORWARD_MESSAGE:
+            return self.make_message(params, text="", forward_date=int(time.time()))
+
+        if method is APIMethod.SEND_LOCATION:
+            return self.make_message(params, location={"latitude": params['latitude'], "longitude": params['longitude']})
+
+        if method is APIMethod.SEND_CONTACT:
+            return self.make_message(
+                params, contact={"phone_number": str(params['phone_number']), "first_name": params['first_name']}
+            )
+
+        if method is APIMethod.SEND_DICE:
+            return self.make_message(params, dice={"emoji": params.get('emoji', "🎲"), "value": self._rng.randint(1, 6)})
+
+        return self.make_message(params)
+
+    def send_media_group(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        media_group_id = str(next(self._file_ids))
+        messages = []
+
+        for media in params['media']:
+            value = media['media']
+
+            if isinstance(value, str) and value.startswith('attach://'):
+                value = params.get(value[len('attach://'):])
+
+            fields = {media['type']: self.make_media(media['type'], value), "media_group_id": media_group_id}
+
+            if media.get('caption') is not None:
+                fields['caption'] = media['caption']
+
+            messages.append(self.make_message(params, **fields))
+
+        return messages
+
+    def edit_message(self, params: Dict[str, Any]) -> Any:
+        if params.get('inline_message_id') is not None:
+            return True
+
+        message = self.make_message(params, message_id=params['message_id'], edit_date=int(time.time()))
+
+        if params.get('text') is not None:
+            message['text'] = str(params['text'])
+        elif params.get('caption') is not None:
+            message['caption'] = str(params['caption'])
+
+        return message
+
+    def get_file(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        file_path = self._file_paths.get(params['file_id'])
+
+        if file_path is None:
+            raise FakeApiError(400, "Bad Request: invalid file_id")
+
+        return {
+            "file_id": params['file_id'],
+            "file_unique_id": f"U{params['file_id']}",
+            "file_size": len(self.files.get(file_path, b"")),
+            "file_path": file_path
+        }
+
+    # ---- HTTP ----
+
+    def check_rate_limit(self, params: Dict[str, Any]) -> None:
+        """
+        Raises `429 Too Many Requests` error if the message exceeds simulated rate limits
+        """
+
+        limiters = []
+
+        if self._global_limiter is not None:
+            limiters.append(self._global_limiter)
+
+        chat_id = params.get('chat_id')
+        rate = self.chat_rate if isinstance(chat_id, int) and chat_id > 0 else self.group_rate
+
+        if chat_id is not None and rate is not None:
+            limiter = self._chat_limiters.get(chat_id)
+
+            if limiter is None:
+                limiter = self._chat_limiters[chat_id] = RateLimiter(rate, burst=3)
+
+            limiters.append(limiter)
+
+        for limiter in limiters:
+            delay = limiter.delay()
+
+            if delay > 0:
+                retry_after = max(1, math.ceil(delay))
+                raise FakeApiError(429, f"Too Many Requests: retry after {retry_after}", {"retry_after": retry_after})
+
+        for limiter in limiters:
+            limiter.try_acquire()
+
+    def check_errors(self, method: APIMethod) -> None:
+        for key in (method, None):
+            errors = self._injected_errors.get(key)
+
+            if errors:
+                raise errors.popleft()
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise FakeApiError(502, "Bad Gateway")
+
+    async def read_params(self, request: web.Request) -> Dict[str, Any]:
+        """
+        Decodes parameters of the request from query parameters and body (JSON, urlencoded or multipart form)
+        """
+
+        params: Dict[str, Any] = {}
+
+        for name in set(request.query.keys()):
+            values = [decode_form_field(value) for value in request.query.getall(name)]
+            # Repeated query parameter is a list (aiohttp encodes list parameters this way)
+            params[name] = values if len(values) > 1 else values[0]
+
+        if not request.can_read_body:
+            return params
+
+        if request.content_type == 'application/json':
+            params.update(get_json_codec().loads(await request.read()))
+        elif request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            for name, value in (await request.post()).items():
+                if isinstance(value, web.FileField):
+                    params[name] = value.file.read()
+                else:
+                    params[name] = decode_form_field(value)
+
+        return params
+
+    async def handle_method(self, request: web.Request) -> web.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        token = request.match_info['token']
+        method = _METHODS_BY_NAME.get(request.match_info['method'].lower())
+
+        try:
+            if self.token is not None and token != self.token:
+                raise FakeApiError(401, "Unauthorized")
+
+            if method is None:
+                raise FakeApiError(404, "Not Found")
+
+            params = await self.read_params(request)
+
+            if self.record:
+                self.calls.append(MemoryCall(method, params, token))
+
+            result = await self.call_method(method, params)
+        except FakeApiError as error:
+            return self._error_response(error)
+        except (KeyError, TypeError, ValueError) as error:
+            return self._error_response(FakeApiError(400, f"Bad Request: {error.__class__.__name__}: {error}"))
+
+        return web.Response(body=get_json_codec().dumps({"ok": True, "result": result}), content_type='application/json')
+
+    async def call_method(self, method: APIMethod, params: Dict[str, Any]) -> Any:
+        """
+        Returns result of the API method
+
+        :raises:
+            :raise FakeApiError: If the method fails
+        """
+
+        if method is not APIMethod.GET_UPDATES:
+            self.check_errors(method)
+
+        if method in RATE_LIMITED_METHODS:
+            self.check_rate_limit(params)
+
+        handler = self.handlers.get(method) or self._default_handlers.get(method)
+
+        if handler is not None:
+            result = handler(params)
+            return await result if inspect.isawaitable(result) else result
+
+        if method in RATE_LIMITED_METHODS:
+            return self.send_message(method, params)
+
+        return True
+
+    async def handle_file(self, request: web.Request) -> web.Response:
+        if self.token is not None and request.match_info['token'] != self.token:
+            return self._error_response(FakeApiError(401, "Unauthorized"))
+
+        content = self.files.get(request.match_info['path'])
+
+        if content is None:
+            return self._error_response(FakeApiError(404, "Not Found: file not found"))
+
+        return web.Response(body=content, content_type='application/octet-stream')
+
+    @staticmethod
+    def _error_response(error: FakeApiError) -> web.Response:
+        data = {"ok": False, "error_code": error.error_code, "description": error.description}
+
+        if error.parameters is not None:
+            data["parameters"] = error.parameters
+
+        return web.Response(body=get_json_codec().dumps(data), status=error.error_code, content_type='application/json')
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = FakeBotApiServer(
+        host=args.host,
+        port=args.port,
+        global_rate=args.global_rate,
+        chat_rate=args.chat_rate,
+        group_rate=args.group_rate,
+        error_rate=args.error_rate,
+        latency=args.latency,
+        record=False
+    )
+
+    async with server:
+        print(f"Fake Bot API server is listening on {server.url}")
+
+        if args.rate:
+            server.start_stream(args.rate, count=args.count, shape=args.shape)
+
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--rate", type=float, help="Synthetic updates per second")
+    parser.add_argument("--count", type=int, help="Amount of synthetic updates (infinite if not specified)")
+    parser.add_argument("--shape", help="Shape of synthetic updates (mixed if not specified)")
+    parser.add_argument("--global-rate", type=float, help=f"Messages per second limit (Telegram: {TELEGRAM_GLOBAL_RATE})")
+    parser.add_argument("--chat-rate", type=float, help=f"Messages per second limit in a chat (Telegram: {TELEGRAM_CHAT_RATE})")
+    parser.add_argument("--group-rate", type=float, help="Messages per second limit in a group (Telegram: 0.33)")
+    parser.add_argument("--error-rate", type=float, default=0, help="Probability of 502 Bad Gateway response")
+    parser.add_argument("--latency", type=float, default=0, help="Processing time of every request in seconds")
+
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
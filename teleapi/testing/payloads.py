@@ -0,0 +1,210 @@
+"""
+Realistic Telegram Bot API payloads used by the fake Bot API server and benchmarks
+"""
+import random
+from typing import Any, Callable, Dict, List
+
+BASE_DATE = 1700000000
+
+_WORDS = (
+    "hello", "bot", "please", "send", "me", "the", "report", "for", "today", "thanks", "ok", "what", "is", "status",
+    "привет", "как", "дела", "👍", "🔥", "order", "#1234", "tomorrow", "at", "10:00"
+)
+
+
+def make_user(user_id: int, is_bot: bool = False) -> Dict[str, Any]:
+    return {
+        "id": user_id,
+        "is_bot": is_bot,
+        "first_name": f"User{user_id}",
+        "last_name": "Example",
+        "username": f"user_{user_id}",
+        "language_code": "en"
+    }
+
+
+def make_private_chat(user_id: int) -> Dict[str, Any]:
+    return {
+        "id": user_id,
+        "first_name": f"User{user_id}",
+        "last_name": "Example",
+        "username": f"user_{user_id}",
+        "type": "private"
+    }
+
+
+def make_group_chat(chat_id: int) -> Dict[str, Any]:
+    return {
+        "id": chat_id,
+        "title": f"Group {abs(chat_id)}",
+        "type": "supergroup",
+        "username": f"group_{abs(chat_id)}"
+    }
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def make_text_message(message_id: int, user_id: int, text: str, chat: Dict[str, Any] = None) -> Dict[str, Any]:
+    return {
+        "message_id": message_id,
+        "from": make_user(user_id),
+        "chat": chat if chat is not None else make_private_chat(user_id),
+        "date": BASE_DATE + message_id,
+        "text": text
+    }
+
+
+def make_command_update(update_id: int, rng: random.Random) -> Dict[str, Any]:
+    user_id = rng.randint(10 ** 8, 10 ** 9)
+    command = rng.choice(("/start", "/help", "/settings", "/report"))
+    message = make_text_message(update_id, user_id, command)
+    message["entities"] = [{"offset": 0, "length": len(command), "type": "bot_command"}]
+
+    return {"update_id": update_id, "message": message}
+
+
+def make_text_update(update_id: int, rng: random.Random) -> Dict[str, Any]:
+    user_id = rng.randint(10 ** 8, 10 ** 9)
+    return {"update_id": update_id, "message": make_text_message(update_id, user_id, make_text(rng, rng.randint(3, 40)))}
+
+
+def make_group_reply_update(update_id: int, rng: random.Random) -> Dict[str, Any]:
+    chat = make_group_chat(-1001000000000 - rng.randint(0, 1000))
+    user_id = rng.randint(10 ** 8, 10 ** 9)
+    message = make_text_message(update_id, user_id, make_text(rng, 12), chat=chat)
+    message["reply_to_message"] = make_text_message(update_id - 1, rng.randint(10 ** 8, 10 ** 9), make_text(rng, 8), chat=chat)
+    message["entities"] = [
+        {"offset": 0, "length": 5, "type": "bold"},
+        {"offset": 6, "length": 4, "type": "url"}
+    ]
+
+    return {"update_id": update_id, "message": message}
+
+
+def make_photo_update(update_id: int, rng: random.Random) -> Dict[str, Any]:
+    user_id = rng.randint(10 ** 8, 10 ** 9)
+    message = make_text_message(update_id, user_id, "")
+    del message["text"]
+    message["caption"] = make_text(rng, 6)
+    message["photo"] = [
+        {
+            "file_id": f"AgACAgIAAxkBAAI{update_id}{size}",
+            "file_unique_id": f"AQAD{update_id}{size}",
+            "file_size": size * 70,
+            "width": size,
+            "height": size * 3 // 4
+        } for size in (90, 320, 800, 1280)
+    ]
+
+    return {"update_id": update_id, "message": message}
+
+
+def make_callback_query_update(update_id: int, rng: random.Random) -> Dict[str, Any]:
+    user_id = rng.randint(10 ** 8, 10 ** 9)
+    message = make_text_message(update_id - 1, user_id, "Choose an option")
+    message["from"] = make_user(5000000000, is_bot=True)
+    message["reply_markup"] = {
+        "inline_keyboard": [
+            [{"text": f"Option {row * 2 + column}", "callback_data": f"option:{row * 2 + column}"} for column in range(2)]
+            for row in range(3)
+        ]
+    }
+
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(rng.randint(10 ** 17, 10 ** 18)),
+            "from": make_user(user_id),
+            "message": message,
+            "chat_instance": str(rng.randint(10 ** 17, 10 ** 18)),
+            "data": f"option:{rng.randint(0, 5)}"
+        }
+    }
+
+
+def make_chat_member_update(update_id: int, rng: random.Random) -> Dict[str, Any]:
+    user = make_user(rng.randint(10 ** 8, 10 ** 9))
+
+    return {
+        "update_id": update_id,
+        "chat_member": {
+            "chat": make_group_chat(-1001000000000 - rng.randint(0, 1000)),
+            "from": user,
+            "date": BASE_DATE + update_id,
+            "old_chat_member": {"user": user, "status": "left"},
+            "new_chat_member": {"user": user, "status": "member"}
+        }
+    }
+
+
+# Update shapes: name -> factory `(update_id, rng) -> update`
+UPDATE_SHAPES: Dict[str, Callable[[int, random.Random], Dict[str, Any]]] = {
+    "command": make_command_update,
+    "text": make_text_update,
+    "group_reply": make_group_reply_update,
+    "photo": make_photo_update,
+    "callback_query": make_callback_query_update,
+    "chat_member": make_chat_member_update
+}
+
+
+def make_updates(count: int, shape: str = None, seed: int = 0, first_update_id: int = 1) -> List[Dict[str, Any]]:
+    """
+    Makes list of updates
+
+    :param count: `int`
+        Amount of updates
+
+    :param shape: `str`
+        (Optional) Shape of updates (key of `UPDATE_SHAPES`). If None, shapes are mixed
+
+    :param seed: `int`
+        Random seed
+
+    :param first_update_id: `int`
+        Id of the first update
+
+    :return: `List[Dict[str, Any]]`
+        Updates
+    """
+
+    rng = random.Random(seed)
+    factories = [UPDATE_SHAPES[shape]] if shape is not None else list(UPDATE_SHAPES.values())
+
+    return [rng.choice(factories)(update_id, rng) for update_id in range(first_update_id, first_update_id + count)]
+
+
+def make_get_updates_response(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"ok": True, "result": updates}
+
+
+def make_send_message_request(rng: random.Random = None) -> Dict[str, Any]:
+    rng = rng if rng is not None else random.Random(0)
+
+    return {
+        "chat_id": rng.randint(10 ** 8, 10 ** 9),
+        "text": make_text(rng, 30),
+        "parse_mode": "HTML",
+        "reply_to_message_id": rng.randint(1, 10 ** 6),
+        "reply_markup": {
+            "inline_keyboard": [[{"text": "Yes", "callback_data": "yes"}, {"text": "No", "callback_data": "no"}]]
+        }
+    }
+
+
+def make_send_message_response(request: Dict[str, Any], message_id: int = 1) -> Dict[str, Any]:
+    chat_id = request["chat_id"]
+    chat = make_private_chat(chat_id) if isinstance(chat_id, int) and chat_id > 0 else make_group_chat(chat_id)
+
+    return {
+        "ok": True,
+        "result": {
+            "message_id": message_id,
+            "from": make_user(5000000000, is_bot=True),
+            "chat": chat,
+            "date": BASE_DATE + message_id,
+            "text": request.get("text", "")
+        }
+    }
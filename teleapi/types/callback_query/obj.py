@@ -2,6 +2,7 @@ from .model import CallbackQueryModel
 from teleapi.core.http.request import method_request
 from teleapi.core.utils.collections import clear_none_values
 from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.request.scheduler import RequestPriority
 
 
 class CallbackQuery(CallbackQueryModel):
@@ -17,7 +18,9 @@ class CallbackQuery(CallbackQueryModel):
             "cache_time": cache_time
         })
 
-        response, data = await method_request("POST", APIMethod.ANSWER_CALLBACK_QUERY, data=request_data)
+        response, data = await method_request(
+            "POST", APIMethod.ANSWER_CALLBACK_QUERY, priority=RequestPriority.INTERACTIVE, data=request_data
+        )
 
         self.is_answered = True
 
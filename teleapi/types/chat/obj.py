@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Union, List
 
 from aiohttp import FormData
 
+from teleapi.core.bots.membership import get_membership_index
 from teleapi.core.http.request import method_request
 from teleapi.core.http.request.api_method import APIMethod
 from teleapi.core.utils.collections import exclude_from_dict, clear_none_values
@@ -25,7 +26,7 @@ from ..location import Location
 from ..menu_button import MenuButton, MenuButtonSerializer
 from ..message_entity import MessageEntity
 from teleapi.core.exceptions.generics import ParameterConflictError, InvalidParameterError
-from teleapi.core.utils.files import get_file
+from teleapi.core.utils.files import get_input_file
 from teleapi.generics.http.methods.chat import edit_invite_link, revoke_chat_invite_link
 from teleapi.generics.http.methods.messages import *
 
@@ -79,7 +80,12 @@ class Chat(ChatModel):
             'chat_id': self.id,
             'user_id': user if isinstance(user, int) else user.id
         })
-        return ChatMemberObjectSerializer().serialize(data=data['result'])
+        member = ChatMemberObjectSerializer().serialize(data=data['result'])
+
+        if (membership_index := get_membership_index()) is not None:
+            membership_index.update_from_member(self.id, member)
+
+        return member
 
     async def get_administrators(self) -> List['ChatAdministrator']:
 
@@ -98,7 +104,12 @@ class Chat(ChatModel):
             raise BadChatType("There are no administrators in the private chat")
 
         response, data = await method_request("GET", APIMethod.GET_CHAT_ADMINISTRATORS, data={'chat_id': self.id})
-        return ChatAdministratorSerializer().serialize(data=data['result'], many=True)
+        administrators = ChatAdministratorSerializer().serialize(data=data['result'], many=True)
+
+        if (membership_index := get_membership_index()) is not None:
+            membership_index.update_from_administrators(self.id, administrators)
+
+        return administrators
 
     async def get_member_count(self) -> int:
         """
@@ -857,7 +868,7 @@ class Chat(ChatModel):
             if not os.path.exists(photo):
                 raise FileNotFoundError(f"Photo file {photo} was not found")
 
-            filename, photo = get_file(photo)
+            filename, photo = get_input_file(photo)
 
         form_data = FormData()
         form_data.add_field('chat_id', self.id)
@@ -15,7 +15,7 @@ from teleapi.types.chat_permissions import ChatPermissionsSerializer
 class ChatSerializer(ModelSerializer):
     type_ = EnumSerializerField(ChatType, StringSerializerField(), read_name="type")
     active_usernames = ListSerializerField(StringSerializerField(), is_required=False, default=[])
-    pinned_message = RelatedSerializerField('MessageSerializer', is_required=False)
+    pinned_message = RelatedSerializerField('teleapi.types.message.serializer.MessageSerializer', is_required=False)
 
     location = RelatedSerializerField(ChatLocationSerializer(), is_required=False)
     permissions = RelatedSerializerField(ChatPermissionsSerializer(), is_required=False)
@@ -1,11 +1,35 @@
+import asyncio
+import os
+import shutil
+
 from .model import FileModel
 from teleapi.core.http.request import file_request
+from teleapi.core.utils.files import get_file, is_local_mode
 from typing import Union
 from teleapi.types.filelike import Filelike
 
 
 class File(Filelike, FileModel):
     async def download(self, path: str = None) -> Union[bytes, None]:
+        """
+        Downloads the file.
+        In local mode (`API_LOCAL_MODE` setting) the file is read straight from the disk of the local Bot API server
+
+        :param path: `str`
+            (Optional) Path where to save the file. If not specified, file bytes will be returned
+
+        :return: `Union[bytes, None]`
+            File bytes if `path` was not specified
+        """
+
+        if is_local_mode() and os.path.isabs(self.file_path):
+            if path is None:
+                _, bytes_ = await asyncio.to_thread(get_file, self.file_path)
+                return bytes_
+
+            await asyncio.to_thread(shutil.copyfile, self.file_path, path)
+            return
+
         response, bytes_ = await file_request("GET", self.file_path)
 
         if path is None:
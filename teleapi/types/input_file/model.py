@@ -5,7 +5,7 @@ from typing import Optional, Any
 from teleapi.core.exceptions.generics import InvalidParameterError
 from teleapi.core.orm.models import Model, ModelMeta
 from teleapi.core.orm.models.generics.fields import InputFileModelField, StringModelField
-from teleapi.core.utils.files import get_file
+from teleapi.core.utils.files import get_file, is_local_mode, get_input_file
 from teleapi.core.utils.syntax import default
 
 
@@ -27,6 +27,9 @@ class InputFileModel(Model, metaclass=_InputFileModelMeta):
 
         if self.data:
             self.register_data(self.__file_field__, self.data, self.filename)
+        elif self.__get_file_field_data() is not None and os.path.exists(self.__get_file_field_data()) and is_local_mode():
+            _, file_uri = get_input_file(self.__get_file_field_data())
+            setattr(self, self.__file_field__, file_uri)
         elif self.__get_file_field_data() is not None and os.path.exists(self.__get_file_field_data()):
             data_filename, data = get_file(self.__get_file_field_data())
             filename = default(self.filename, data_filename)
@@ -3,7 +3,7 @@ from typing import List, Optional
 
 from teleapi.core.orm.models.generics.fields import StringModelField, ConstantModelField, ListModelField, \
     RelatedModelField, InputFileModelField
-from teleapi.core.utils.files import get_file
+from teleapi.core.utils.files import get_file, is_local_mode, get_input_file
 from teleapi.core.utils.syntax import default
 from teleapi.enums.parse_mode import ParseMode
 from teleapi.types.message_entity import MessageEntity
@@ -38,7 +38,9 @@ class InputMediaWithThumbnailModel(InputMediaModel):
         if self.thumbnail_data:
             self.__register_thumbnail(self.thumbnail_data, self.thumbnail_filename)
 
-        if self.thumbnail is not None and os.path.exists(self.thumbnail):
+        if self.thumbnail is not None and os.path.exists(self.thumbnail) and is_local_mode():
+            _, self.thumbnail = get_input_file(self.thumbnail)
+        elif self.thumbnail is not None and os.path.exists(self.thumbnail):
             data_filename, data = get_file(self.thumbnail)
             filename = default(self.filename, data_filename)
             if not filename:
@@ -16,6 +16,7 @@ from ..location import Location
 from ..poll.sub_object import PollType
 from ..poll import Poll
 from ...core.exceptions.generics import InvalidParameterError
+from ...core.http.request.scheduler import RequestPriority, request_priority
 from ...core.utils.collections import exclude_from_dict
 from ...core.utils.syntax import default
 
@@ -51,7 +52,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_message(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_message(**payload)
 
     async def reply_photo(self,
                           photo: Union[bytes, str],
@@ -71,7 +73,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_photo(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_photo(**payload)
 
     async def reply_audio(self,
                           audio: Union[bytes, str],
@@ -94,7 +97,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_audio(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_audio(**payload)
 
     async def reply_document(self,
                              document: Union[bytes, str],
@@ -115,7 +119,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_document(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_document(**payload)
 
     async def reply_video(self,
                           video: Union[bytes, str],
@@ -139,7 +144,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_video(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_video(**payload)
 
     async def reply_video_note(self,
                                video_note: Union[bytes, str],
@@ -156,7 +162,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_video_note(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_video_note(**payload)
 
     async def reply_poll(self,
                          question: str,
@@ -182,7 +189,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_poll(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_poll(**payload)
 
     async def reply_contact(self,
                             contact: 'Contact',
@@ -197,7 +205,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_contact(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_contact(**payload)
 
     async def reply_dice(self,
                          emoji: 'str' = None,
@@ -212,7 +221,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_dice(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_dice(**payload)
 
     async def reply_media_group(self,
                                 media: List[
@@ -228,7 +238,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_media_group(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_media_group(**payload)
 
     async def reply_animation(self,
                               animation: Union[bytes, str],
@@ -252,7 +263,8 @@ class Message(MessageModel):
         payload['reply_to_message'] = self
         payload['message_thread_id'] = self.thread_id
 
-        return await self.chat.send_animation(**payload)
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await self.chat.send_animation(**payload)
 
     async def send_location(self,
                             location: Location,
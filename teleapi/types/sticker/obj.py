@@ -9,7 +9,7 @@ from ..mask_position import MaskPosition
 from teleapi.core.http.request import method_request, APIMethod
 from .sub_objects.sticker_format import StickerFormat
 from teleapi.core.exceptions.generics import InvalidParameterError
-from teleapi.core.utils.files import get_file
+from teleapi.core.utils.files import get_input_file
 from teleapi.generics.http.methods.utils import make_form_data
 from teleapi.types.mask_position import MaskPositionSerializer
 
@@ -57,7 +57,7 @@ class Sticker(StickerModel, Filelike):
         """
 
         if isinstance(sticker, str) and os.path.exists(sticker):
-            _, sticker = get_file(sticker)
+            _, sticker = get_input_file(sticker)
 
         form_data = make_form_data({
             'user_id': user.id if isinstance(user, User) else user,
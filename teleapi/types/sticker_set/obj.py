@@ -10,7 +10,7 @@ from teleapi.types.user import User
 from .model import StickerSetModel
 from teleapi.core.state import project_settings
 from teleapi.core.exceptions.generics import InvalidParameterError
-from ...core.utils.files import get_file
+from ...core.utils.files import get_input_file
 from ...generics.http.methods.utils import make_form_data
 
 
@@ -273,7 +273,7 @@ class StickerSet(StickerSetModel):
         })
 
         if isinstance(thumbnail, str) and os.path.exists(thumbnail):
-            _, thumbnail = get_file(thumbnail)
+            _, thumbnail = get_input_file(thumbnail)
         form_data.add_field("thumbnail", thumbnail)
 
         response, data = await method_request("POST", APIMethod.SET_STICKER_SET_THUMBNAIL, data=form_data)
@@ -0,0 +1,17 @@
+import pytest
+
+from teleapi.core.state.settings import project_settings
+
+
+@pytest.fixture
+def settings():
+    """
+    Project settings that are restored after the test
+    """
+
+    config_data = dict(project_settings._config_data)
+
+    yield project_settings
+
+    project_settings._config_data.clear()
+    project_settings._config_data.update(config_data)
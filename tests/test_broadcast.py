@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+import pytest
+
+from teleapi.core.http.exceptions import Unauthorized
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.transports.memory import FakeApiError, MemoryTransport
+from teleapi.generics.broadcast import Broadcast, BroadcastStatus
+
+
+def make_broadcast(settings, send_message, **kwargs) -> Broadcast:
+    settings.API_TOKEN = 'TOKEN'
+    settings.REQUEST_SCHEDULER = None
+    settings.CIRCUIT_BREAKER = None
+    settings.HTTP_TRANSPORT = MemoryTransport({APIMethod.SEND_MESSAGE: send_message}, record=True)
+
+    return Broadcast(list(range(1, 6)), APIMethod.SEND_MESSAGE, {'text': "Hello"}, rate=1000, **kwargs)
+
+
+def test_non_transient_errors_are_not_retried(settings):
+    def send_message(params):
+        if params['chat_id'] == 3:
+            raise FakeApiError(409, "Conflict")
+        return {'message_id': 1}
+
+    broadcast = make_broadcast(settings, send_message)
+    started_at = time.perf_counter()
+    result = asyncio.run(broadcast.run())
+
+    assert time.perf_counter() - started_at < 1
+    assert result.get_status(2) is BroadcastStatus.FAILED
+    assert result.count(BroadcastStatus.SENT) == 4
+    assert len(settings.HTTP_TRANSPORT.get_calls()) == 5
+
+
+def test_unauthorized_aborts_broadcast(settings, tmp_path):
+    checkpoint_path = str(tmp_path / 'broadcast.json')
+
+    def send_message(params):
+        raise FakeApiError(401, "Unauthorized")
+
+    broadcast = make_broadcast(settings, send_message, concurrency=1, checkpoint_path=checkpoint_path)
+
+    with pytest.raises(Unauthorized):
+        asyncio.run(broadcast.run())
+
+    assert len(settings.HTTP_TRANSPORT.get_calls()) == 1
+
+    resumed = make_broadcast(settings, send_message, checkpoint_path=checkpoint_path)
+    resumed.load_checkpoint()
+    assert resumed.done == 0
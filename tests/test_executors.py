@@ -0,0 +1,60 @@
+import asyncio
+
+from teleapi.core.exceptions.managers import ErrorManager
+from teleapi.core.executors import Executor
+from teleapi.core.profiling import ProfilingController
+from teleapi.generics.executors.commands.profile import ProfileCommand
+
+
+class FakeExecutor:
+    handler_timeout = 0.1
+
+
+class FakeUser:
+    id = 1
+
+
+class FakeMessage:
+    author = FakeUser()
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.replies = []
+        self.documents = []
+
+    async def reply(self, text: str, **kwargs) -> None:
+        self.replies.append(text)
+
+    async def reply_document(self, document: bytes, **kwargs) -> None:
+        self.documents.append(document)
+
+
+def test_profile_command_is_not_limited_by_handler_timeout(settings, tmp_path):
+    settings.HANDLER_TIMEOUT = 0.1
+    settings.PROFILING_ADMINS = [FakeUser.id]
+    settings.PROFILING_CONTROLLER = ProfilingController(reports_dir=str(tmp_path))
+
+    command = ProfileCommand(FakeExecutor())
+    message = FakeMessage("/profile sample 0.3")
+
+    asyncio.run(command.invoke(message))
+
+    assert command.timeout is None
+    assert len(message.documents) == 1
+    assert list(tmp_path.iterdir())
+
+
+def test_executor_can_disable_global_handler_timeout(settings):
+    class FakeBot:
+        error_manager = ErrorManager()
+
+    class LimitedExecutor(Executor):
+        pass
+
+    class UnlimitedExecutor(Executor):
+        __executor_handler_timeout__ = None
+
+    settings.HANDLER_TIMEOUT = 10
+
+    assert LimitedExecutor(FakeBot()).handler_timeout == 10
+    assert UnlimitedExecutor(FakeBot()).handler_timeout is None
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from aiohttp import FormData
+
+from teleapi.core.http.request.api_method import APIMethod
+from teleapi.core.http.request.api_request import method_request
+from teleapi.core.http.request.cache import MemoryResponseCache
+from teleapi.core.http.request.resilience import CircuitBreaker, CircuitState
+from teleapi.core.http.transports.memory import MemoryTransport
+
+
+def test_multipart_request_invalidates_cached_chat(settings):
+    titles = ['Old title']
+
+    def get_chat(params):
+        return {'id': params['chat_id'], 'type': 'group', 'title': titles[-1]}
+
+    def set_chat_photo(params):
+        titles.append('New title')
+        return True
+
+    settings.API_TOKEN = 'TOKEN'
+    settings.RESPONSE_CACHE = MemoryResponseCache()
+    settings.HTTP_TRANSPORT = MemoryTransport({
+        APIMethod.GET_CHAT: get_chat,
+        APIMethod.SET_CHAT_PHOTO: set_chat_photo
+    })
+
+    async def main():
+        _, before = await method_request("GET", APIMethod.GET_CHAT, data={'chat_id': -100})
+
+        form_data = FormData()
+        form_data.add_field('chat_id', '-100')
+        form_data.add_field('photo', b'photo', filename='photo.jpg')
+        await method_request("POST", APIMethod.SET_CHAT_PHOTO, data=form_data)
+
+        _, after = await method_request("GET", APIMethod.GET_CHAT, data={'chat_id': -100})
+
+        await settings.HTTP_TRANSPORT.close()
+        return before['result']['title'], after['result']['title']
+
+    assert asyncio.run(main()) == ('Old title', 'New title')
+
+
+def test_caller_timeout_does_not_open_circuit(settings):
+    def send_document(params):
+        # MemoryTransport doesn't apply request timeout, so the timeout is simulated
+        raise asyncio.TimeoutError()
+
+    settings.API_TOKEN = 'TOKEN'
+    settings.REQUEST_SCHEDULER = None
+    settings.CIRCUIT_BREAKER = breaker = CircuitBreaker(failure_threshold=2)
+    settings.HTTP_TRANSPORT = MemoryTransport({APIMethod.SEND_DOCUMENT: send_document})
+
+    async def main():
+        try:
+            for _ in range(3):
+                with pytest.raises(asyncio.TimeoutError):
+                    await method_request("POST", APIMethod.SEND_DOCUMENT, timeout=0.01, data={'chat_id': 1})
+
+            assert breaker.state is CircuitState.CLOSED
+
+            settings.REQUEST_TIMEOUTS = {APIMethod.SEND_DOCUMENT: 0.01}
+
+            for _ in range(2):
+                with pytest.raises(asyncio.TimeoutError):
+                    await method_request("POST", APIMethod.SEND_DOCUMENT, data={'chat_id': 1})
+
+            assert breaker.state is CircuitState.OPEN
+        finally:
+            await settings.HTTP_TRANSPORT.close()
+
+    asyncio.run(main())
+
+
+def test_getter_in_flight_during_chat_change_is_not_cached(settings):
+    administrators = ['old']
+    release = asyncio.Event()
+
+    async def get_chat_administrators(params):
+        result = list(administrators)
+
+        if not release.is_set():
+            await release.wait()  # First request is slow
+
+        return result
+
+    def promote_chat_member(params):
+        administrators.append('new')
+        return True
+
+    settings.API_TOKEN = 'TOKEN'
+    settings.RESPONSE_CACHE = MemoryResponseCache()
+    settings.HTTP_TRANSPORT = MemoryTransport({
+        APIMethod.GET_CHAT_ADMINISTRATORS: get_chat_administrators,
+        APIMethod.PROMOTE_CHAT_MEMBER: promote_chat_member
+    })
+
+    async def get_administrators():
+        _, data = await method_request("GET", APIMethod.GET_CHAT_ADMINISTRATORS, data={'chat_id': -100})
+        return data['result']
+
+    async def main():
+        try:
+            slow = asyncio.create_task(get_administrators())
+            await asyncio.sleep(0.01)
+
+            await method_request("POST", APIMethod.PROMOTE_CHAT_MEMBER, data={'chat_id': -100, 'user_id': 1})
+            joined = asyncio.create_task(get_administrators())
+            await asyncio.sleep(0.01)
+            release.set()
+
+            return await slow, await joined, await get_administrators()
+        finally:
+            await settings.HTTP_TRANSPORT.close()
+
+    assert asyncio.run(main()) == (['old'], ['old', 'new'], ['old', 'new'])
@@ -0,0 +1,35 @@
+import logging
+
+from teleapi.core.logs import filters
+from teleapi.core.logs.loggers import setup_logger
+
+
+def test_rate_limit_is_shared_by_handlers(settings, tmp_path, monkeypatch):
+    settings.LOG_RATE_LIMIT = 2
+    now = [0.0]
+    monkeypatch.setattr(filters.time, 'monotonic', lambda: now[0])
+
+    logger = setup_logger('teleapi_test_rate_limit', logs_dir=str(tmp_path), background=False)
+    logger.propagate = False
+    records = []
+    logger.handlers[-1].addFilter(lambda record: records.append(record) or True)
+
+    try:
+        for _ in range(5):
+            logger.info("Repeated %s", 'message')
+
+        now[0] = 2.0
+        logger.info("Repeated %s", 'message')
+    finally:
+        for handler in logger.handlers[:]:
+            handler.close()
+            logger.removeHandler(handler)
+
+    info_lines = (tmp_path / 'info.log').read_text(encoding='utf-8').splitlines()
+    debug_lines = (tmp_path / 'debug.log').read_text(encoding='utf-8').splitlines()
+
+    assert len(info_lines) == 3
+    assert [line.split(' - ', 1)[1] for line in info_lines] == [line.split(' - ', 1)[1] for line in debug_lines]
+    assert sum("similar messages suppressed" in line for line in info_lines) == 1
+    assert "(3 similar messages suppressed)" in info_lines[2]
+    assert all(record.msg == "Repeated %s" for record in records)
@@ -0,0 +1,19 @@
+import json
+
+from teleapi.core.metrics.registry import MetricsRegistry
+from teleapi.core.utils.json_codec import OrjsonCodec, StdlibJsonCodec
+
+
+def test_snapshot_buckets_are_stable_json():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('teleapi_test_seconds', "Test histogram", buckets=(0.5, 1))
+    histogram.observe(0.3)
+    histogram.observe(2)
+
+    buckets = registry.snapshot()['teleapi_test_seconds']['samples'][0]['buckets']
+    assert buckets == {'0.5': 1, '1': 1, '+Inf': 2}
+
+    for codec in (StdlibJsonCodec, OrjsonCodec):
+        if codec.is_available():
+            body = codec().dumps(registry.snapshot())
+            assert json.loads(body)['teleapi_test_seconds']['samples'][0]['buckets'] == buckets